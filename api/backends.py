@@ -0,0 +1,41 @@
+"""
+Authentication backend verifying passwords in the password hashing pool.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import identify_hasher
+
+from .utils.password_pool import hash_password, verify_password
+
+UserModel = get_user_model()
+
+
+class PooledPasswordBackend(ModelBackend):
+    """
+    Same as Django's `ModelBackend`, but the password check runs in the hashing
+    pool instead of the web worker.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so unknown usernames take as long as wrong passwords.
+            hash_password(password)
+            return None
+
+        if not verify_password(password, user.password):
+            return None
+        if not self.user_can_authenticate(user):
+            return None
+
+        if identify_hasher(user.password).must_update(user.password):
+            user.password = hash_password(password)
+            user.save(update_fields=["password"])
+        return user
@@ -0,0 +1,37 @@
+"""
+Cache backends counting hits and misses into the request metrics.
+"""
+
+from django.core.cache.backends import locmem, redis
+
+from .utils.metrics import record_cache_lookup
+
+_MISSING = object()
+
+
+class CacheMetricsMixin:
+    """
+    Counts the hits and misses of `get` and `get_many` lookups.
+    """
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        if value is _MISSING:
+            record_cache_lookup(0, 1)
+            return default
+        record_cache_lookup(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super().get_many(keys, version=version)
+        record_cache_lookup(len(values), len(keys) - len(values))
+        return values
+
+
+class RedisCache(CacheMetricsMixin, redis.RedisCache):
+    pass
+
+
+class LocMemCache(CacheMetricsMixin, locmem.LocMemCache):
+    pass
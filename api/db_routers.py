@@ -0,0 +1,28 @@
+"""
+Database routers.
+"""
+
+from .utils.replica import REPLICA_DATABASE, get_read_database
+
+
+class ReplicaRouter:
+    """
+    Sends reads to the replica inside `use_replica` blocks and everything else
+    to the primary. See `api.utils.replica`.
+    """
+
+    def db_for_read(self, model, **hints):
+        return get_read_database()
+
+    def db_for_write(self, model, **hints):
+        # Explicit, so that instances loaded from the replica are saved to the
+        # primary rather than to the database they were read from.
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is migrated through replication.
+        return db != REPLICA_DATABASE
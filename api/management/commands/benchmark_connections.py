@@ -0,0 +1,98 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.models import Candidate
+from api.utils.db_metrics import get_connection_mode, get_db_connection_stats
+from api.views.candidate import candidate_me_api
+
+PERSISTENT_MAX_AGE = 600
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the latency of candidate_me_api with a new database connection "
+        "per request, with persistent connections and, if configured, with the "
+        "connection pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Number of requests per connection mode (default: 200).",
+        )
+        parser.add_argument(
+            "--username",
+            help="Username of the candidate to request as (default: any candidate).",
+        )
+
+    def handle(self, *args, **options):
+        candidates = Candidate.objects.select_related("user")
+        if options["username"]:
+            candidates = candidates.filter(user__username=options["username"])
+        candidate = candidates.first()
+        if candidate is None:
+            raise CommandError("No candidate to request as; run populate_db first.")
+
+        connection = connections["default"]
+        original = {
+            "CONN_MAX_AGE": connection.settings_dict["CONN_MAX_AGE"],
+            "OPTIONS": connection.settings_dict["OPTIONS"],
+        }
+        unpooled = {k: v for k, v in original["OPTIONS"].items() if k != "pool"}
+        modes = {
+            "per-request": {"CONN_MAX_AGE": 0, "OPTIONS": unpooled},
+            "persistent": {"CONN_MAX_AGE": PERSISTENT_MAX_AGE, "OPTIONS": unpooled},
+        }
+        if get_connection_mode(connection) == "pool":
+            modes["pool"] = original
+
+        self.stdout.write(
+            f"{'mode':<12} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'opened':>7}"
+        )
+        try:
+            for mode, mode_settings in modes.items():
+                connection.close()
+                connection.settings_dict.update(mode_settings)
+                self._report(mode, self._run(candidate.user, options["requests"]))
+        finally:
+            connection.close()
+            connection.settings_dict.update(original)
+
+    def _run(self, user, count):
+        factory = APIRequestFactory()
+        url = reverse("v1:api-candidate-me")
+        authorization = f"Bearer {AccessToken.for_user(user)}"
+        opened = self._connections_opened()
+        timings = []
+        for _ in range(count):
+            request = factory.get(url, HTTP_AUTHORIZATION=authorization)
+            started = time.perf_counter()
+            # Mirror the request handler, which closes obsolete connections
+            # when a request starts and finishes.
+            request_started.send(sender=self.__class__)
+            candidate_me_api(request).render()
+            request_finished.send(sender=self.__class__)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings, self._connections_opened() - opened
+
+    def _connections_opened(self):
+        return get_db_connection_stats()["databases"]["default"]["connections_opened"]
+
+    def _report(self, mode, result):
+        timings, opened = result
+        p95 = timings[0]
+        if len(timings) > 1:
+            p95 = statistics.quantiles(timings, n=20)[-1]
+        self.stdout.write(
+            f"{mode:<12} {statistics.mean(timings):>9.2f} "
+            f"{statistics.median(timings):>9.2f} {p95:>9.2f} {opened:>7}"
+        )
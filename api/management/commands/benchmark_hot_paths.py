@@ -0,0 +1,81 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.utils.benchmarks import BENCHMARKS, compare_benchmarks, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the candidate serializers and auto scoring over a fixed "
+        "synthetic dataset, reporting operations per second and peak memory "
+        "allocated per operation as JSON. The dataset is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--benchmarks",
+            default=",".join(BENCHMARKS),
+            help="Comma separated benchmarks to run (default: all).",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=200,
+            help="Timed operations per benchmark (default: 200).",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed of the synthetic data."
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+        parser.add_argument(
+            "--baseline",
+            help="Compare against this earlier report and fail on regressions.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Allowed throughput loss and allocation growth over the baseline "
+            "(default: 0.2).",
+        )
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options["benchmarks"].split(",")]
+        unknown = sorted(set(names) - set(BENCHMARKS))
+        if unknown:
+            raise CommandError(f"Unknown benchmarks: {', '.join(unknown)}.")
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be positive.")
+
+        results = run_benchmarks(names, options["iterations"], options["seed"])
+        for name, result in results.items():
+            self.stderr.write(
+                f"{name:<18} {result['ops_per_sec']:>10} ops/s "
+                f"{result['mean_us']:>10} us/op {result['peak_alloc_kib']:>9} KiB"
+            )
+
+        report = {
+            "started_at": timezone.now().isoformat(),
+            "seed": options["seed"],
+            "benchmarks": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as report_file:
+                report_file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+        if options["baseline"]:
+            with open(options["baseline"]) as baseline_file:
+                baseline = json.load(baseline_file)
+            regressions = compare_benchmarks(report, baseline, options["tolerance"])
+            if regressions:
+                raise CommandError(
+                    "Regressions against the baseline:\n" + "\n".join(regressions)
+                )
+            self.stdout.write(
+                self.style.SUCCESS("No regressions against the baseline.")
+            )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from api.utils.exam_session import finalise_expired_sessions
+
+
+class Command(BaseCommand):
+    help = (
+        "Submits and scores every timed exam session whose deadline has passed, "
+        "using the answers autosaved so far. Meant to be run periodically."
+    )
+
+    def handle(self, *args, **options):
+        finalised = finalise_expired_sessions()
+        self.stdout.write(
+            self.style.SUCCESS(f"Finalised {finalised} expired exam session(s).")
+        )
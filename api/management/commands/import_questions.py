@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Exam, Staff
+from api.utils.question_import import import_questions, validate_question_rows
+from api.utils.uploads import read_csv_rows
+
+
+class Command(BaseCommand):
+    help = "Imports a JSON or CSV question bank, skipping questions that already exist."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to a .json or .csv question bank.")
+        parser.add_argument("--exam", type=int, help="Add every question to this exam.")
+        parser.add_argument(
+            "--staff", type=int, help="User ID of the staff member recorded as creator."
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+
+        if path.suffix.lower() == ".csv":
+            with path.open("rb") as handle:
+                rows = read_csv_rows(File(handle))
+        else:
+            rows = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(rows, dict):
+                rows = rows.get("questions")
+        if not isinstance(rows, list):
+            raise CommandError("Expected a list of questions.")
+
+        try:
+            exam = Exam.objects.get(pk=options["exam"]) if options["exam"] else None
+            staff = Staff.objects.get(pk=options["staff"]) if options["staff"] else None
+        except (Exam.DoesNotExist, Staff.DoesNotExist) as e:
+            raise CommandError(str(e))
+
+        questions, duplicates, errors = validate_question_rows(rows)
+        for error in errors:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if not questions:
+            raise CommandError("No valid questions to import.")
+
+        result = import_questions(questions, staff=staff, exam=exam)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result['created']} questions, {result['existing']} already "
+                f"existed, {duplicates} duplicate rows, {len(errors)} invalid rows."
+            )
+        )
+        if exam is not None:
+            self.stdout.write(f"Linked {result['linked']} questions to {exam}.")
@@ -0,0 +1,108 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.utils.loadtest import compare_to_baseline, run_stage, seed_loadtest_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds synthetic candidates and an open exam, then sends them through "
+        "login, take exam, submit answers, dashboard and leaderboard against a "
+        "running server at increasing concurrency, and reports p50/p95/p99 "
+        "latency, throughput and error rates as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            default="http://127.0.0.1:8000",
+            help="URL of the server under test (default: http://127.0.0.1:8000).",
+        )
+        parser.add_argument(
+            "--stages",
+            default="10,25,50",
+            help="Comma separated concurrent candidates per stage (default: 10,25,50).",
+        )
+        parser.add_argument(
+            "--ramp-seconds",
+            type=float,
+            default=0,
+            help="Spread the start of each stage's journeys over this many seconds "
+            "(default: 0, all at once).",
+        )
+        parser.add_argument(
+            "--questions",
+            type=int,
+            default=40,
+            help="Number of questions in the exam (default: 40).",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed of the synthetic data."
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+        parser.add_argument(
+            "--baseline",
+            help="Compare against this earlier report and fail on regressions.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Allowed p95 latency growth over the baseline (default: 0.2).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            stages = [int(stage) for stage in options["stages"].split(",")]
+        except ValueError:
+            raise CommandError("--stages must be comma separated integers.")
+        if not stages or min(stages) < 1:
+            raise CommandError("--stages must be positive integers.")
+
+        dataset = seed_loadtest_data(sum(stages), options["questions"], options["seed"])
+        usernames = iter(dataset["usernames"])
+
+        report = {
+            "started_at": timezone.now().isoformat(),
+            "url": options["url"],
+            "seed": options["seed"],
+            "questions": options["questions"],
+            "ramp_seconds": options["ramp_seconds"],
+            "stages": [],
+        }
+        for concurrency in stages:
+            stage = run_stage(
+                options["url"],
+                [next(usernames) for _ in range(concurrency)],
+                dataset["exam_id"],
+                dataset["api_key"],
+                ramp_seconds=options["ramp_seconds"],
+                seed=options["seed"],
+            )
+            report["stages"].append(stage)
+            self.stderr.write(
+                f"concurrency {concurrency}: {stage['requests']} requests in "
+                f"{stage['duration_s']}s, p95 {stage['p95_ms']} ms, "
+                f"error rate {stage['error_rate']}"
+            )
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as report_file:
+                report_file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+        if options["baseline"]:
+            with open(options["baseline"]) as baseline_file:
+                baseline = json.load(baseline_file)
+            regressions = compare_to_baseline(report, baseline, options["tolerance"])
+            if regressions:
+                raise CommandError(
+                    "Regressions against the baseline:\n" + "\n".join(regressions)
+                )
+            self.stdout.write(
+                self.style.SUCCESS("No regressions against the baseline.")
+            )
@@ -1,94 +1,117 @@
-import os
-import django
 import random
-from django.utils import timezone
+import time
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "competition_api.settings")
-django.setup()
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
 
-from api.models import User, Candidate, Staff, Question, Exam, CandidateScore
-from django.core.management.base import BaseCommand
+from api.utils.synthetic_data import (
+    clear_synthetic_data,
+    generate_candidates,
+    generate_exams,
+    generate_questions,
+    generate_staff,
+    synthetic_data_exists,
+)
 
 
 class Command(BaseCommand):
-    help = "Populates the database with initial data."
+    help = (
+        "Populates the database with a reproducible synthetic dataset at "
+        "production scale: staff, questions, exams, and candidates with their "
+        "scores and answers. Every generated user has the same password."
+    )
 
-    def handle(self, *args, **options):
-        # Create users
-        user1 = User.objects.create_user(
-            username="khalid",
-            password="password123",
-            first_name="Khalid",
-            last_name="Khalid",
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--candidates",
+            type=int,
+            default=200_000,
+            help="Number of candidates (default: 200000).",
         )
-        user2 = User.objects.create_user(
-            username="bellion",
-            password="password123",
-            first_name="Jon",
-            last_name="Bellion",
+        parser.add_argument(
+            "--staff", type=int, default=50, help="Number of staff (default: 50)."
         )
-        user3 = User.objects.create_user(
-            username="jane", password="password123", first_name="Jane", last_name="Fox"
+        parser.add_argument(
+            "--questions",
+            type=int,
+            default=500,
+            help="Number of questions (default: 500).",
         )
-        user4 = User.objects.create_user(
-            username="ben",
-            password="password123",
-            first_name="Benjamin",
-            last_name="Tennyson",
+        parser.add_argument(
+            "--exams", type=int, default=20, help="Number of exams (default: 20)."
         )
-        # Create staff
-        staff1 = Staff.objects.create(
-            user=user1, phone="12345", occupation="Teacher", role="admin"
+        parser.add_argument(
+            "--questions-per-exam",
+            type=int,
+            default=40,
+            help="Questions in each exam (default: 40).",
         )
-        staff2 = Staff.objects.create(
-            user=user2, phone="67890", occupation="Engineer", role="moderator"
+        parser.add_argument(
+            "--exams-per-candidate",
+            type=int,
+            default=1,
+            help="Exams each candidate has sat, where their stage allows "
+            "(default: 1).",
         )
-
-        # Create candidates
-        cand1 = Candidate.objects.create(
-            user=user3, phone="55555", school="Springfield High", is_active=True
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed of the dataset (default: 0)."
         )
-        cand2 = Candidate.objects.create(
-            user=user4, phone="77777", school="Riverdale High", is_active=True
+        parser.add_argument(
+            "--password",
+            default="password123",
+            help="Password of every generated user (default: password123).",
         )
-
-        # Create questions
-        q1 = Question.objects.create(
-            description="What is 2+2?", answer="4", created_by=staff1, difficulty="easy"
-        )
-        q2 = Question.objects.create(
-            description="What is the capital of France?",
-            answer="Paris",
-            created_by=staff2,
-            difficulty="medium",
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete a previously generated dataset first.",
         )
 
-        # Create exams
-        exam1 = Exam.objects.create(
-            stage="screening",
-            title="Math Test",
-            description="Basic math",
-            created_by=staff1,
-            is_published=True,
-        )
-        exam2 = Exam.objects.create(
-            stage="league",
-            title="Geography Test",
-            description="World capitals",
-            created_by=staff2,
-            is_published=True,
-        )
+    def handle(self, *args, **options):
+        if options["staff"] < 1 or options["exams"] < 1 or options["questions"] < 1:
+            raise CommandError("--staff, --exams and --questions must be positive.")
+        if options["clear"]:
+            clear_synthetic_data()
+            self.stdout.write("Deleted the previous synthetic dataset.")
+        elif synthetic_data_exists():
+            raise CommandError(
+                "A synthetic dataset already exists. Use --clear to replace it."
+            )
 
-        # Add questions to exams
-        exam1.questions.add(q1)
-        exam2.questions.add(q2)
+        started = time.perf_counter()
+        rng = random.Random(options["seed"])
+        # Hash once: hashing per user would dominate the run time.
+        password = make_password(options["password"])
 
-        # Candidate scores
-        CandidateScore.objects.create(
-            candidate=cand1, exam=exam1, score=85.5, submitted_by=staff1
+        staff = generate_staff(rng, options["staff"], password)
+        questions = generate_questions(rng, options["questions"], staff)
+        exam_questions = generate_exams(
+            rng, options["exams"], questions, options["questions_per_exam"], staff
         )
-        CandidateScore.objects.create(
-            candidate=cand2, exam=exam2, score=90.0, submitted_by=staff2
+        self.stdout.write(
+            f"Created {len(staff)} staff, {len(questions)} questions and "
+            f"{len(exam_questions)} exams."
         )
 
-        print("Database populated successfully!")
+        totals = {"candidates": 0, "scores": 0, "answers": 0}
+        for totals in generate_candidates(
+            rng,
+            options["candidates"],
+            password,
+            exam_questions,
+            options["exams_per_candidate"],
+            staff,
+        ):
+            self.stdout.write(
+                f"{totals['candidates']}/{options['candidates']} candidates, "
+                f"{totals['scores']} scores, {totals['answers']} answers "
+                f"({time.perf_counter() - started:.1f}s)"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {totals['candidates']} candidates, {totals['scores']} "
+                f"scores and {totals['answers']} answers in "
+                f"{time.perf_counter() - started:.1f}s (seed {options['seed']})."
+            )
+        )
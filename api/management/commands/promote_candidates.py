@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.serializers import CandidatePromotionSerializer
+from api.utils.promotion import (
+    apply_promotion,
+    get_qualifying_candidates,
+    preview_promotion,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Promotes the best candidates of an exam or stage to the next role "
+        "with a single UPDATE."
+    )
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument("--exam", type=int, help="Rank by this exam's score.")
+        source.add_argument(
+            "--stage", help="Rank by total score across this stage's exams."
+        )
+        parser.add_argument("--top", type=int, help="Promote the K best candidates.")
+        parser.add_argument(
+            "--min-score", help="Promote candidates scoring at least this much."
+        )
+        parser.add_argument(
+            "--to-role", help="Role to assign (defaults to the next stage)."
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the qualifying candidates without promoting them.",
+        )
+
+    def handle(self, *args, **options):
+        data = {
+            "exam_id": options["exam"],
+            "stage": options["stage"],
+            "top_k": options["top"],
+            "min_score": options["min_score"],
+            "to_role": options["to_role"],
+            "dry_run": options["dry_run"],
+        }
+        serializer = CandidatePromotionSerializer(
+            data={key: value for key, value in data.items() if value is not None}
+        )
+        if not serializer.is_valid():
+            raise CommandError(serializer.errors)
+        validated = serializer.validated_data
+
+        qualifying = get_qualifying_candidates(
+            validated["from_role"],
+            exam=validated.get("exam"),
+            top_k=validated.get("top_k"),
+            min_score=validated.get("min_score"),
+        )
+
+        if validated["dry_run"]:
+            candidates = preview_promotion(qualifying)
+            for row in candidates:
+                self.stdout.write(
+                    f"{row['rank']:>5}  {row['candidate_id']:>8}  "
+                    f"{row['score']:>8.2f}  {row['name']} ({row['school']})"
+                )
+            self.stdout.write(
+                f"{len(candidates)} candidates would be promoted from "
+                f"{validated['from_role']} to {validated['to_role']}."
+            )
+            return
+
+        promoted = apply_promotion(qualifying, validated["to_role"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Promoted {promoted} candidates from {validated['from_role']} "
+                f"to {validated['to_role']}."
+            )
+        )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from api.utils.token_blacklist import rebuild_blacklist_filter
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired outstanding refresh tokens, and their blacklist entries, "
+        "in batches. Meant to be run periodically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of tokens deleted per query (default: 5000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        expired = OutstandingToken.objects.filter(expires_at__lte=timezone.now())
+
+        deleted = 0
+        while True:
+            batch = list(expired.values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                break
+            # Deleting outstanding tokens cascades to their blacklist entries.
+            OutstandingToken.objects.filter(pk__in=batch).delete()
+            deleted += len(batch)
+
+        rebuild_blacklist_filter()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} expired token(s)."))
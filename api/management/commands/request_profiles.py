@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api.utils.profiling import PROFILING_HEADER, get_profiles, issue_profiling_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Lists the recorded request profiles, shows one in detail, or issues a "
+        "token to profile requests with."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--id", type=int, help="Show the profile with this ID.")
+        parser.add_argument(
+            "--token",
+            metavar="USERNAME",
+            help="Print an X-Profile-Request header value issued to this user.",
+        )
+
+    def handle(self, *args, **options):
+        if options["token"]:
+            user = get_user_model().objects.filter(username=options["token"]).first()
+            if user is None:
+                raise CommandError(f"User '{options['token']}' does not exist.")
+            self.stdout.write(f"{PROFILING_HEADER}: {issue_profiling_token(user)}")
+            return
+
+        profiles = get_profiles()
+        if options["id"] is None:
+            for profile in profiles:
+                self.stdout.write(
+                    f"{profile['id']:>6}  {profile['started_at']}  "
+                    f"{profile['method']} {profile['route']} {profile['status']}  "
+                    f"{profile['duration_ms']:.1f} ms  "
+                    f"{profile['query_count']} queries  ({profile['trigger']})"
+                )
+            return
+
+        profile = next((p for p in profiles if p["id"] == options["id"]), None)
+        if profile is None:
+            raise CommandError(f"Profile {options['id']} is not in the buffer.")
+        self.stdout.write(
+            f"{profile['method']} {profile['path']} {profile['status']} "
+            f"in {profile['duration_ms']:.1f} ms"
+        )
+        self.stdout.write("\ncumulative ms    total ms     calls  function")
+        for function in profile["functions"]:
+            self.stdout.write(
+                f"{function['cumulative_ms']:>13.3f} {function['total_ms']:>11.3f} "
+                f"{function['calls']:>9}  {function['function']}"
+            )
+        self.stdout.write(f"\n{profile['query_count']} queries")
+        for query in profile["queries"]:
+            self.stdout.write(f"{query['ms']:>10.3f} ms  {query['sql']}")
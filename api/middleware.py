@@ -0,0 +1,78 @@
+"""
+Middleware for the API.
+"""
+
+import time
+
+from rest_framework.permissions import SAFE_METHODS
+
+from .utils.metrics import collect_request_metrics, record_request
+from .utils.profiling import get_profiling_trigger, profile_request
+from .utils.replica import pin_to_primary
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, database query, cache lookup and response size metrics
+    per route. See `api.utils.metrics`.
+
+    Placed first in `MIDDLEWARE` so that latency covers the other middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with collect_request_metrics() as collector:
+            response = self.get_response(request)
+        seconds = time.perf_counter() - started
+
+        match = request.resolver_match
+        if response.streaming:
+            response_bytes = int(response.get("Content-Length") or 0)
+        else:
+            response_bytes = len(response.content)
+        record_request(
+            match.view_name if match else "unmatched",
+            request.method,
+            response.status_code,
+            seconds,
+            collector,
+            response_bytes,
+        )
+        return response
+
+
+class RequestProfilerMiddleware:
+    """
+    Profiles requests carrying a signed `X-Profile-Request` header, and a
+    sample of all requests. See `api.utils.profiling`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        trigger = get_profiling_trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+        return profile_request(request, self.get_response, trigger)
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Pins users to the primary database after their unsafe requests, so their
+    next reads see what they wrote.
+
+    Runs after the view, when DRF has set the authenticated user on the request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS:
+            pin_to_primary(getattr(request, "user", None))
+        return response
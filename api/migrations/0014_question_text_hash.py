@@ -0,0 +1,58 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:12
+
+import hashlib
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+def _normalise(value):
+    value = unicodedata.normalize("NFKC", value or "")
+    return re.sub(r"\s+", " ", value).strip().casefold()
+
+
+def backfill_text_hash(apps, schema_editor):
+    """
+    Hashes existing questions. When several existing questions are duplicates,
+    only the oldest keeps the hash; the others are left NULL so the unique index
+    can be created.
+    """
+    Question = apps.get_model("api", "Question")
+    seen = set()
+    updated = []
+    for question in Question.objects.order_by("id").iterator():
+        parts = (
+            question.text,
+            question.option_a,
+            question.option_b,
+            question.option_c,
+            question.option_d,
+        )
+        digest = hashlib.sha256(
+            "\x1f".join(_normalise(part) for part in parts).encode("utf-8")
+        ).hexdigest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        question.text_hash = digest
+        updated.append(question)
+    Question.objects.bulk_update(updated, ["text_hash"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0013_rename_sitesetting_featureflag"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="text_hash",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, null=True
+            ),
+        ),
+        migrations.RunPython(backfill_text_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0014_question_text_hash"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="question",
+            name="text_hash",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, null=True, unique=True
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:03
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Exists
+
+
+def backfill_submitted_at(apps, schema_editor):
+    """
+    Scores that already have answers were submitted before this field existed.
+    """
+    CandidateScore = apps.get_model("api", "CandidateScore")
+    CandidateAnswer = apps.get_model("api", "CandidateAnswer")
+    CandidateScore.objects.filter(
+        Exists(CandidateAnswer.objects.filter(candidate_score=OuterRef("pk")))
+    ).update(submitted_at=models.F("date_updated"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0015_alter_question_text_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="candidatescore",
+            name="submitted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_submitted_at, migrations.RunPython.noop),
+    ]
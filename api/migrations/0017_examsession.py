@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_candidatescore_submitted_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('deadline', models.DateTimeField()),
+                ('question_seed', models.PositiveIntegerField()),
+                ('finalised_at', models.DateTimeField(blank=True, null=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exam_sessions', to='api.candidate')),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to='api.exam')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('finalised_at__isnull', True)), fields=['deadline'], name='examsession_open_deadline_idx')],
+                'unique_together': {('candidate', 'exam')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:05
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def backfill_closes_at(apps, schema_editor):
+    Exam = apps.get_model("api", "Exam")
+    exams = list(Exam.objects.filter(exam_date__isnull=False))
+    for exam in exams:
+        exam.closes_at = exam.exam_date + timedelta(hours=exam.open_duration_hours)
+    Exam.objects.bulk_update(exams, ["closes_at"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exam',
+            name='closes_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_closes_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='exam',
+            index=models.Index(fields=['stage', 'is_active', 'exam_date', 'closes_at'], name='exam_open_window_idx'),
+        ),
+    ]
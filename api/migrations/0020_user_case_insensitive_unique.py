@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Makes usernames and non-blank emails unique regardless of case.
+
+    Registration checks both fields in one query and relies on these indexes to
+    reject concurrent duplicates. Existing case-insensitive duplicates must be
+    resolved before applying this migration.
+    """
+
+    dependencies = [
+        ("api", "0019_exam_closes_at"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE UNIQUE INDEX auth_user_username_lower_uniq "
+                "ON auth_user (LOWER(username));"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS auth_user_username_lower_uniq;",
+        ),
+        migrations.RunSQL(
+            sql=(
+                "CREATE UNIQUE INDEX auth_user_email_lower_uniq "
+                "ON auth_user (LOWER(email)) WHERE email <> '';"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS auth_user_email_lower_uniq;",
+        ),
+    ]
@@ -7,8 +7,13 @@ Includes models for:
 - Staff and administrative roles
 - Exams and questions
 - Candidate scores with submission metadata
+- Timed exam sessions
+- Idempotency keys for safely retried requests
 """
 
+import hashlib
+import re
+import unicodedata
 from typing import Optional
 
 from django.db import models
@@ -196,6 +201,15 @@ class Staff(models.Model):
         return f"{self.user.get_full_name()} ({self.role})"
 
 
+def normalise_question_text(value):
+    """
+    Normalises question text for duplicate detection: Unicode NFKC, case-folded,
+    with runs of whitespace collapsed to a single space.
+    """
+    value = unicodedata.normalize("NFKC", value or "")
+    return re.sub(r"\s+", " ", value).strip().casefold()
+
+
 class Question(models.Model):
     """
     A question belonging to one or more exams. Includes text, difficulty, and staff author.
@@ -235,10 +249,65 @@ class Question(models.Model):
         choices=[("easy", "Easy"), ("medium", "Medium"), ("hard", "Hard")],
         default="medium",
     )
+    text_hash = models.CharField(
+        max_length=64, unique=True, null=True, blank=True, editable=False
+    )
 
     def __str__(self):
         return f"Q{self.id}: {self.text[:50]}..."
 
+    @staticmethod
+    def build_text_hash(text, option_a="", option_b="", option_c="", option_d=""):
+        """
+        Returns the SHA-256 hex digest of the normalised question text and options.
+
+        Two questions with the same hash are considered duplicates.
+        """
+        parts = (text, option_a, option_b, option_c, option_d)
+        normalised = "\x1f".join(normalise_question_text(part) for part in parts)
+        return hashlib.sha256(normalised.encode("utf-8")).hexdigest()
+
+    def save(self, *args, **kwargs):
+        self.text_hash = self.build_text_hash(
+            self.text, self.option_a, self.option_b, self.option_c, self.option_d
+        )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "text_hash"}
+        super().save(*args, **kwargs)
+
+
+class ExamQuerySet(models.QuerySet):
+    """
+    Custom queryset for the Exam model.
+    """
+
+    def open_now(self, stage=None):
+        """
+        Filters exams that are open right now, optionally for a single stage.
+
+        An exam is open if it's active and either has no exam_date, or the current
+        time is between exam_date and closes_at. Filtering is done in SQL and is
+        covered by the open window index.
+        """
+        from django.utils import timezone
+
+        now = timezone.now()
+        queryset = self.filter(is_active=True)
+        if stage is not None:
+            queryset = queryset.filter(stage=stage)
+        return queryset.filter(
+            models.Q(exam_date__isnull=True)
+            | models.Q(exam_date__lte=now, closes_at__gte=now)
+        )
+
+    def with_question_count(self):
+        """
+        Annotates exams with their number of questions, used by
+        `Exam.get_question_count` instead of a count query per exam.
+        """
+        return self.annotate(question_count=Count("questions", distinct=True))
+
 
 class Exam(models.Model):
     """
@@ -258,6 +327,7 @@ class Exam(models.Model):
     is_active = models.BooleanField(default=False, db_index=True)
     exam_date = models.DateTimeField(blank=True, null=True, db_index=True)
     open_duration_hours = models.PositiveIntegerField(default=12)
+    closes_at = models.DateTimeField(blank=True, null=True, editable=False)
     countdown_minutes = models.PositiveIntegerField(default=60)
     date_created = models.DateTimeField(auto_now_add=True)
     date_updated = models.DateTimeField(auto_now=True)
@@ -277,9 +347,26 @@ class Exam(models.Model):
         on_delete=models.SET_NULL,
     )
 
+    objects = ExamQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["stage", "is_active", "exam_date", "closes_at"],
+                name="exam_open_window_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.id})"
 
+    def save(self, *args, **kwargs):
+        self.closes_at = self.get_closes_at()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "closes_at"}
+        super().save(*args, **kwargs)
+
     @classmethod
     def active_exams(cls):
         """
@@ -287,28 +374,42 @@ class Exam(models.Model):
         """
         return cls.objects.filter(is_active=True)
 
+    def get_closes_at(self):
+        """
+        Returns the end of the exam's open window, or None if it has no exam_date.
+        """
+        from datetime import timedelta
+
+        if self.exam_date is None:
+            return None
+        return self.exam_date + timedelta(hours=self.open_duration_hours)
+
     @property
     def is_currently_open(self):
         """
         Exam is open only if it's active, and either:
         - exam_date is None (always open)
         - or current time is within open window
+
+        Use `Exam.objects.open_now()` to filter open exams in the database.
         """
         from django.utils import timezone
-        from datetime import timedelta
 
         if not self.is_active:
             return False
         if self.exam_date is None:
             return True
-        now = timezone.now()
-        end_time = self.exam_date + timedelta(hours=self.open_duration_hours)
-        return self.exam_date <= now <= end_time
+        return self.exam_date <= timezone.now() <= self.get_closes_at()
 
     def get_question_count(self):
         """
         Returns the number of questions in the exam.
+
+        Uses the `question_count` annotation if the exam was loaded with
+        `Exam.objects.with_question_count()`.
         """
+        if hasattr(self, "question_count"):
+            return self.question_count
         return self.questions.count()
 
     def get_average_score(self):
@@ -336,12 +437,44 @@ class CandidateScore(models.Model):
         "Staff", on_delete=models.SET_NULL, null=True, blank=True
     )
     auto_score = models.BooleanField(default=False, db_index=True)
+    submitted_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         unique_together = ("candidate", "exam")
         ordering = ["-date_recorded"]
 
 
+class ExamSession(models.Model):
+    """
+    A candidate's timed attempt at an exam, started when the exam is first taken.
+
+    Stores the deadline by which answers must be submitted and the seed used to
+    shuffle the exam's questions for this candidate.
+    """
+
+    candidate = models.ForeignKey(
+        "Candidate", on_delete=models.CASCADE, related_name="exam_sessions"
+    )
+    exam = models.ForeignKey("Exam", on_delete=models.CASCADE, related_name="sessions")
+    started_at = models.DateTimeField()
+    deadline = models.DateTimeField()
+    question_seed = models.PositiveIntegerField()
+    finalised_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("candidate", "exam")
+        indexes = [
+            models.Index(
+                fields=["deadline"],
+                condition=models.Q(finalised_at__isnull=True),
+                name="examsession_open_deadline_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.candidate_id} - {self.exam_id} (until {self.deadline})"
+
+
 class CandidateAnswer(models.Model):
     candidate_score = models.ForeignKey(
         "CandidateScore", related_name="answers", on_delete=models.CASCADE
@@ -362,6 +495,34 @@ class CandidateAnswer(models.Model):
 
 
 
+class IdempotencyKey(models.Model):
+    """
+    The response to a request sent with an `Idempotency-Key` header.
+
+    A retry carrying the same key gets the stored response back instead of
+    being processed again.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="idempotency_keys"
+    )
+    key = models.CharField(max_length=255)
+    request_path = models.CharField(max_length=255)
+    status_code = models.PositiveSmallIntegerField()
+    response_body = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="unique_idempotency_key_per_user"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.key} ({self.request_path})"
+
+
 class LeaderboardSnapshot(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     data = models.JSONField()
@@ -0,0 +1,29 @@
+"""
+Custom DRF parsers.
+"""
+
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .utils import fast_json
+
+
+class FastJSONParser(JSONParser):
+    """
+    `JSONParser` decoding request bodies with `fast_json` (orjson when
+    installed). NaN and infinities are rejected, as with `STRICT_JSON`.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        content = stream.read()
+        if codecs.lookup(encoding).name != "utf-8":
+            content = content.decode(encoding)
+        try:
+            return fast_json.loads(content)
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
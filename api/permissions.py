@@ -6,6 +6,24 @@ object-level access, and read-only constraints.
 """
 
 from rest_framework.permissions import BasePermission, SAFE_METHODS
+from rest_framework_api_key.permissions import HasAPIKey  # type: ignore
+
+from .utils.api_keys import is_api_key_valid
+
+
+class CachedHasAPIKey(HasAPIKey):
+    """
+    Grants access if the request carries a valid API key.
+
+    Same as `HasAPIKey`, but successful verifications are cached briefly so
+    repeated requests with the same key skip the slow key hasher.
+    """
+
+    def has_permission(self, request, view):
+        key = self.get_key(request)
+        if not key:
+            return False
+        return is_api_key_valid(key)
 
 
 class IsCandidate(BasePermission):
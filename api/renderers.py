@@ -0,0 +1,30 @@
+"""
+Custom DRF renderers.
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+from .utils import fast_json
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` encoding compact responses with `fast_json` (orjson when
+    installed), producing equivalent JSON (see `fast_json` for how it differs).
+
+    Indented responses (`Accept: application/json; indent=4`) and non-default
+    `UNICODE_JSON`, `COMPACT_JSON` or `STRICT_JSON` settings are rendered by
+    `JSONRenderer` itself.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return fast_json.dumps(data)
@@ -7,13 +7,15 @@ Includes:
 - CandidateScore and registration serializers
 """
 
-from django.db.models import Sum
+from django.db import models
+from django.db.models import Q, Sum
 from django.contrib.auth import get_user_model, password_validation
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import IntegrityError, transaction
 
 from rest_framework import serializers
-from rest_framework.validators import UniqueValidator
+from rest_framework.relations import MANY_RELATION_KWARGS
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 
 from .models import (
     Candidate,
@@ -23,21 +25,53 @@ from .models import (
     CandidateScore,
     CandidateAnswer,
 )
+from .utils.password_pool import hash_password
+from .utils.direct_uploads import UPLOAD_CONTENT_TYPES, UPLOAD_TICKET_FIELDS
+from .utils.media_urls import media_url
+from .utils.photos import StagedPhotoMixin
+from .utils.promotion import NEXT_ROLE
+from .utils.sparse_fields import SparseFieldsMixin
+from .utils.token_blacklist import FilteredRefreshToken
 
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+USERNAME_TAKEN = "A user with that username already exists."
+EMAIL_TAKEN = "A user with that email already exists."
+# Unique indexes on the user table, by the field they cover.
+USER_UNIQUE_INDEXES = {
+    "auth_user_email_lower_uniq": "email",
+    "auth_user_username_lower_uniq": "username",
+    "auth_user_username_key": "username",
+}
+
+
+def unique_user_error(error):
+    """
+    Converts an IntegrityError from the case-insensitive unique indexes on
+    username and email into a ValidationError for the offending field.
+
+    Raises:
+        IntegrityError: `error` itself, if it comes from any other constraint.
+    """
+    message = str(error)
+    for index, field in USER_UNIQUE_INDEXES.items():
+        if index in message:
+            taken = EMAIL_TAKEN if field == "email" else USERNAME_TAKEN
+            return serializers.ValidationError({field: [taken]})
+    raise error
+
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Basic serializer for the Django User model.
+
+    Username and email are unique regardless of case. Both are checked with a
+    single query, and the unique indexes catch any concurrent duplicate.
     """
 
-    username = serializers.CharField(
-        max_length=14, validators=[UniqueValidator(queryset=User.objects.all())]
-    )
-    email = serializers.EmailField(
-        validators=[UniqueValidator(queryset=User.objects.all())]
-    )
+    username = serializers.CharField(max_length=14)
+    email = serializers.EmailField()
 
     class Meta:
         model = User
@@ -51,6 +85,37 @@ class UserSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("id", "date_joined")
 
+    def validate(self, attrs):
+        username, email = attrs.get("username"), attrs.get("email")
+        lookup = Q()
+        if username:
+            lookup |= Q(username__iexact=username)
+        if email:
+            lookup |= Q(email__iexact=email)
+        if not lookup:
+            return attrs
+
+        taken = User.objects.filter(lookup)
+        if self.instance is not None:
+            taken = taken.exclude(pk=self.instance.pk)
+
+        errors = {}
+        for taken_username, taken_email in taken.values_list("username", "email"):
+            if username and taken_username.lower() == username.lower():
+                errors["username"] = [USERNAME_TAKEN]
+            if email and taken_email.lower() == email.lower():
+                errors["email"] = [EMAIL_TAKEN]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError as e:
+            raise unique_user_error(e)
+
 
 class MinimalCandidateSerializer(serializers.ModelSerializer):
     """
@@ -64,7 +129,7 @@ class MinimalCandidateSerializer(serializers.ModelSerializer):
         fields = ["user", "school"]
 
 
-class CandidateListSerializer(serializers.ModelSerializer):
+class CandidateListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for listing candidate info.
     """
@@ -84,7 +149,31 @@ class CandidateListSerializer(serializers.ModelSerializer):
         )
 
 
-class CandidateDetailSerializer(serializers.ModelSerializer):
+class CachedURLImageField(serializers.ImageField):
+    """
+    Image field whose URL is memoised, avoiding a storage URL build (and
+    signature) per object when serialising many profiles.
+    """
+
+    def to_representation(self, value):
+        url = media_url(value)
+        if url is None:
+            return None
+        request = self.context.get("request", None)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+
+CACHED_URL_FIELD_MAPPING = {
+    **serializers.ModelSerializer.serializer_field_mapping,
+    models.ImageField: CachedURLImageField,
+}
+
+
+class CandidateDetailSerializer(
+    SparseFieldsMixin, StagedPhotoMixin, serializers.ModelSerializer
+):
     """
     Detailed candidate serializer including:
     - latest score
@@ -98,6 +187,8 @@ class CandidateDetailSerializer(serializers.ModelSerializer):
     total_score = serializers.SerializerMethodField()
     average_score = serializers.SerializerMethodField()
 
+    serializer_field_mapping = CACHED_URL_FIELD_MAPPING
+
     class Meta:
         model = Candidate
         fields = (
@@ -137,7 +228,7 @@ class CandidateDetailSerializer(serializers.ModelSerializer):
         """
         from .models import CandidateScore
 
-        scores = CandidateScore.objects.filter(candidate=obj)
+        scores = CandidateScore.objects.filter(candidate=obj).select_related("exam")
         return [
             {
                 "exam": score.exam.title,
@@ -175,7 +266,7 @@ class CandidateDetailSerializer(serializers.ModelSerializer):
         )
 
 
-class MinimalStaffSerializer(serializers.ModelSerializer):
+class MinimalStaffSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Minimal serializer for listing staff info.
     """
@@ -193,7 +284,7 @@ class MinimalStaffSerializer(serializers.ModelSerializer):
         }
 
 
-class StaffListSerializer(serializers.ModelSerializer):
+class StaffListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for listing staff info.
     """
@@ -212,13 +303,17 @@ class StaffListSerializer(serializers.ModelSerializer):
         )
 
 
-class StaffDetailSerializer(serializers.ModelSerializer):
+class StaffDetailSerializer(
+    SparseFieldsMixin, StagedPhotoMixin, serializers.ModelSerializer
+):
     """
     Detailed staff serializer.
     """
 
     user = UserSerializer(read_only=True)
 
+    serializer_field_mapping = CACHED_URL_FIELD_MAPPING
+
     class Meta:
         model = Staff
         fields = (
@@ -234,7 +329,30 @@ class StaffDetailSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("date_created", "date_updated", "user")
 
-class QuestionListSerializer(serializers.ModelSerializer):
+class UniqueQuestionMixin:
+    """
+    Rejects questions whose normalised text and options match an existing question.
+    """
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        values = {
+            field: attrs.get(field, getattr(self.instance, field, ""))
+            for field in ("text", "option_a", "option_b", "option_c", "option_d")
+        }
+        duplicates = Question.objects.filter(
+            text_hash=Question.build_text_hash(**values)
+        )
+        if self.instance is not None:
+            duplicates = duplicates.exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError(
+                {"text": "An identical question already exists."}
+            )
+        return attrs
+
+
+class QuestionListSerializer(UniqueQuestionMixin, serializers.ModelSerializer):
     """
     Serializer for exam questions with created_by staff included.
     """
@@ -257,7 +375,7 @@ class QuestionListSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("id", "date_created", "created_by")
 
-class QuestionDetailSerializer(serializers.ModelSerializer):
+class QuestionDetailSerializer(UniqueQuestionMixin, serializers.ModelSerializer):
     """
     Serializer for exam questions with created_by staff included.
     """
@@ -281,13 +399,32 @@ class QuestionDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "date_created", "created_by")
 
 
-class ExamListSerializer(serializers.ModelSerializer):
+class QuestionImportSerializer(serializers.ModelSerializer):
+    """
+    Validates a single row of a question bank import.
+    """
+
+    class Meta:
+        model = Question
+        fields = (
+            "text",
+            "option_a",
+            "option_b",
+            "option_c",
+            "option_d",
+            "correct_answer",
+            "difficulty",
+        )
+
+
+class ExamListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for listing exams with question count and creator.
     """
 
     question_count = serializers.SerializerMethodField()
-    # created_by = MinimalStaffSerializer(read_only=True)
+
+    expandable_fields = {"created_by": MinimalStaffSerializer(read_only=True)}
 
     class Meta:
         model = Exam
@@ -313,16 +450,58 @@ class ExamListSerializer(serializers.ModelSerializer):
         return obj.get_question_count()
 
 
-class ExamDetailSerializer(serializers.ModelSerializer):
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """
+    Validates a list of primary keys with one query for all of them.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pks = []
+        for item in data:
+            if isinstance(item, bool):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+            try:
+                pks.append(queryset.model._meta.pk.to_python(item))
+            except ValidationError:
+                child.fail("incorrect_type", data_type=type(item).__name__)
+
+        objects = queryset.in_bulk(set(pks))
+        for pk in pks:
+            if pk not in objects:
+                child.fail("does_not_exist", pk_value=pk)
+        return [objects[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that, with `many=True`, looks up every object in a single
+    query instead of one query per key.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
+class ExamDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Detailed serializer for a single exam, including:
     - question list
     - average score
     """
 
-    questions = serializers.PrimaryKeyRelatedField(
-        queryset=Question.objects.all(), many=True
-    )
+    questions = BulkPrimaryKeyRelatedField(queryset=Question.objects.all(), many=True)
     created_by = MinimalStaffSerializer(read_only=True)
     average_score = serializers.SerializerMethodField()
 
@@ -352,7 +531,7 @@ class ExamDetailSerializer(serializers.ModelSerializer):
         return obj.get_average_score()
 
 
-class CandidateScoreSerializer(serializers.ModelSerializer):
+class CandidateScoreSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for candidate scores, including related candidate and exam info.
     """
@@ -360,13 +539,53 @@ class CandidateScoreSerializer(serializers.ModelSerializer):
     candidate = CandidateListSerializer(read_only=True)
     exam = ExamListSerializer(read_only=True)
 
+    expandable_fields = {"submitted_by": MinimalStaffSerializer(read_only=True)}
+
     class Meta:
         model = CandidateScore
         fields = ("id", "candidate", "exam", "score", "date_recorded")
         read_only_fields = ("id", "date_created")
 
 
-class CandidateRegistrationSerializer(serializers.ModelSerializer):
+class CandidatePromotionSerializer(serializers.Serializer):
+    """
+    Validates a bulk promotion request.
+
+    Candidates are selected either from an exam's stage (ranked by that exam's score)
+    or from a stage (ranked by total score across the stage's exams), keeping the
+    `top_k` best and/or those scoring at least `min_score`.
+    """
+
+    exam_id = serializers.PrimaryKeyRelatedField(
+        queryset=Exam.objects.all(), source="exam", required=False
+    )
+    stage = serializers.ChoiceField(choices=list(NEXT_ROLE), required=False)
+    top_k = serializers.IntegerField(min_value=1, required=False)
+    min_score = serializers.DecimalField(
+        max_digits=7, decimal_places=2, required=False
+    )
+    to_role = serializers.ChoiceField(choices=Candidate.ROLE_CHOICES, required=False)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        exam = attrs.get("exam")
+        stage = attrs.get("stage")
+
+        if (exam is None) == (stage is None):
+            raise serializers.ValidationError("Provide exactly one of exam_id or stage.")
+        if attrs.get("top_k") is None and attrs.get("min_score") is None:
+            raise serializers.ValidationError("Provide top_k, min_score, or both.")
+
+        attrs["from_role"] = exam.stage if exam is not None else stage
+        attrs.setdefault("to_role", NEXT_ROLE[attrs["from_role"]])
+        if attrs["to_role"] == attrs["from_role"]:
+            raise serializers.ValidationError(
+                {"to_role": "Candidates already hold this role."}
+            )
+        return attrs
+
+
+class CandidateRegistrationSerializer(StagedPhotoMixin, serializers.ModelSerializer):
     """
     Serializer for registering new candidates (creates User and Candidate).
     """
@@ -397,21 +616,30 @@ class CandidateRegistrationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user_data = validated_data.pop("user")
         password, _ = validated_data.pop("password1"), validated_data.pop("password2")
+        uploads = self.pop_photo_uploads(validated_data)
 
-        with transaction.atomic():
-            user = User.objects.create_user(
-                username=user_data["username"],
-                email=user_data["email"],
-                first_name=user_data.get("first_name", ""),
-                last_name=user_data.get("last_name", ""),
-                password=password,
-            )
-
-            candidate = Candidate.objects.create(user=user, **validated_data)
-            return candidate
-
+        # Hashed in the hashing pool, before the transaction is opened.
+        encoded_password = hash_password(password)
 
-class StaffRegistrationSerializer(serializers.ModelSerializer):
+        try:
+            with transaction.atomic():
+                user = User.objects.create(
+                    username=User.normalize_username(user_data["username"]),
+                    email=User.objects.normalize_email(user_data["email"]),
+                    first_name=user_data.get("first_name", ""),
+                    last_name=user_data.get("last_name", ""),
+                    password=encoded_password,
+                )
+
+                candidate = Candidate.objects.create(user=user, **validated_data)
+                self.schedule_photo_uploads(candidate, uploads)
+                return candidate
+        except IntegrityError as e:
+            # Registered concurrently with the same username or email.
+            raise serializers.ValidationError({"user": unique_user_error(e).detail})
+
+
+class StaffRegistrationSerializer(StagedPhotoMixin, serializers.ModelSerializer):
     """
     Serializer for registering new staff (creates User and Staff).
     """
@@ -449,26 +677,39 @@ class StaffRegistrationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user_data = validated_data.pop("user")
         password, _ = validated_data.pop("password1"), validated_data.pop("password2")
+        uploads = self.pop_photo_uploads(validated_data)
 
-        with transaction.atomic():
-            user = User.objects.create_user(
-                username=user_data["username"],
-                email=user_data["email"],
-                first_name=user_data.get("first_name", ""),
-                last_name=user_data.get("last_name", ""),
-                password=password,
-            )
+        # Hashed in the hashing pool, before the transaction is opened.
+        encoded_password = hash_password(password)
 
-            staff = Staff.objects.create(user=user, **validated_data)
-            return staff
+        try:
+            with transaction.atomic():
+                user = User.objects.create(
+                    username=User.normalize_username(user_data["username"]),
+                    email=User.objects.normalize_email(user_data["email"]),
+                    first_name=user_data.get("first_name", ""),
+                    last_name=user_data.get("last_name", ""),
+                    password=encoded_password,
+                )
+
+                staff = Staff.objects.create(user=user, **validated_data)
+                self.schedule_photo_uploads(staff, uploads)
+                return staff
+        except IntegrityError as e:
+            # Registered concurrently with the same username or email.
+            raise serializers.ValidationError({"user": unique_user_error(e).detail})
 
 
 class CandidateAnswerSerializer(serializers.ModelSerializer):
     """
     Represents a candidate's answer to a question.
     - If a question is unanswered, set 'selected_option' to an empty string "".
+
+    The question is validated as an ID here and looked up by
+    `CandidateAnswerBulkSerializer`, together with every other answer's.
     """
 
+    question = serializers.IntegerField()
     selected_option = serializers.CharField(required=False, allow_blank=True)
 
     class Meta:
@@ -479,6 +720,44 @@ class CandidateAnswerSerializer(serializers.ModelSerializer):
 class CandidateAnswerBulkSerializer(serializers.Serializer):
     answers = CandidateAnswerSerializer(many=True)
 
+    def validate_answers(self, value):
+        if not value:
+            raise serializers.ValidationError("At least one answer must be provided.")
+
+        ids = {answer["question"] for answer in value}
+        questions = Question.objects.in_bulk(ids)
+        if len(questions) < len(ids):
+            message = serializers.PrimaryKeyRelatedField.default_error_messages[
+                "does_not_exist"
+            ]
+            raise serializers.ValidationError(
+                [
+                    {}
+                    if answer["question"] in questions
+                    else {"question": [message.format(pk_value=answer["question"])]}
+                    for answer in value
+                ]
+            )
+        for answer in value:
+            answer["question"] = questions[answer["question"]]
+        return value
+
+
+class AutosaveAnswerSerializer(serializers.Serializer):
+    """
+    A single in-progress answer. Questions are validated against the cached exam
+    question IDs by the view, so no query is made per answer.
+    """
+
+    question = serializers.IntegerField()
+    selected_option = serializers.ChoiceField(
+        choices=Question.QUESTION_OPTIONS, allow_blank=True, default=""
+    )
+
+
+class AutosaveAnswersSerializer(serializers.Serializer):
+    answers = AutosaveAnswerSerializer(many=True)
+
     def validate_answers(self, value):
         if not value:
             raise serializers.ValidationError("At least one answer must be provided.")
@@ -513,3 +792,20 @@ class CandidateExamSerializer(serializers.ModelSerializer):
             "countdown_minutes",
             "questions",
         )
+
+
+class FilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refreshes tokens, checking the blacklist Bloom filter before the database.
+    """
+
+    token_class = FilteredRefreshToken
+
+
+class UploadTicketSerializer(serializers.Serializer):
+    """
+    Request for a presigned direct upload of a profile image.
+    """
+
+    field = serializers.ChoiceField(choices=UPLOAD_TICKET_FIELDS)
+    content_type = serializers.ChoiceField(choices=UPLOAD_CONTENT_TYPES)
@@ -0,0 +1,26 @@
+"""
+Signal handlers keeping cached data consistent with the database, and
+collecting database connection metrics.
+"""
+
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_api_key.models import APIKey  # type: ignore
+
+from .utils.cache_utils import API_KEYS, invalidate_cache_namespaces
+from .utils.db_metrics import record_connection_created, record_request_started
+
+connection_created.connect(record_connection_created)
+request_started.connect(record_request_started)
+
+
+@receiver(post_save, sender=APIKey)
+@receiver(post_delete, sender=APIKey)
+def invalidate_api_key_cache(sender, **kwargs):
+    """
+    Drops every cached API key verification when a key is created, changed
+    (e.g. revoked) or deleted, so revocations apply immediately.
+    """
+    invalidate_cache_namespaces(API_KEYS)
@@ -1,12 +1,45 @@
+import mimetypes
+from types import SimpleNamespace
+
 import pytest
+from botocore.exceptions import ClientError
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
+from storages.backends.s3boto3 import S3Boto3Storage
 
 from api.models import Candidate, Staff, Exam, Question
+from api.utils.media_urls import clear_media_url_cache
+from api.utils.metrics import collect_request_metrics
 
 User = get_user_model()
 
+# Query counts of the endpoints measured by `test_query_budget.py`, by test ID.
+QUERY_COUNTS = {}
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Print the query count of every measured endpoint after the test run."""
+    if not QUERY_COUNTS:
+        return
+    terminalreporter.section("query counts per endpoint")
+    width = max(len(endpoint) for endpoint in QUERY_COUNTS)
+    for endpoint, counts in sorted(QUERY_COUNTS.items()):
+        sizes = "  ".join(f"n={size}: {count:>3}" for size, count in counts.items())
+        terminalreporter.write_line(f"{endpoint:<{width}}  {sizes}")
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache so cached data cannot leak between tests."""
+    cache.clear()
+    clear_media_url_cache()
+    yield
+    cache.clear()
+    clear_media_url_cache()
+
 
 @pytest.fixture
 def api_client():
@@ -14,6 +47,91 @@ def api_client():
     return APIClient()
 
 
+@pytest.fixture
+def count_queries():
+    """
+    Returns a function calling `func(*args, **kwargs)` and returning its result
+    with the number of database queries it made, on every connection.
+    """
+
+    def _count(func, *args, **kwargs):
+        with collect_request_metrics() as collector:
+            result = func(*args, **kwargs)
+        return result, collector.queries
+
+    return _count
+
+
+@pytest.fixture
+def query_counts():
+    """The endpoint query counts printed at the end of the test run."""
+    return QUERY_COUNTS
+
+
+@pytest.fixture
+def local_s3(settings, monkeypatch, tmp_path):
+    """
+    S3 storage pointed at a local S3-compatible endpoint. Presigning needs no
+    connection; uploaded objects are kept in memory, by content (or by size
+    alone, for objects that are never read). Their content type is guessed from
+    their extension, as enforced by the upload ticket.
+    """
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "default": {
+            "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+            "OPTIONS": {
+                "access_key": "test",
+                "secret_key": "test",
+                "bucket_name": "verboheit-test",
+                "region_name": "us-east-1",
+                "endpoint_url": "http://localhost:9000",
+            },
+        },
+    }
+    settings.PHOTO_STAGING_DIR = tmp_path / "staging"
+    uploaded = {}
+
+    class StoredObject:
+        def __init__(self, key):
+            self.key = key
+
+        def load(self):
+            if self.key not in uploaded:
+                raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+        @property
+        def content_length(self):
+            content = uploaded[self.key]
+            return content if isinstance(content, int) else len(content)
+
+        @property
+        def content_type(self):
+            return mimetypes.guess_type(self.key)[0]
+
+    def open_(self, name, mode="rb"):
+        return ContentFile(uploaded[name], name=name)
+
+    def save(self, name, content):
+        uploaded[name] = content.read()
+        return name
+
+    monkeypatch.setattr(S3Boto3Storage, "exists", lambda self, name: name in uploaded)
+    monkeypatch.setattr(
+        S3Boto3Storage,
+        "bucket",
+        property(
+            lambda self: SimpleNamespace(name=self.bucket_name, Object=StoredObject)
+        ),
+    )
+    monkeypatch.setattr(S3Boto3Storage, "_open", open_)
+    monkeypatch.setattr(S3Boto3Storage, "_save", save)
+    monkeypatch.setattr(
+        S3Boto3Storage, "delete", lambda self, name: uploaded.pop(name, None)
+    )
+    return uploaded
+
+
 @pytest.fixture
 def create_user():
     """Create a basic user."""
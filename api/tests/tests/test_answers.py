@@ -1,10 +1,27 @@
 ## File: api/tests/test_answers.py
+import threading
+import time
+from datetime import timedelta
+
 import pytest
+from django.core.cache import cache
+from django.core.management import call_command
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
-from api.models import Candidate, Staff, Exam, Question, CandidateScore
+from api.models import (
+    Candidate,
+    Staff,
+    Exam,
+    Question,
+    CandidateScore,
+    CandidateAnswer,
+    ExamSession,
+)
+from api.utils import exam_session
+from api.utils.exam_session import start_exam_session
 
 User = get_user_model()
 
@@ -22,6 +39,14 @@ def submit_exam_answers_url():
     return _dynamic_url
 
 
+@pytest.fixture
+def autosave_exam_answers_url():
+    def _dynamic_url(exam_id):
+        return reverse("v1:api-autosave-exam-answers", kwargs={"exam_id": exam_id})
+
+    return _dynamic_url
+
+
 @pytest.fixture
 def create_logged_in_screening_candidate(api_client):
     def do_create(username="patrick", email="patrick@test.com", password="password123"):
@@ -93,6 +118,7 @@ class TestSubmitExamAnswers:
                 {"question": question_2.id, "selected_option": "D"},
             ]
         }
+        start_exam_session(candidate, exam)
         api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
         response = api_client.post(
             submit_exam_answers_url(exam.id), candidate_answers_data, format="json"
@@ -107,7 +133,7 @@ class TestSubmitExamAnswers:
     def test_candidate_duplicate_submit_exam_answers_fail(
         self, api_client, submit_exam_answers_url, create_logged_in_screening_candidate
     ):
-        _, _, access = create_logged_in_screening_candidate()
+        candidate, _, access = create_logged_in_screening_candidate()
         exam_data = {
             "stage": "screening",
             "title": "Screening Exam",
@@ -159,6 +185,7 @@ class TestSubmitExamAnswers:
                 {"question": question_2.id, "selected_option": "A"},
             ]
         }
+        start_exam_session(candidate, exam)
         api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
         api_client.post(
             submit_exam_answers_url(exam.id), candidate_answers_data, format="json"
@@ -171,3 +198,361 @@ class TestSubmitExamAnswers:
             "You have already submitted answers for this exam."
             in response.data["message"]
         )
+
+
+@pytest.mark.django_db
+class TestAutosaveExamAnswers:
+    @pytest.fixture
+    def screening_exam(self):
+        exam = Exam.objects.create(
+            stage="screening", title="Screening Exam", is_active=True
+        )
+        questions = [
+            Question.objects.create(
+                text=f"Question {i}",
+                option_a="1",
+                option_b="2",
+                option_c="3",
+                option_d="4",
+                correct_answer="B",
+            )
+            for i in range(3)
+        ]
+        exam.questions.add(*questions)
+        return exam, questions
+
+    def test_autosaved_answers_are_included_in_final_submission(
+        self,
+        api_client,
+        autosave_exam_answers_url,
+        submit_exam_answers_url,
+        create_logged_in_screening_candidate,
+        screening_exam,
+    ):
+        candidate, _, _ = create_logged_in_screening_candidate()
+        exam, questions = screening_exam
+        start_exam_session(candidate, exam)
+
+        response = api_client.post(
+            autosave_exam_answers_url(exam.id),
+            {
+                "answers": [
+                    {"question": questions[0].id, "selected_option": "B"},
+                    {"question": questions[1].id, "selected_option": "A"},
+                ]
+            },
+            format="json",
+        )
+        assert response.status_code == 200
+        assert response.data["saved"] == 2
+        assert response.data["flushed"] is False
+        assert not CandidateAnswer.objects.exists()
+
+        response = api_client.post(
+            submit_exam_answers_url(exam.id),
+            {"answers": [{"question": questions[1].id, "selected_option": "B"}]},
+            format="json",
+        )
+        assert response.status_code == 200
+
+        candidate_score = CandidateScore.objects.get(candidate=candidate, exam=exam)
+        assert candidate_score.submitted_at is not None
+        assert float(candidate_score.score) == 66.67
+        assert dict(
+            candidate_score.answers.values_list("question_id", "selected_option")
+        ) == {questions[0].id: "B", questions[1].id: "B"}
+
+    def test_autosave_flushes_to_database_in_batches(
+        self,
+        api_client,
+        autosave_exam_answers_url,
+        create_logged_in_screening_candidate,
+        screening_exam,
+        monkeypatch,
+    ):
+        monkeypatch.setattr("api.utils.exam_session.AUTOSAVE_FLUSH_BATCH_SIZE", 3)
+        candidate, _, _ = create_logged_in_screening_candidate()
+        exam, questions = screening_exam
+        start_exam_session(candidate, exam)
+
+        response = api_client.post(
+            autosave_exam_answers_url(exam.id),
+            {
+                "answers": [
+                    {"question": question.id, "selected_option": "C"}
+                    for question in questions
+                ]
+            },
+            format="json",
+        )
+        assert response.status_code == 200
+        assert response.data["flushed"] is True
+        assert (
+            CandidateAnswer.objects.filter(
+                candidate_score__candidate=candidate, selected_option="C"
+            ).count()
+            == 3
+        )
+
+    def test_autosave_rejects_questions_outside_exam(
+        self,
+        api_client,
+        autosave_exam_answers_url,
+        create_logged_in_screening_candidate,
+        screening_exam,
+    ):
+        candidate, _, _ = create_logged_in_screening_candidate()
+        exam, _ = screening_exam
+        start_exam_session(candidate, exam)
+        other = Question.objects.create(
+            text="Unrelated question", option_a="x", correct_answer="A"
+        )
+
+        response = api_client.post(
+            autosave_exam_answers_url(exam.id),
+            {"answers": [{"question": other.id, "selected_option": "A"}]},
+            format="json",
+        )
+        assert response.status_code == 400
+        assert response.data["questions"] == [other.id]
+
+    def test_autosave_without_session_fail(
+        self,
+        api_client,
+        autosave_exam_answers_url,
+        create_logged_in_screening_candidate,
+        screening_exam,
+    ):
+        create_logged_in_screening_candidate()
+        exam, questions = screening_exam
+
+        response = api_client.post(
+            autosave_exam_answers_url(exam.id),
+            {"answers": [{"question": questions[0].id, "selected_option": "A"}]},
+            format="json",
+        )
+        assert response.status_code == 400
+        assert "not started" in response.data["message"]
+
+    def test_autosave_after_submission_fail(
+        self,
+        api_client,
+        autosave_exam_answers_url,
+        submit_exam_answers_url,
+        create_logged_in_screening_candidate,
+        screening_exam,
+    ):
+        candidate, _, _ = create_logged_in_screening_candidate()
+        exam, questions = screening_exam
+        start_exam_session(candidate, exam)
+        answers = {"answers": [{"question": questions[0].id, "selected_option": "B"}]}
+        response = api_client.post(
+            submit_exam_answers_url(exam.id), answers, format="json"
+        )
+        assert response.status_code == 200
+
+        response = api_client.post(
+            autosave_exam_answers_url(exam.id), answers, format="json"
+        )
+        assert response.status_code == 409
+        assert not cache.get(f"exam-session:{exam.id}:{candidate.pk}")
+
+    def test_submit_rejects_unknown_questions(
+        self,
+        api_client,
+        submit_exam_answers_url,
+        create_logged_in_screening_candidate,
+        screening_exam,
+    ):
+        candidate, _, _ = create_logged_in_screening_candidate()
+        exam, questions = screening_exam
+        start_exam_session(candidate, exam)
+
+        response = api_client.post(
+            submit_exam_answers_url(exam.id),
+            {
+                "answers": [
+                    {"question": questions[0].id, "selected_option": "A"},
+                    {"question": questions[0].id + 1000, "selected_option": "A"},
+                ]
+            },
+            format="json",
+        )
+        assert response.status_code == 400
+        assert response.data["answers"][0] == {}
+        assert "question" in response.data["answers"][1]
+
+    def test_submit_without_session_fail(
+        self,
+        api_client,
+        submit_exam_answers_url,
+        create_logged_in_screening_candidate,
+        screening_exam,
+    ):
+        create_logged_in_screening_candidate()
+        exam, questions = screening_exam
+
+        response = api_client.post(
+            submit_exam_answers_url(exam.id),
+            {"answers": [{"question": questions[0].id, "selected_option": "B"}]},
+            format="json",
+        )
+        assert response.status_code == 400
+        assert "not started" in response.data["message"]
+        assert not CandidateScore.objects.exists()
+
+    def test_concurrent_autosaves_keep_every_answer(self, monkeypatch):
+        # Widen the window between reading and writing back the state.
+        original_get = exam_session.get_session_state
+
+        def slow_get(candidate_id, exam_id):
+            state = original_get(candidate_id, exam_id)
+            time.sleep(0.01)
+            return state
+
+        monkeypatch.setattr(exam_session, "get_session_state", slow_get)
+        threads = [
+            threading.Thread(
+                target=exam_session.buffer_answers, args=(1, 1, {question_id: "A"})
+            )
+            for question_id in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert exam_session.pop_buffered_answers(1, 1) == dict.fromkeys(range(8), "A")
+
+    def test_autosave_waits_for_locked_state(self, monkeypatch):
+        monkeypatch.setattr(exam_session, "STATE_LOCK_TIMEOUT_SECONDS", 0.05)
+        cache.add("exam-session-lock:1:1", "other", 60)
+
+        with pytest.raises(exam_session.ExamSessionBusy):
+            exam_session.buffer_answers(1, 1, {1: "A"})
+
+
+@pytest.mark.django_db
+class TestTimedExamSessions:
+    @pytest.fixture
+    def expired_session(self, create_logged_in_screening_candidate):
+        candidate, _, _ = create_logged_in_screening_candidate()
+        exam = Exam.objects.create(stage="screening", title="Screening Exam")
+        question = Question.objects.create(
+            text="Question", option_a="1", option_b="2", correct_answer="B"
+        )
+        exam.questions.add(question)
+        started_at = timezone.now() - timedelta(hours=2)
+        ExamSession.objects.create(
+            candidate=candidate,
+            exam=exam,
+            started_at=started_at,
+            deadline=started_at + timedelta(hours=1),
+            question_seed=1,
+        )
+        return candidate, exam, question
+
+    def test_submit_after_deadline_fail(
+        self, api_client, submit_exam_answers_url, expired_session
+    ):
+        candidate, exam, question = expired_session
+        response = api_client.post(
+            submit_exam_answers_url(exam.id),
+            {"answers": [{"question": question.id, "selected_option": "B"}]},
+            format="json",
+        )
+        assert response.status_code == 400
+        assert "expired" in response.data["message"]
+        assert not CandidateAnswer.objects.exists()
+
+    def test_sweeper_finalises_expired_sessions(
+        self, api_client, autosave_exam_answers_url, expired_session
+    ):
+        candidate, exam, question = expired_session
+        session = ExamSession.objects.get()
+        session.deadline = timezone.now() + timedelta(minutes=5)
+        session.save()
+        api_client.post(
+            autosave_exam_answers_url(exam.id),
+            {"answers": [{"question": question.id, "selected_option": "B"}]},
+            format="json",
+        )
+        ExamSession.objects.update(deadline=timezone.now() - timedelta(hours=1))
+
+        call_command("finalise_exam_sessions")
+
+        candidate_score = CandidateScore.objects.get(candidate=candidate, exam=exam)
+        assert candidate_score.submitted_at is not None
+        assert candidate_score.score == 100
+        assert ExamSession.objects.get().finalised_at is not None
+
+
+@pytest.mark.django_db
+class TestIdempotentSubmission:
+    @pytest.fixture
+    def exam_with_question(self):
+        exam = Exam.objects.create(stage="screening", title="Screening Exam")
+        question = Question.objects.create(
+            text="Question", option_a="1", option_b="2", correct_answer="B"
+        )
+        exam.questions.add(question)
+        return exam, question
+
+    def test_retry_with_same_key_returns_original_response(
+        self,
+        api_client,
+        submit_exam_answers_url,
+        create_logged_in_screening_candidate,
+        exam_with_question,
+    ):
+        candidate, _, _ = create_logged_in_screening_candidate()
+        exam, question = exam_with_question
+        data = {"answers": [{"question": question.id, "selected_option": "B"}]}
+        start_exam_session(candidate, exam)
+
+        first = api_client.post(
+            submit_exam_answers_url(exam.id),
+            data,
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="submit-1",
+        )
+        submitted_at = CandidateScore.objects.get(candidate=candidate).submitted_at
+        retry = api_client.post(
+            submit_exam_answers_url(exam.id),
+            {"answers": []},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="submit-1",
+        )
+
+        assert first.status_code == retry.status_code == 200
+        assert retry.data == first.data
+        candidate_score = CandidateScore.objects.get(candidate=candidate)
+        assert candidate_score.submitted_at == submitted_at
+        assert candidate_score.answers.count() == 1
+
+    def test_key_reused_for_another_exam_fail(
+        self,
+        api_client,
+        submit_exam_answers_url,
+        create_logged_in_screening_candidate,
+        exam_with_question,
+    ):
+        candidate, _, _ = create_logged_in_screening_candidate()
+        exam, question = exam_with_question
+        start_exam_session(candidate, exam)
+        other_exam = Exam.objects.create(stage="screening", title="Another Exam")
+        data = {"answers": [{"question": question.id, "selected_option": "B"}]}
+
+        api_client.post(
+            submit_exam_answers_url(exam.id),
+            data,
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="submit-1",
+        )
+        response = api_client.post(
+            submit_exam_answers_url(other_exam.id),
+            data,
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="submit-1",
+        )
+        assert response.status_code == 422
@@ -1,7 +1,23 @@
+import threading
+from datetime import timedelta
+
 import pytest
 
 from django.urls import reverse
-from django.contrib.auth import get_user_model
+from django.contrib.auth import authenticate, get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from rest_framework_api_key.models import APIKey
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.permissions import CachedHasAPIKey
+from api.utils import password_pool
+from api.utils.token_blacklist import BloomFilter
 
 User = get_user_model()
 
@@ -102,4 +118,103 @@ class TestLogout:
 
     def test_logout_auth_required(self, authenticated_api_client, logout_url):
         response = authenticated_api_client.post(logout_url, {"refresh_token": "sometoken"}, format="json")
-        assert response.status_code == 401
\ No newline at end of file
+        assert response.status_code == 401
+
+@pytest.mark.django_db
+class TestCachedAPIKey:
+    @pytest.fixture
+    def key_request(self):
+        api_key, key = APIKey.objects.create_key(name="frontend")
+        request = APIRequestFactory().post("/", HTTP_AUTHORIZATION=f"Api-Key {key}")
+        return api_key, request
+
+    def test_verified_key_is_cached(self, key_request, django_assert_num_queries):
+        _, request = key_request
+        permission = CachedHasAPIKey()
+        assert permission.has_permission(request, None)
+        with django_assert_num_queries(0):
+            assert permission.has_permission(request, None)
+
+    def test_revoked_key_is_rejected_immediately(self, key_request):
+        api_key, request = key_request
+        permission = CachedHasAPIKey()
+        assert permission.has_permission(request, None)
+
+        api_key.revoked = True
+        api_key.save()
+        assert not permission.has_permission(request, None)
+
+    def test_invalid_key_is_rejected(self, key_request):
+        api_key, _ = key_request
+        request = APIRequestFactory().post(
+            "/", HTTP_AUTHORIZATION=f"Api-Key {api_key.prefix}.wrong"
+        )
+        assert not CachedHasAPIKey().has_permission(request, None)
+
+
+@pytest.fixture
+def token_refresh_url():
+    return reverse("v1:token-refresh")
+
+
+@pytest.mark.django_db
+class TestTokenBlacklist:
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(100)
+        items = [f"jti-{i}" for i in range(100)]
+        for item in items:
+            bloom.add(item)
+        assert all(item in bloom for item in items)
+        assert sum(f"other-{i}" in bloom for i in range(1000)) < 50
+
+    def test_rotated_refresh_token_cannot_be_reused(self, api_client, token_refresh_url):
+        user = User.objects.create_user(username="patrick", password="password123")
+        refresh = str(RefreshToken.for_user(user))
+
+        response = api_client.post(token_refresh_url, {"refresh": refresh})
+        assert response.status_code == 200
+        response = api_client.post(token_refresh_url, {"refresh": refresh})
+        assert response.status_code == 401
+
+    def test_prune_deletes_expired_tokens(self):
+        user = User.objects.create_user(username="patrick", password="password123")
+        now = timezone.now()
+        for i in range(3):
+            expired = OutstandingToken.objects.create(
+                user=user,
+                jti=f"expired-{i}",
+                token="x",
+                expires_at=now - timedelta(days=1),
+            )
+            BlacklistedToken.objects.create(token=expired)
+        OutstandingToken.objects.create(
+            user=user, jti="valid", token="x", expires_at=now + timedelta(days=1)
+        )
+
+        call_command("prune_token_blacklist", batch_size=2)
+
+        assert list(OutstandingToken.objects.values_list("jti", flat=True)) == ["valid"]
+        assert not BlacklistedToken.objects.exists()
+
+
+@pytest.mark.django_db
+class TestPasswordHashingPool:
+    def test_login_password_is_verified_in_pool(self, settings):
+        settings.PASSWORD_HASHING_WORKERS = 1
+        User.objects.create_user(username="patrick", password="password123")
+        completed = password_pool.get_password_pool_stats()["completed"]
+
+        assert authenticate(username="patrick", password="password123") is not None
+        assert authenticate(username="patrick", password="wrong-password") is None
+        assert password_pool.get_password_pool_stats()["completed"] == completed + 2
+
+    def test_full_pool_rejects_request(self, settings, monkeypatch):
+        settings.PASSWORD_HASHING_WORKERS = 1
+        settings.PASSWORD_HASHING_QUEUE_TIMEOUT = 0.01
+        full = threading.BoundedSemaphore(1)
+        full.acquire()
+        monkeypatch.setattr(password_pool, "_get_executor", lambda: (None, full))
+
+        with pytest.raises(password_pool.PasswordHashingBusy):
+            password_pool.hash_password("password123")
+        assert password_pool.get_password_pool_stats()["rejected"] >= 1
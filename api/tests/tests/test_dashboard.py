@@ -1,5 +1,13 @@
+import io
+
 import pytest
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
+from PIL import Image
+
+from api.serializers import CandidateDetailSerializer
+from api.utils.photos import get_photo_variant_name
 
 
 @pytest.fixture
@@ -12,6 +20,25 @@ def staff_dashboard_url():
     return reverse("v1:api-staff-dashboard")
 
 
+@pytest.fixture
+def account_management_url():
+    return reverse("v1:api-account-management")
+
+
+@pytest.fixture
+def local_media_storage(settings, tmp_path):
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "default": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "OPTIONS": {"location": str(tmp_path / "media"), "base_url": "/media/"},
+        },
+    }
+    settings.PHOTO_STAGING_DIR = tmp_path / "staging"
+    settings.PHOTO_PROCESSING_WORKERS = 0
+    return tmp_path
+
+
 @pytest.mark.django_db
 class TestDashboard:
     def test_candidate_dashboard_by_candidate_success(
@@ -45,3 +72,69 @@ class TestDashboard:
         api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
         response = api_client.get(staff_dashboard_url)
         assert response.status_code == 403
+
+
+@pytest.mark.django_db
+class TestProfilePhotoProcessing:
+    def test_uploaded_photo_is_processed_after_response(
+        self,
+        api_client,
+        account_management_url,
+        candidate_dashboard_url,
+        create_logged_in_candidate,
+        local_media_storage,
+        django_capture_on_commit_callbacks,
+    ):
+        candidate, _, access = create_logged_in_candidate()
+        exif = Image.Exif()
+        exif[0x010F] = "Test Camera"
+        upload = io.BytesIO()
+        Image.new("RGB", (2000, 1500), "red").save(upload, "JPEG", exif=exif.tobytes())
+        photo = SimpleUploadedFile("me.jpg", upload.getvalue(), "image/jpeg")
+
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        with django_capture_on_commit_callbacks() as callbacks:
+            response = api_client.patch(
+                account_management_url, {"profile_photo": photo}, format="multipart"
+            )
+            assert response.status_code == 200
+            candidate.refresh_from_db()
+            assert not candidate.profile_photo.name.endswith(".webp")
+        for callback in callbacks:
+            callback()
+
+        candidate.refresh_from_db()
+        name = candidate.profile_photo.name
+        assert name.endswith(".webp")
+        media = local_media_storage / "media"
+        with Image.open(media / name) as full:
+            assert max(full.size) == 1024
+            assert not full.getexif()
+        with Image.open(media / get_photo_variant_name(name, "thumb")) as thumb:
+            assert thumb.size == (128, 128)
+        assert not list((local_media_storage / "staging").iterdir())
+
+        response = api_client.get(candidate_dashboard_url)
+        assert response.data["candidate_info"]["profile_photo"].endswith("_small.webp")
+
+
+@pytest.mark.django_db
+class TestMediaURLCache:
+    def test_profile_photo_url_is_built_once(
+        self, create_logged_in_candidate, local_media_storage, monkeypatch
+    ):
+        candidate, _, _ = create_logged_in_candidate()
+        calls = []
+        original_url = FileSystemStorage.url
+
+        def counting_url(storage, name):
+            calls.append(name)
+            return original_url(storage, name)
+
+        monkeypatch.setattr(FileSystemStorage, "url", counting_url)
+
+        first = CandidateDetailSerializer(candidate).data["profile_photo"]
+        second = CandidateDetailSerializer(candidate).data["profile_photo"]
+
+        assert first == second
+        assert calls == [candidate.profile_photo.name]
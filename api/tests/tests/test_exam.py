@@ -1,7 +1,11 @@
+from datetime import timedelta
+
 import pytest
+from django.core.cache import cache
 from django.urls import reverse
+from django.utils import timezone
 
-from api.models import Exam
+from api.models import Exam, ExamSession, Question
 
 
 @pytest.fixture
@@ -129,6 +133,23 @@ class TestSetExam:
         response = api_client.post(exam_list_url, data, format="json")
         assert response.status_code == 201
 
+    def test_set_exam_with_unknown_question_fail(
+        self, api_client, exam_list_url, create_logged_in_owner
+    ):
+        staff, _, access = create_logged_in_owner()
+        question = Question.objects.create(
+            text="What is 2 + 2?", option_a="4", correct_answer="A"
+        )
+        data = {
+            "stage": "league",
+            "title": "League Competition Week 1",
+            "questions": [question.id, question.id + 1000],
+        }
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(exam_list_url, data, format="json")
+        assert response.status_code == 400
+        assert str(question.id + 1000) in response.data["questions"][0]
+
 
 @pytest.mark.django_db
 class TestExamDetail:
@@ -360,3 +381,106 @@ class TestCandidateTakeExam:
         api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
         response = api_client.get(take_exam_url(exam.id))
         assert response.status_code == 403
+
+    def test_take_exam_starts_timed_session(
+        self, api_client, take_exam_url, create_logged_in_screening_candidate
+    ):
+        candidate, _, access = create_logged_in_screening_candidate()
+        exam = Exam.objects.create(
+            stage="screening",
+            title="Screening Exam",
+            is_active=True,
+            countdown_minutes=45,
+        )
+        exam.questions.add(
+            *[
+                Question.objects.create(
+                    text=f"Question {i}", option_a="1", correct_answer="A"
+                )
+                for i in range(5)
+            ]
+        )
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        first = api_client.get(take_exam_url(exam.id))
+        second = api_client.get(take_exam_url(exam.id))
+        assert first.status_code == 200
+        assert second.status_code == 200
+
+        session = ExamSession.objects.get(candidate=candidate, exam=exam)
+        assert session.deadline - session.started_at == timedelta(minutes=45)
+        assert first.data["deadline"] == second.data["deadline"] == session.deadline
+        assert [q["id"] for q in first.data["questions"]] == [
+            q["id"] for q in second.data["questions"]
+        ]
+
+    def test_take_exam_after_deadline_fail(
+        self, api_client, take_exam_url, create_logged_in_screening_candidate
+    ):
+        candidate, _, access = create_logged_in_screening_candidate()
+        exam = Exam.objects.create(
+            stage="screening", title="Screening Exam", is_active=True
+        )
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        api_client.get(take_exam_url(exam.id))
+        ExamSession.objects.filter(candidate=candidate, exam=exam).update(
+            deadline=exam.date_created - timedelta(hours=1)
+        )
+        cache.clear()
+
+        response = api_client.get(take_exam_url(exam.id))
+        assert response.status_code == 400
+        assert "expired" in response.data["message"]
+
+    def test_take_closed_exam_fail(
+        self, api_client, take_exam_url, create_logged_in_screening_candidate
+    ):
+        _, _, access = create_logged_in_screening_candidate()
+        exam = Exam.objects.create(
+            stage="screening",
+            title="Screening Exam",
+            is_active=True,
+            exam_date=timezone.now() - timedelta(days=1),
+            open_duration_hours=2,
+        )
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.get(take_exam_url(exam.id))
+        assert response.status_code == 403
+        assert not ExamSession.objects.exists()
+
+
+@pytest.mark.django_db
+class TestExamOpenNow:
+    def test_open_now_filters_by_stored_window(self):
+        now = timezone.now()
+        always_open = Exam.objects.create(stage="league", is_active=True)
+        in_window = Exam.objects.create(
+            stage="league",
+            is_active=True,
+            exam_date=now - timedelta(hours=1),
+            open_duration_hours=2,
+        )
+        Exam.objects.create(
+            stage="league",
+            is_active=True,
+            exam_date=now - timedelta(hours=3),
+            open_duration_hours=2,
+        )
+        Exam.objects.create(
+            stage="league", is_active=True, exam_date=now + timedelta(hours=1)
+        )
+        Exam.objects.create(stage="league", is_active=False)
+        Exam.objects.create(stage="screening", is_active=True)
+
+        assert in_window.closes_at == in_window.exam_date + timedelta(hours=2)
+        assert set(Exam.objects.open_now("league")) == {always_open, in_window}
+        assert all(exam.is_currently_open for exam in Exam.objects.open_now())
+
+    def test_closes_at_follows_updates(self):
+        exam = Exam.objects.create(
+            stage="league", is_active=True, exam_date=timezone.now()
+        )
+        exam.open_duration_hours = 1
+        exam.save(update_fields=["open_duration_hours"])
+        exam.refresh_from_db()
+        assert exam.closes_at == exam.exam_date + timedelta(hours=1)
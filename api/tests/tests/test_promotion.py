@@ -0,0 +1,110 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+
+from api.models import Candidate, CandidateScore, Exam
+
+User = get_user_model()
+
+
+@pytest.fixture
+def candidate_promote_url():
+    return reverse("v1:api-candidate-promote")
+
+
+@pytest.fixture
+def ranked_screening_candidates():
+    """Create an exam with five screening candidates scoring 10, 20, 30, 40 and 50."""
+
+    def _do():
+        exam = Exam.objects.create(stage="screening", title="Screening Exam")
+        candidates = []
+        for index in range(1, 6):
+            user = User.objects.create_user(
+                username=f"ranked{index}",
+                email=f"ranked{index}@test.com",
+                password="password123",
+            )
+            candidate = Candidate.objects.create(user=user, role="screening")
+            CandidateScore.objects.create(
+                candidate=candidate, exam=exam, score=index * 10
+            )
+            candidates.append(candidate)
+        return exam, candidates
+
+    return _do
+
+
+@pytest.mark.django_db
+class TestPromoteCandidates:
+    def test_promote_by_moderator_fail(
+        self, api_client, candidate_promote_url, create_logged_in_moderator
+    ):
+        _, _, access = create_logged_in_moderator()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(
+            candidate_promote_url, {"stage": "screening", "top_k": 1}, format="json"
+        )
+        assert response.status_code == 403
+
+    def test_promote_top_k_dry_run_by_admin_success(
+        self,
+        api_client,
+        candidate_promote_url,
+        create_logged_in_admin,
+        ranked_screening_candidates,
+    ):
+        exam, candidates = ranked_screening_candidates()
+        _, _, access = create_logged_in_admin()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(
+            candidate_promote_url,
+            {"exam_id": exam.id, "top_k": 2, "dry_run": True},
+            format="json",
+        )
+        assert response.status_code == 200
+        assert response.data["to_role"] == "league"
+        assert [row["candidate_id"] for row in response.data["candidates"]] == [
+            candidates[4].pk,
+            candidates[3].pk,
+        ]
+        assert not Candidate.objects.filter(role="league").exists()
+
+    def test_promote_by_threshold_by_owner_success(
+        self,
+        api_client,
+        candidate_promote_url,
+        create_logged_in_owner,
+        ranked_screening_candidates,
+    ):
+        _, candidates = ranked_screening_candidates()
+        _, _, access = create_logged_in_owner()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(
+            candidate_promote_url,
+            {"stage": "screening", "min_score": 30, "top_k": 2},
+            format="json",
+        )
+        assert response.status_code == 200
+        assert response.data["promoted"] == 2
+        assert set(
+            Candidate.objects.filter(role="league").values_list("pk", flat=True)
+        ) == {candidates[4].pk, candidates[3].pk}
+
+    def test_promote_without_selection_fail(
+        self, api_client, candidate_promote_url, create_logged_in_admin
+    ):
+        _, _, access = create_logged_in_admin()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(
+            candidate_promote_url, {"stage": "screening"}, format="json"
+        )
+        assert response.status_code == 400
+
+    def test_promote_command_success(self, ranked_screening_candidates):
+        exam, candidates = ranked_screening_candidates()
+        call_command("promote_candidates", exam=exam.id, min_score="45")
+        assert list(
+            Candidate.objects.filter(role="league").values_list("pk", flat=True)
+        ) == [candidates[4].pk]
@@ -0,0 +1,607 @@
+"""
+Query budgets of every API endpoint.
+
+Each endpoint is requested against a dataset of `SMALL` and of `LARGE` items of
+everything (candidates, staff, questions, exams, scores and answers, and rows
+in bulk payloads). The number of database queries must not grow with the size
+of the dataset, which catches N+1 queries in views and serializers. The counts
+are printed in the "query counts per endpoint" section of the test report.
+
+Every route in `api/urls.py` must have at least one entry in `ENDPOINTS`.
+"""
+
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_api_key.models import APIKey  # type: ignore
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import (
+    Candidate,
+    CandidateAnswer,
+    CandidateScore,
+    Exam,
+    LeaderboardSnapshot,
+    Question,
+    Staff,
+)
+from api.urls import urlpatterns
+from api.utils.direct_uploads import create_upload_ticket
+from api.utils.exam_session import start_exam_session
+from api.utils.media_urls import clear_media_url_cache
+from api.utils.token_blacklist import rebuild_blacklist_filter
+
+User = get_user_model()
+
+SMALL = 2
+LARGE = 6
+PASSWORD = "password123"
+
+
+def build_dataset(size):
+    """
+    Creates `size` staff, league candidates, questions and past league exams,
+    a score with an answer to every question for each candidate and exam, an
+    open league exam with every question, and a published leaderboard.
+    """
+    now = timezone.now()
+    password = make_password(PASSWORD)
+    owner = Staff.objects.create(
+        user=User.objects.create(username="owner", password=password),
+        role="owner",
+    )
+    staff = [
+        Staff.objects.create(
+            user=User.objects.create(username=f"staff{index}", password=password),
+            role="moderator",
+        )
+        for index in range(size)
+    ]
+    candidates = [
+        Candidate.objects.create(
+            user=User.objects.create(
+                username=f"candidate{index}",
+                password=password,
+                first_name="Candidate",
+                last_name=str(index),
+            ),
+            role="league",
+            school="Test School",
+        )
+        for index in range(size)
+    ]
+    questions = [
+        Question.objects.create(
+            text=f"What is {index} + 1?",
+            option_a=str(index),
+            option_b=str(index + 1),
+            option_c=str(index + 2),
+            option_d=str(index + 3),
+            correct_answer="B",
+            created_by=owner,
+        )
+        for index in range(size)
+    ]
+    exams = []
+    for index in range(size):
+        exam = Exam.objects.create(
+            title=f"Past exam {index}",
+            stage="league",
+            exam_date=now - timedelta(days=10 + index),
+            is_active=True,
+            created_by=owner,
+        )
+        exam.questions.set(questions)
+        exams.append(exam)
+    open_exam = Exam.objects.create(
+        title="Open exam",
+        stage="league",
+        exam_date=now - timedelta(minutes=1),
+        open_duration_hours=2,
+        is_active=True,
+        created_by=owner,
+    )
+    open_exam.questions.set(questions)
+
+    scores = CandidateScore.objects.bulk_create(
+        [
+            CandidateScore(
+                candidate=candidate,
+                exam=exam,
+                score=50,
+                auto_score=True,
+                submitted_at=exam.exam_date + timedelta(minutes=30),
+                submitted_by=owner,
+            )
+            for candidate in candidates
+            for exam in exams
+        ]
+    )
+    CandidateAnswer.objects.bulk_create(
+        [
+            CandidateAnswer(
+                candidate_score=score, question=question, selected_option="B"
+            )
+            for score in scores
+            for question in questions
+        ]
+    )
+    LeaderboardSnapshot.objects.create(
+        data=[
+            {"rank": index + 1, "candidate": {"id": candidate.pk}, "total_score": 50}
+            for index, candidate in enumerate(candidates)
+        ],
+        published_by=owner,
+    )
+    _, api_key = APIKey.objects.create_key(name="query budget")
+
+    return SimpleNamespace(
+        size=size,
+        owner=owner,
+        staff=staff,
+        candidate=candidates[0],
+        candidates=candidates,
+        questions=questions,
+        exams=exams,
+        open_exam=open_exam,
+        api_key=api_key,
+    )
+
+
+def _api_key(data):
+    return {"HTTP_AUTHORIZATION": f"Api-Key {data.api_key}"}
+
+
+def _registration(data, **profile):
+    return {
+        "user": {
+            "username": "newuser",
+            "first_name": "New",
+            "last_name": "User",
+            "email": "newuser@example.com",
+        },
+        "password1": "bikinibottom",
+        "password2": "bikinibottom",
+        "phone": "08033353762",
+        **profile,
+    }
+
+
+def _question(text):
+    return {
+        "text": text,
+        "option_a": "1",
+        "option_b": "2",
+        "option_c": "3",
+        "option_d": "4",
+        "correct_answer": "A",
+        "difficulty": "easy",
+    }
+
+
+def _upload_complete(data):
+    ticket = create_upload_ticket(data.candidate, "profile_photo", "image/jpeg")
+    data.uploaded[ticket["key"]] = b"\xff" * 1024
+    return {"kwargs": {"ticket_id": ticket["ticket"]}}
+
+
+def _answers_request(data):
+    start_exam_session(data.candidate, data.open_exam)
+    return {
+        "kwargs": {"exam_id": data.open_exam.pk},
+        "data": {
+            "answers": [
+                {"question": question.pk, "selected_option": "A"}
+                for question in data.questions
+            ]
+        },
+    }
+
+
+# (route, method, user, request) per measured endpoint. `user` is "owner",
+# "candidate" or None for anonymous requests; `request` builds the URL kwargs,
+# the payload and headers from the dataset.
+ENDPOINTS = [
+    ("api-root", "get", None, lambda data: {}),
+    (
+        "api-login",
+        "post",
+        None,
+        lambda data: {
+            "data": {"username": "candidate0", "password": PASSWORD},
+            "headers": _api_key(data),
+        },
+    ),
+    (
+        "api-logout",
+        "post",
+        "candidate",
+        lambda data: {
+            "data": {
+                "refresh_token": str(RefreshToken.for_user(data.candidate.user))
+            }
+        },
+    ),
+    (
+        "token-obtain-pair",
+        "post",
+        None,
+        lambda data: {"data": {"username": "candidate0", "password": PASSWORD}},
+    ),
+    (
+        "token-refresh",
+        "post",
+        None,
+        lambda data: {
+            "data": {"refresh": str(RefreshToken.for_user(data.candidate.user))}
+        },
+    ),
+    (
+        "api-toggle-candidate-registration",
+        "post",
+        "owner",
+        lambda data: {"data": {"open": True}},
+    ),
+    (
+        "api-toggle-staff-registration",
+        "post",
+        "owner",
+        lambda data: {"data": {"open": True}},
+    ),
+    (
+        "api-register-candidate",
+        "post",
+        None,
+        lambda data: {
+            "data": _registration(data, school="Test School"),
+            "headers": _api_key(data),
+        },
+    ),
+    (
+        "api-register-staff",
+        "post",
+        None,
+        lambda data: {
+            "data": _registration(data, occupation="Teacher"),
+            "headers": _api_key(data),
+        },
+    ),
+    ("api-candidate-list", "get", "owner", lambda data: {}),
+    ("api-candidate-me", "get", "candidate", lambda data: {}),
+    (
+        "api-candidate-promote",
+        "post",
+        "owner",
+        lambda data: {"data": {"stage": "league", "top_k": data.size, "dry_run": True}},
+    ),
+    (
+        "api-candidate-promote",
+        "post",
+        "owner",
+        lambda data: {"data": {"stage": "league", "top_k": data.size}},
+    ),
+    (
+        "api-candidate-detail",
+        "get",
+        "owner",
+        lambda data: {"kwargs": {"candidate_id": data.candidate.pk}},
+    ),
+    (
+        "api-candidate-detail",
+        "patch",
+        "owner",
+        lambda data: {
+            "kwargs": {"candidate_id": data.candidate.pk},
+            "data": {"school": "New School"},
+        },
+    ),
+    (
+        "api-candidate-detail",
+        "delete",
+        "owner",
+        lambda data: {"kwargs": {"candidate_id": data.candidate.pk}},
+    ),
+    (
+        "api-candidate-role-assign",
+        "put",
+        "owner",
+        lambda data: {
+            "kwargs": {"candidate_id": data.candidate.pk},
+            "data": {"role": "final"},
+        },
+    ),
+    (
+        "api-candidate-scores",
+        "get",
+        "owner",
+        lambda data: {"kwargs": {"candidate_id": data.candidate.pk}},
+    ),
+    (
+        "api-candidate-exam-history",
+        "get",
+        "owner",
+        lambda data: {"kwargs": {"candidate_id": data.candidate.pk}},
+    ),
+    ("api-staff-list", "get", "owner", lambda data: {}),
+    ("api-staff-me", "get", "owner", lambda data: {}),
+    (
+        "api-staff-detail",
+        "get",
+        "owner",
+        lambda data: {"kwargs": {"staff_id": data.staff[0].pk}},
+    ),
+    (
+        "api-staff-detail",
+        "patch",
+        "owner",
+        lambda data: {
+            "kwargs": {"staff_id": data.staff[0].pk},
+            "data": {"occupation": "Engineer"},
+        },
+    ),
+    (
+        "api-staff-detail",
+        "delete",
+        "owner",
+        lambda data: {"kwargs": {"staff_id": data.staff[0].pk}},
+    ),
+    (
+        "api-staff-role-assign",
+        "put",
+        "owner",
+        lambda data: {
+            "kwargs": {"staff_id": data.staff[0].pk},
+            "data": {"role": "admin"},
+        },
+    ),
+    ("api-exam-list", "get", "owner", lambda data: {}),
+    (
+        "api-exam-list",
+        "post",
+        "owner",
+        lambda data: {
+            "data": {
+                "title": "New exam",
+                "stage": "league",
+                "exam_date": timezone.now() + timedelta(days=1),
+                "questions": [question.pk for question in data.questions],
+            }
+        },
+    ),
+    (
+        "api-exam-detail",
+        "get",
+        "owner",
+        lambda data: {"kwargs": {"exam_id": data.exams[0].pk}},
+    ),
+    (
+        "api-exam-detail",
+        "patch",
+        "owner",
+        lambda data: {
+            "kwargs": {"exam_id": data.exams[0].pk},
+            "data": {"title": "Renamed exam"},
+        },
+    ),
+    (
+        "api-exam-detail",
+        "delete",
+        "owner",
+        lambda data: {"kwargs": {"exam_id": data.exams[0].pk}},
+    ),
+    (
+        "api-exam-questions",
+        "get",
+        "owner",
+        lambda data: {"kwargs": {"exam_id": data.exams[0].pk}},
+    ),
+    (
+        "api-take-exam",
+        "get",
+        "candidate",
+        lambda data: {"kwargs": {"exam_id": data.open_exam.pk}},
+    ),
+    (
+        "api-submit-exam-score",
+        "put",
+        "owner",
+        lambda data: {
+            "kwargs": {"exam_id": data.open_exam.pk},
+            "data": {"candidate_id": data.candidate.pk, "score": 75},
+        },
+    ),
+    (
+        "api-bulk-submit-exam-scores",
+        "post",
+        "owner",
+        lambda data: {
+            "kwargs": {"exam_id": data.open_exam.pk},
+            "data": {
+                "scores": [
+                    {"candidate_id": candidate.pk, "score": 75}
+                    for candidate in data.candidates
+                ]
+            },
+        },
+    ),
+    ("api-autosave-exam-answers", "post", "candidate", _answers_request),
+    (
+        "api-submit-exam-answers",
+        "post",
+        "candidate",
+        lambda data: {
+            **_answers_request(data),
+            "headers": {"HTTP_IDEMPOTENCY_KEY": str(uuid.uuid4())},
+        },
+    ),
+    ("api-question-list", "get", "owner", lambda data: {}),
+    (
+        "api-question-list",
+        "post",
+        "owner",
+        lambda data: {"data": _question("What is 10 + 10?")},
+    ),
+    (
+        "api-question-import",
+        "post",
+        "owner",
+        lambda data: {
+            "data": {
+                "exam_id": data.open_exam.pk,
+                "questions": [
+                    _question(f"What is {index} x 3?") for index in range(data.size)
+                ],
+            }
+        },
+    ),
+    (
+        "api-question-detail",
+        "get",
+        "owner",
+        lambda data: {"kwargs": {"question_id": data.questions[0].pk}},
+    ),
+    (
+        "api-question-detail",
+        "patch",
+        "owner",
+        lambda data: {
+            "kwargs": {"question_id": data.questions[0].pk},
+            "data": {"difficulty": "hard"},
+        },
+    ),
+    (
+        "api-question-detail",
+        "delete",
+        "owner",
+        lambda data: {"kwargs": {"question_id": data.questions[0].pk}},
+    ),
+    ("api-candidate-dashboard", "get", "candidate", lambda data: {}),
+    ("api-staff-dashboard", "get", "owner", lambda data: {}),
+    ("api-account-management", "get", "candidate", lambda data: {}),
+    (
+        "api-account-management",
+        "patch",
+        "candidate",
+        lambda data: {"data": {"school": "New School"}, "format": "multipart"},
+    ),
+    (
+        "api-account-management-detail",
+        "get",
+        "owner",
+        lambda data: {"kwargs": {"user_id": data.candidate.pk}},
+    ),
+    (
+        "api-account-management-detail",
+        "patch",
+        "owner",
+        lambda data: {
+            "kwargs": {"user_id": data.candidate.pk},
+            "data": {"school": "New School"},
+            "format": "multipart",
+        },
+    ),
+    (
+        "api-upload-ticket",
+        "post",
+        "candidate",
+        lambda data: {"data": {"field": "profile_photo", "content_type": "image/jpeg"}},
+    ),
+    ("api-upload-complete", "post", "candidate", _upload_complete),
+    (
+        "api-toggle-leaderboard",
+        "post",
+        "owner",
+        lambda data: {"data": {"visible": True}},
+    ),
+    ("api-publish-leaderboard", "post", "owner", lambda data: {}),
+    ("api-load-leaderboard", "get", "candidate", lambda data: {}),
+    ("api-db-connection-stats", "get", "owner", lambda data: {}),
+    ("api-metrics", "get", "owner", lambda data: {}),
+    ("api-request-profiles", "get", "owner", lambda data: {}),
+    ("api-request-profiles", "post", "owner", lambda data: {}),
+]
+
+
+def _endpoint_id(route, method, build):
+    endpoint = f"{method.upper()} {route}"
+    if route == "api-candidate-promote":
+        dry_run = build(SimpleNamespace(size=1))["data"].get("dry_run", False)
+        endpoint += " (dry run)" if dry_run else ""
+    return endpoint
+
+
+ENDPOINT_PARAMS = [
+    pytest.param(route, method, user, build, id=_endpoint_id(route, method, build))
+    for route, method, user, build in ENDPOINTS
+]
+
+
+@pytest.fixture
+def measure_endpoint(api_client, count_queries, local_s3):
+    """
+    Returns a function building a dataset of the given size, requesting an
+    endpoint against it and returning the number of queries of the request.
+
+    The dataset is rolled back afterwards, so several sizes can be measured in
+    one test.
+    """
+
+    def _measure(route, method, user, build, size):
+        with transaction.atomic():
+            cache.clear()
+            clear_media_url_cache()
+            data = build_dataset(size)
+            data.uploaded = local_s3
+            # Load the token blacklist filter up front, as in a running worker.
+            rebuild_blacklist_filter()
+            request = build(data)
+            if user == "owner":
+                api_client.force_authenticate(user=data.owner.user)
+            elif user == "candidate":
+                api_client.force_authenticate(user=data.candidate.user)
+            else:
+                api_client.force_authenticate(user=None)
+
+            url = reverse(f"v1:{route}", kwargs=request.get("kwargs"))
+            response, queries = count_queries(
+                getattr(api_client, method),
+                url,
+                request.get("data"),
+                format=request.get("format", "json"),
+                **request.get("headers", {}),
+            )
+            assert response.status_code < 400, (response.status_code, response.data)
+            transaction.set_rollback(True)
+        return queries
+
+    return _measure
+
+
+@pytest.mark.django_db
+class TestQueryBudget:
+    @pytest.mark.parametrize("route, method, user, build", ENDPOINT_PARAMS)
+    def test_query_count_does_not_grow_with_data(
+        self, request, measure_endpoint, query_counts, route, method, user, build
+    ):
+        counts = {
+            size: measure_endpoint(route, method, user, build, size)
+            for size in (SMALL, LARGE)
+        }
+        query_counts[request.node.callspec.id] = counts
+        assert counts[LARGE] == counts[SMALL], (
+            f"{counts[SMALL]} queries with {SMALL} items but {counts[LARGE]} "
+            f"with {LARGE}"
+        )
+
+    def test_every_route_has_a_budget(self):
+        routes = {pattern.name for pattern in urlpatterns}
+        measured = {route for route, _, _, _ in ENDPOINTS}
+        assert routes - measured == set()
@@ -1,7 +1,8 @@
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 
-from api.models import Question
+from api.models import Exam, Question
 
 
 @pytest.fixture
@@ -17,6 +18,11 @@ def question_detail_url():
     return _detail_url
 
 
+@pytest.fixture
+def question_import_url():
+    return reverse("v1:api-question-import")
+
+
 @pytest.mark.django_db
 class TestQuestionList:
     def test_question_list_by_candidate_fail(
@@ -202,3 +208,90 @@ class TestQuestionDetail:
         response = api_client.delete(question_detail_url(question.id))
         assert response.status_code == 200
         assert "Question deleted successfully" in response.data["message"]
+
+
+@pytest.mark.django_db
+class TestQuestionImport:
+    def test_import_questions_by_volunteer_fail(
+        self, api_client, question_import_url, create_logged_in_volunteer
+    ):
+        _, _, access = create_logged_in_volunteer()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(question_import_url, [], format="json")
+        assert response.status_code == 403
+
+    def test_import_questions_json_by_moderator_success(
+        self, api_client, question_import_url, create_logged_in_moderator
+    ):
+        moderator, _, access = create_logged_in_moderator()
+        Question.objects.create(text="What is 2 + 2?", correct_answer="A")
+        exam = Exam.objects.create(stage="screening", title="Screening Exam")
+        questions = [
+            {"text": "What  is 2 + 2? ", "correct_answer": "A"},
+            {"text": "What is 3 + 3?", "option_a": "6", "correct_answer": "A"},
+            {"text": "what is 3 + 3?", "option_a": "6", "correct_answer": "A"},
+            {"text": "Missing answer"},
+        ]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(
+            f"{question_import_url}?exam_id={exam.id}", questions, format="json"
+        )
+        assert response.status_code == 200
+        assert response.data["created"] == 1
+        assert response.data["existing"] == 1
+        assert response.data["duplicate_rows"] == 1
+        assert response.data["errors"][0]["row"] == 4
+        assert response.data["linked"] == 2
+        assert Question.objects.count() == 2
+        assert exam.questions.count() == 2
+        assert Question.objects.get(option_a="6").created_by == moderator
+
+    def test_import_questions_counts_new_links_only(
+        self, api_client, question_import_url, create_logged_in_moderator
+    ):
+        _, _, access = create_logged_in_moderator()
+        question = Question.objects.create(text="What is 2 + 2?", correct_answer="A")
+        exam = Exam.objects.create(stage="screening", title="Screening Exam")
+        exam.questions.add(question)
+        questions = [
+            {"text": "What is 2 + 2?", "correct_answer": "A"},
+            {"text": "What is 3 + 3?", "correct_answer": "A"},
+        ]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(
+            f"{question_import_url}?exam_id={exam.id}", questions, format="json"
+        )
+        assert response.status_code == 200
+        assert response.data["created"] == 1
+        assert response.data["existing"] == 1
+        assert response.data["linked"] == 1
+        assert exam.questions.count() == 2
+
+    def test_import_questions_csv_by_admin_success(
+        self, api_client, question_import_url, create_logged_in_admin
+    ):
+        _, _, access = create_logged_in_admin()
+        upload = SimpleUploadedFile(
+            "bank.csv",
+            b"text,option_a,option_b,correct_answer,difficulty\n"
+            b"What is 5 x 5?,20,25,B,easy\n",
+            content_type="text/csv",
+        )
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(
+            question_import_url, {"file": upload}, format="multipart"
+        )
+        assert response.status_code == 200
+        assert response.data["created"] == 1
+        assert Question.objects.get().difficulty == "easy"
+
+    def test_create_duplicate_question_fail(
+        self, api_client, question_list_url, create_logged_in_moderator
+    ):
+        _, _, access = create_logged_in_moderator()
+        Question.objects.create(text="What is 2 + 2?", correct_answer="A")
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(
+            question_list_url, {"text": "WHAT IS 2 + 2?"}, format="json"
+        )
+        assert response.status_code == 400
@@ -3,6 +3,14 @@ import copy
 
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from rest_framework.exceptions import ValidationError
+
+from api.serializers import (
+    CandidateRegistrationSerializer,
+    UserSerializer,
+    unique_user_error,
+)
 
 User = get_user_model()
 
@@ -324,4 +332,38 @@ class TestStaffRegistration:
         data = valid_staff_data()
         del data["password1"]
         response = authenticated_api_client.post(staff_registration_url, data, format="json")
-        assert response.status_code == 400
\ No newline at end of file
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestUserUniqueness:
+    def test_username_and_email_checked_in_one_query(self, django_assert_num_queries):
+        User.objects.create_user(username="Patrick", email="Patrick@Test.com")
+        serializer = UserSerializer(
+            data={"username": "patrick", "email": "patrick@test.com"}
+        )
+        with django_assert_num_queries(1):
+            assert not serializer.is_valid()
+        assert set(serializer.errors) == {"username", "email"}
+
+    def test_update_keeps_own_username_and_email(self):
+        user = User.objects.create_user(username="patrick", email="patrick@test.com")
+        serializer = UserSerializer(
+            user, data={"username": "Patrick", "email": "patrick@test.com"}
+        )
+        assert serializer.is_valid(), serializer.errors
+
+    def test_concurrent_duplicate_rejected_by_index(self, settings, valid_candidate_data):
+        settings.PASSWORD_HASHING_WORKERS = 0
+        serializer = CandidateRegistrationSerializer(data=valid_candidate_data())
+        assert serializer.is_valid(), serializer.errors
+        User.objects.create_user(username="PATRICK", email="other@test.com")
+
+        with pytest.raises(ValidationError) as excinfo:
+            serializer.save()
+        assert "username" in excinfo.value.detail["user"]
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        error = IntegrityError('violates check constraint "other_check"')
+        with pytest.raises(IntegrityError):
+            unique_user_error(error)
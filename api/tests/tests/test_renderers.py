@@ -0,0 +1,114 @@
+import io
+import json
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from api.utils import fast_json
+
+BACKENDS = [
+    pytest.param(
+        "orjson",
+        marks=pytest.mark.skipif(fast_json.orjson is None, reason="needs orjson"),
+    ),
+    "json",
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, settings):
+    settings.JSON_BACKEND = request.param
+    return request.param
+
+
+def payload():
+    recorded = datetime(2025, 3, 1, 9, 30, 15, 123456, tzinfo=timezone.utc)
+    return {
+        "results": [
+            ReturnDict(
+                {
+                    "rank": rank,
+                    "name": "Ọlá Adé \u2028 \u2029",
+                    "score": Decimal("87.50"),
+                    "total_score": 175.5,
+                    "date": recorded + timedelta(days=rank),
+                    "day": date(2025, 3, rank + 1),
+                    "id": uuid.UUID(int=rank),
+                    "verified": rank % 2 == 0,
+                    "phone": None,
+                    "detail": ErrorDetail("Not found.", code="not_found"),
+                    "message": gettext_lazy("Leaderboard published!"),
+                },
+                serializer=None,
+            )
+            for rank in range(3)
+        ],
+        "count": 3,
+    }
+
+
+class TestFastJSONRenderer:
+    def test_output_identical(self, backend):
+        data = payload()
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_big_integer_identical(self, backend):
+        # Beyond orjson's 64 bits: encoded with the standard library.
+        data = {"count": 2**70, "score": Decimal("1.5")}
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indented_output_identical(self, backend):
+        data = payload()
+        media_type = "application/json; indent=4"
+        assert FastJSONRenderer().render(data, media_type) == JSONRenderer().render(
+            data, media_type
+        )
+
+    @pytest.mark.parametrize(
+        "value", [float("nan"), float("-inf"), Decimal("NaN"), Decimal("Infinity")]
+    )
+    def test_non_finite_rejected(self, backend, value):
+        data = {"results": [{"phone": None, "scores": (1.5, value)}]}
+        with pytest.raises(ValueError):
+            JSONRenderer().render(data)
+        with pytest.raises(ValueError):
+            FastJSONRenderer().render(data)
+
+    def test_float_exponents_equivalent(self, backend):
+        data = {"large": 1e16, "small": 1e-7}
+        assert json.loads(FastJSONRenderer().render(data)) == data
+
+    def test_unknown_backend_fail(self, settings):
+        settings.JSON_BACKEND = "simplejson"
+        with pytest.raises(ImproperlyConfigured):
+            fast_json.dumps({})
+
+
+class TestFastJSONParser:
+    def parse(self, content, **parser_context):
+        parser = FastJSONParser()
+        return parser.parse(io.BytesIO(content), parser_context=parser_context)
+
+    def test_parse(self, backend):
+        assert self.parse('{"name": "Adé", "scores": [1, 2.5]}'.encode()) == {
+            "name": "Adé",
+            "scores": [1, 2.5],
+        }
+
+    def test_parse_other_encoding(self, backend):
+        content = '{"name": "Adé"}'.encode("latin-1")
+        assert self.parse(content, encoding="latin-1") == {"name": "Adé"}
+
+    @pytest.mark.parametrize("content", [b"{", b'{"score": NaN}', b"\xff"])
+    def test_invalid_content_fail(self, backend, content):
+        with pytest.raises(ParseError, match="JSON parse error"):
+            self.parse(content)
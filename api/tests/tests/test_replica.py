@@ -0,0 +1,132 @@
+import pytest
+from django.urls import reverse
+
+from api.db_routers import ReplicaRouter
+from api.models import Candidate
+from api.utils import dashboard_utils, replica
+from api.utils.replica import (
+    get_read_database,
+    is_pinned_to_primary,
+    pin_to_primary,
+    use_primary,
+    use_replica,
+)
+from api.views import dashboard
+
+
+@pytest.fixture
+def replica_database(monkeypatch):
+    """
+    Routes replica reads to the `default` test database, as a mirrored replica
+    would in tests.
+    """
+    monkeypatch.setattr(replica, "get_replica_alias", lambda: "default")
+    return "default"
+
+
+@pytest.fixture
+def recorded_read_database(monkeypatch):
+    """
+    Records the database the candidate dashboard data is read from.
+    """
+    recorded = []
+    get_data = dashboard.get_candidate_dashboard_data
+
+    def _get_data(candidate):
+        recorded.append(get_read_database())
+        return get_data(candidate)
+
+    monkeypatch.setattr(dashboard, "get_candidate_dashboard_data", _get_data)
+    return recorded
+
+
+@pytest.mark.django_db
+class TestReplicaRouting:
+    def test_router_sends_only_reads_to_replica(self, monkeypatch):
+        monkeypatch.setattr(replica, "get_replica_alias", lambda: "replica")
+        router = ReplicaRouter()
+
+        assert router.db_for_read(Candidate) is None
+        with use_replica():
+            assert router.db_for_read(Candidate) == "replica"
+            assert router.db_for_write(Candidate) == "default"
+        assert router.db_for_read(Candidate) is None
+        assert not router.allow_migrate("replica", "api")
+
+    def test_reads_stay_on_primary_without_replica(self):
+        with use_replica() as alias:
+            assert alias is None
+            assert get_read_database() is None
+
+    def test_dashboard_reads_from_replica(
+        self,
+        api_client,
+        create_logged_in_candidate,
+        replica_database,
+        recorded_read_database,
+    ):
+        create_logged_in_candidate()
+        response = api_client.get(reverse("v1:api-candidate-dashboard"))
+        assert response.status_code == 200
+        assert recorded_read_database == [replica_database]
+        assert get_read_database() is None
+
+    def test_user_reads_own_writes_after_unsafe_request(
+        self,
+        api_client,
+        create_logged_in_candidate,
+        replica_database,
+        recorded_read_database,
+    ):
+        candidate, _, _ = create_logged_in_candidate()
+        assert not is_pinned_to_primary(candidate.user)
+
+        response = api_client.patch(
+            reverse("v1:api-account-management"), {}, format="multipart"
+        )
+        assert response.status_code == 200
+        assert is_pinned_to_primary(candidate.user)
+
+        api_client.get(reverse("v1:api-candidate-dashboard"))
+        assert recorded_read_database == [None]
+
+    def test_pinned_user_reads_from_primary(
+        self, create_logged_in_candidate, replica_database
+    ):
+        candidate, _, _ = create_logged_in_candidate()
+        with use_replica(candidate.user) as alias:
+            assert alias == replica_database
+        pin_to_primary(candidate.user)
+        with use_replica(candidate.user) as alias:
+            assert alias is None
+
+    def test_use_primary_within_replica_reads(self, replica_database):
+        with use_replica():
+            with use_primary():
+                assert get_read_database() is None
+            assert get_read_database() == replica_database
+
+    def test_cached_values_are_computed_on_primary(
+        self, create_logged_in_staff, replica_database, monkeypatch
+    ):
+        staff, _, _ = create_logged_in_staff()
+        recorded = []
+        candidates_by_role = Candidate.candidates_by_role
+        get_stats = dashboard_utils.get_staff_dashboard_stats
+
+        def _candidates_by_role(role):
+            recorded.append(("standings", get_read_database()))
+            return candidates_by_role(role)
+
+        def _get_stats():
+            recorded.append(("staff", get_read_database()))
+            return get_stats()
+
+        monkeypatch.setattr(Candidate, "candidates_by_role", _candidates_by_role)
+        monkeypatch.setattr(dashboard_utils, "get_staff_dashboard_stats", _get_stats)
+        with use_replica():
+            dashboard_utils.get_league_standings()
+            dashboard_utils.get_staff_dashboard_data(staff)
+
+        assert {"standings", "staff"} <= {value for value, _ in recorded}
+        assert {database for _, database in recorded} == {None}
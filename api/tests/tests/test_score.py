@@ -1,4 +1,5 @@
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 
 from api.models import CandidateScore, Exam
@@ -87,3 +88,92 @@ class TestSubmitExamScore:
             submit_exam_score_url(exam.id), score_data, format="json"
         )
         assert response.status_code == 200
+
+
+@pytest.fixture
+def bulk_submit_exam_scores_url():
+    def _dynamic_url(exam_id):
+        return reverse("v1:api-bulk-submit-exam-scores", kwargs={"exam_id": exam_id})
+
+    return _dynamic_url
+
+
+@pytest.mark.django_db
+class TestBulkSubmitExamScores:
+    def test_bulk_submit_exam_scores_by_moderator_fail(
+        self, api_client, bulk_submit_exam_scores_url, create_logged_in_moderator
+    ):
+        _, _, access = create_logged_in_moderator()
+        exam = Exam.objects.create(stage="screening", title="Screening Exam")
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(
+            bulk_submit_exam_scores_url(exam.id), [], format="json"
+        )
+        assert response.status_code == 403
+
+    def test_bulk_submit_exam_scores_json_by_admin_success(
+        self,
+        api_client,
+        bulk_submit_exam_scores_url,
+        create_logged_in_admin,
+        create_logged_in_screening_candidate,
+    ):
+        candidate, _, _ = create_logged_in_screening_candidate()
+        _, _, access = create_logged_in_admin()
+        exam = Exam.objects.create(stage="screening", title="Screening Exam")
+        CandidateScore.objects.create(candidate=candidate, exam=exam, score=10)
+        score_data = [
+            {"candidate_id": candidate.pk, "score": 75.5},
+            {"candidate_id": 999999, "score": 40},
+            {"candidate_id": candidate.pk, "score": 80},
+            {"candidate_id": "abc", "score": "high"},
+        ]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(
+            bulk_submit_exam_scores_url(exam.id), score_data, format="json"
+        )
+        assert response.status_code == 200
+        assert response.data["saved"] == 1
+        assert [error["row"] for error in response.data["errors"]] == [2, 3, 4]
+        score = CandidateScore.objects.get(candidate=candidate, exam=exam)
+        assert float(score.score) == 75.5
+        assert score.auto_score is False
+
+    def test_bulk_submit_exam_scores_csv_by_owner_success(
+        self,
+        api_client,
+        bulk_submit_exam_scores_url,
+        create_logged_in_owner,
+        create_logged_in_screening_candidate,
+    ):
+        candidate, _, _ = create_logged_in_screening_candidate()
+        owner, _, access = create_logged_in_owner()
+        exam = Exam.objects.create(stage="screening", title="Screening Exam")
+        upload = SimpleUploadedFile(
+            "scores.csv",
+            f"candidate_id,score\n{candidate.pk},64\n".encode(),
+            content_type="text/csv",
+        )
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(
+            bulk_submit_exam_scores_url(exam.id), {"file": upload}, format="multipart"
+        )
+        assert response.status_code == 200
+        assert response.data["errors"] == []
+        score = CandidateScore.objects.get(candidate=candidate, exam=exam)
+        assert float(score.score) == 64
+        assert score.submitted_by == owner
+
+    def test_bulk_submit_exam_scores_no_valid_rows_fail(
+        self, api_client, bulk_submit_exam_scores_url, create_logged_in_admin
+    ):
+        _, _, access = create_logged_in_admin()
+        exam = Exam.objects.create(stage="screening", title="Screening Exam")
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.post(
+            bulk_submit_exam_scores_url(exam.id),
+            {"scores": [{"candidate_id": 999999, "score": 5}]},
+            format="json",
+        )
+        assert response.status_code == 400
+        assert response.data["errors"][0]["row"] == 1
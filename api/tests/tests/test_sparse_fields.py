@@ -0,0 +1,181 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from api.models import Candidate, CandidateScore, Exam, Question
+from api.serializers import CandidateListSerializer, ExamListSerializer
+from api.utils.sparse_fields import parse_paths, prune_queryset
+
+User = get_user_model()
+
+
+@pytest.fixture
+def owner(api_client, create_logged_in_owner):
+    staff, _, access = create_logged_in_owner()
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+    return staff
+
+
+@pytest.fixture
+def candidate(owner):
+    """A league candidate with a score in an exam of one question."""
+    candidate = Candidate.objects.create(
+        user=User.objects.create(
+            username="ada", first_name="Ada", last_name="Lovelace"
+        ),
+        role="league",
+        school="Verboheit High",
+    )
+    question = Question.objects.create(
+        text="1 + 1?",
+        option_a="1",
+        option_b="2",
+        option_c="3",
+        option_d="4",
+        correct_answer="B",
+        created_by=owner,
+    )
+    exam = Exam.objects.create(
+        title="League Exam",
+        stage="league",
+        exam_date=timezone.now() - timedelta(days=1),
+        created_by=owner,
+    )
+    exam.questions.add(question)
+    CandidateScore.objects.create(
+        candidate=candidate, exam=exam, score=Decimal("80"), submitted_by=owner
+    )
+    return candidate
+
+
+class TestSelection:
+    def test_parse_paths(self):
+        assert parse_paths(" id, user.username ,,") == {"id", "user.username"}
+        assert parse_paths("") == frozenset()
+
+    def test_serializer_keeps_selected_fields(self):
+        serializer = CandidateListSerializer(
+            context={"field_selection": ({"school", "user.username"}, frozenset())}
+        )
+        assert list(serializer.fields) == ["user", "school"]
+        assert list(serializer.fields["user"].fields) == ["username"]
+
+    def test_expanded_field_is_kept(self):
+        serializer = ExamListSerializer(
+            context={"field_selection": ({"title"}, {"created_by"})}
+        )
+        assert list(serializer.fields) == ["title", "created_by"]
+        assert "user" in serializer.fields["created_by"].fields
+
+    @pytest.mark.django_db
+    def test_prune_queryset(self):
+        serializer = CandidateListSerializer(
+            context={"field_selection": ({"school", "user.username"}, frozenset())}
+        )
+        query = prune_queryset(Candidate.objects.all(), serializer).query
+        assert query.select_related == {"user": {}}
+        assert query.deferred_loading == (
+            frozenset({"user", "school", "user__username"}),
+            False,
+        )
+
+
+@pytest.mark.django_db
+class TestSparseFieldsEndpoints:
+    def test_candidate_list_fields(self, api_client, candidate):
+        response = api_client.get(
+            reverse("v1:api-candidate-list"), {"fields": "user.first_name,school"}
+        )
+        assert response.status_code == 200
+        assert response.data["results"] == [
+            {"user": {"first_name": "Ada"}, "school": "Verboheit High"}
+        ]
+
+    def test_staff_list_fields(self, api_client, owner):
+        response = api_client.get(reverse("v1:api-staff-list"), {"fields": "role"})
+        assert response.status_code == 200
+        assert response.data["results"] == [{"role": "owner"}]
+
+    def test_candidate_scores_fields_and_expand(self, api_client, owner, candidate):
+        response = api_client.get(
+            reverse("v1:api-candidate-scores", kwargs={"candidate_id": candidate.pk}),
+            {"fields": "score,exam.title", "expand": "submitted_by,exam.created_by"},
+        )
+        assert response.status_code == 200
+        [score] = response.json()
+        assert list(score) == ["exam", "score", "submitted_by"]
+        assert list(score["exam"]) == ["title", "created_by"]
+        assert score["score"] == "80.00"
+        assert score["submitted_by"]["user"]["username"] == "owner"
+        assert score["exam"]["created_by"] == score["submitted_by"]
+
+    def test_exam_list_expand(self, api_client, candidate):
+        response = api_client.get(
+            reverse("v1:api-exam-list"),
+            {"fields": "title", "expand": "created_by"},
+        )
+        assert response.status_code == 200
+        exam = response.json()["results"][0]
+        assert exam["title"] == "League Exam"
+        assert exam["created_by"]["user"]["username"] == "owner"
+        assert "question_count" not in exam
+
+    def test_exam_list_default_unchanged(self, api_client, candidate):
+        response = api_client.get(reverse("v1:api-exam-list"))
+        exam = response.json()["results"][0]
+        assert list(exam) == list(ExamListSerializer().fields)
+        assert exam["question_count"] == 1
+
+    def test_exam_detail_skips_unrequested_fields(
+        self, api_client, candidate, django_assert_max_num_queries
+    ):
+        exam = Exam.objects.get()
+        url = reverse("v1:api-exam-detail", kwargs={"exam_id": exam.pk})
+        full = api_client.get(url)
+        assert "average_score" in full.data
+
+        with django_assert_max_num_queries(2):
+            response = api_client.get(url, {"fields": "id,title"})
+        assert response.json() == {"id": exam.pk, "title": "League Exam"}
+
+    def test_candidate_detail_fields(
+        self, api_client, candidate, django_assert_max_num_queries
+    ):
+        url = reverse("v1:api-candidate-detail", kwargs={"candidate_id": candidate.pk})
+        full = api_client.get(url)
+        assert {"scores", "all_scores", "total_score"} <= set(full.data)
+
+        with django_assert_max_num_queries(2):
+            response = api_client.get(url, {"fields": "user.first_name,school"})
+        assert response.json() == {
+            "user": {"first_name": "Ada"},
+            "school": "Verboheit High",
+        }
+
+        response = api_client.get(url, {"fields": "total_score"})
+        assert response.json() == {"total_score": 80.0}
+
+    def test_staff_detail_fields(self, api_client, owner):
+        response = api_client.get(
+            reverse("v1:api-staff-detail", kwargs={"staff_id": owner.pk}),
+            {"fields": "role,user.username"},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"user": {"username": "owner"}, "role": "owner"}
+
+    def test_writes_ignore_selection(self, api_client, candidate):
+        exam = Exam.objects.get()
+        response = api_client.patch(
+            reverse("v1:api-exam-detail", kwargs={"exam_id": exam.pk})
+            + "?fields=title",
+            {"description": "Updated"},
+            format="json",
+        )
+        assert response.status_code == 200
+        assert response.data["description"] == "Updated"
+        exam.refresh_from_db()
+        assert exam.title == "League Exam"
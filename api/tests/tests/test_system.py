@@ -0,0 +1,306 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+
+from api.models import Candidate, CandidateAnswer, CandidateScore, Exam, Question
+from api.utils.benchmarks import compare_benchmarks, seed_benchmark_data
+from api.utils.loadtest import compare_to_baseline, seed_loadtest_data
+from api.utils.metrics import reset_metrics
+from api.utils.password_pool import get_password_pool_stats
+from api.utils.profiling import get_profiles
+from api.utils.synthetic_data import SYNTHETIC_PREFIX
+
+
+@pytest.fixture
+def db_connection_stats_url():
+    return reverse("v1:api-db-connection-stats")
+
+
+@pytest.mark.django_db
+class TestDBConnectionStats:
+    def test_admin_gets_connection_stats(
+        self, api_client, db_connection_stats_url, create_logged_in_admin
+    ):
+        create_logged_in_admin()
+        response = api_client.get(db_connection_stats_url)
+        assert response.status_code == 200
+        default = response.data["databases"]["default"]
+        assert default["mode"] == "persistent"
+        assert default["health_checks"] is True
+        assert "checkouts" not in default
+
+    def test_candidate_cannot_get_connection_stats(
+        self, api_client, db_connection_stats_url, create_logged_in_candidate
+    ):
+        create_logged_in_candidate()
+        response = api_client.get(db_connection_stats_url)
+        assert response.status_code == 403
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBenchmarkConnections:
+    def test_persistent_connections_are_reused(self, create_logged_in_candidate):
+        create_logged_in_candidate()
+        output = StringIO()
+        call_command("benchmark_connections", requests=5, stdout=output)
+
+        rows = {
+            line.split()[0]: line.split() for line in output.getvalue().splitlines()
+        }
+        assert int(rows["per-request"][-1]) == 5
+        assert int(rows["persistent"][-1]) == 1
+
+
+@pytest.fixture
+def metrics_url():
+    return reverse("v1:api-metrics")
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    def test_staff_gets_route_metrics(
+        self,
+        api_client,
+        metrics_url,
+        create_logged_in_candidate,
+        create_logged_in_staff,
+    ):
+        reset_metrics()
+        create_logged_in_candidate()
+        api_client.get(reverse("v1:api-candidate-dashboard"))
+        api_client.get(reverse("v1:api-candidate-dashboard"))
+
+        create_logged_in_staff()
+        response = api_client.get(metrics_url)
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+
+        samples = {}
+        for line in response.content.decode().splitlines():
+            if 'route="v1:api-candidate-dashboard"' in line:
+                name, value = line.split(" ")
+                samples[name.split("{")[0]] = float(value)
+        assert samples["vmlc_http_request_duration_seconds_count"] == 2
+        assert samples["vmlc_db_queries_total"] > 0
+        assert samples["vmlc_cache_hits_total"] > 0
+        assert samples["vmlc_http_response_bytes_total"] > 0
+
+    def test_password_pool_metrics(
+        self, api_client, metrics_url, create_logged_in_staff, settings
+    ):
+        settings.PASSWORD_HASHING_WORKERS = 0
+        create_logged_in_staff()
+        response = api_client.get(metrics_url)
+
+        samples = {}
+        for line in response.content.decode().splitlines():
+            if line.startswith("vmlc_password_pool_"):
+                name, value = line.split(" ")
+                samples[name.split("{")[0]] = float(value)
+        stats = get_password_pool_stats()
+        assert samples["vmlc_password_pool_completed_total"] == stats["completed"]
+        assert samples["vmlc_password_pool_rejected_total"] == stats["rejected"]
+        assert samples["vmlc_password_pool_in_flight"] == 0
+        assert "vmlc_password_pool_queue_seconds_total" in samples
+
+    def test_candidate_cannot_get_metrics(
+        self, api_client, metrics_url, create_logged_in_candidate
+    ):
+        create_logged_in_candidate()
+        response = api_client.get(metrics_url)
+        assert response.status_code == 403
+
+
+@pytest.fixture
+def request_profiles_url():
+    return reverse("v1:api-request-profiles")
+
+
+@pytest.mark.django_db
+class TestRequestProfiles:
+    def test_signed_header_profiles_request(
+        self,
+        api_client,
+        request_profiles_url,
+        create_logged_in_owner,
+        create_logged_in_candidate,
+    ):
+        create_logged_in_owner()
+        response = api_client.post(request_profiles_url)
+        assert response.status_code == 201
+        header = {response.data["header"]: response.data["value"]}
+
+        create_logged_in_candidate()
+        response = api_client.get(reverse("v1:api-candidate-dashboard"), headers=header)
+        assert response.status_code == 200
+
+        create_logged_in_owner(username="owner2", email="owner2@test.com")
+        profiles = api_client.get(request_profiles_url).data
+        assert len(profiles) == 1
+        profile = profiles[0]
+        assert profile["route"] == "v1:api-candidate-dashboard"
+        assert profile["trigger"] == "header"
+        assert profile["functions"]
+        assert profile["query_count"] == len(profile["queries"]) > 0
+
+        output = StringIO()
+        call_command("request_profiles", id=profile["id"], stdout=output)
+        assert "cumulative ms" in output.getvalue()
+
+    def test_invalid_header_is_ignored(
+        self, api_client, create_logged_in_candidate
+    ):
+        create_logged_in_candidate()
+        api_client.get(
+            reverse("v1:api-candidate-dashboard"),
+            headers={"X-Profile-Request": "1:forged:signature"},
+        )
+        assert get_profiles() == []
+
+    def test_sampled_requests_are_profiled(
+        self, api_client, settings, create_logged_in_candidate
+    ):
+        settings.PROFILING_SAMPLE_RATE = 1.0
+        create_logged_in_candidate()
+        api_client.get(reverse("v1:api-candidate-me"))
+        assert [p["trigger"] for p in get_profiles()] == ["sample"]
+
+    def test_only_owners_see_profiles(
+        self, api_client, request_profiles_url, create_logged_in_admin
+    ):
+        create_logged_in_admin()
+        assert api_client.get(request_profiles_url).status_code == 403
+        assert api_client.post(request_profiles_url).status_code == 403
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLoadTest:
+    def test_journeys_against_live_server(self, live_server, tmp_path):
+        report_path = tmp_path / "report.json"
+        call_command(
+            "loadtest",
+            url=live_server.url,
+            stages="1,2",
+            questions=3,
+            output=str(report_path),
+            stderr=StringIO(),
+        )
+
+        report = json.loads(report_path.read_text())
+        assert [stage["concurrency"] for stage in report["stages"]] == [1, 2]
+        last = report["stages"][-1]
+        assert last["error_rate"] == 0
+        assert last["steps"]["submit_answers"]["requests"] == 2
+        assert last["steps"]["leaderboard"]["p99_ms"] is not None
+
+        slower = json.loads(report_path.read_text())
+        for stage in slower["stages"]:
+            stage["steps"]["take_exam"]["p95_ms"] *= 10
+        assert compare_to_baseline(report, slower, tolerance=0.2) == []
+        assert compare_to_baseline(slower, report, tolerance=0.2)
+
+    def test_seeded_questions_are_hashed(self):
+        seed_loadtest_data(candidates=1, questions=3)
+        assert Question.objects.count() == 3
+        assert not Question.objects.filter(text_hash__isnull=True).exists()
+
+
+@pytest.mark.django_db
+class TestBenchmarkHotPaths:
+    def test_reports_and_compares_benchmarks(self, tmp_path):
+        report_path = tmp_path / "benchmarks.json"
+        call_command(
+            "benchmark_hot_paths",
+            iterations=2,
+            output=str(report_path),
+            stderr=StringIO(),
+        )
+
+        report = json.loads(report_path.read_text())
+        assert set(report["benchmarks"]) == {
+            "candidate_detail",
+            "candidate_scores",
+            "candidate_scores_values",
+            "minimal_candidate",
+            "auto_score",
+            "candidate_list",
+            "candidate_list_values",
+            "staff_list",
+            "staff_list_values",
+            "render_leaderboard",
+            "render_leaderboard_fast",
+        }
+        assert report["benchmarks"]["auto_score"]["ops_per_sec"] > 0
+        assert report["benchmarks"]["minimal_candidate"]["peak_alloc_kib"] > 0
+        # The synthetic dataset is rolled back.
+        assert not Candidate.objects.exists()
+
+        faster = json.loads(report_path.read_text())
+        for result in faster["benchmarks"].values():
+            result["ops_per_sec"] *= 10
+        assert compare_benchmarks(faster, report, tolerance=0.2) == []
+        assert compare_benchmarks(report, faster, tolerance=0.2)
+
+        output = StringIO()
+        call_command(
+            "benchmark_hot_paths",
+            benchmarks="minimal_candidate",
+            iterations=2,
+            baseline=str(report_path),
+            tolerance=100,
+            stdout=output,
+            stderr=StringIO(),
+        )
+        assert "No regressions" in output.getvalue()
+
+        with pytest.raises(CommandError):
+            call_command("benchmark_hot_paths", benchmarks="unknown")
+
+    def test_seeded_questions_are_hashed(self):
+        seed_benchmark_data(candidates=2, staff=2, exams=2, questions=3)
+        assert Question.objects.count() == 3
+        assert not Question.objects.filter(text_hash__isnull=True).exists()
+
+
+@pytest.mark.django_db
+class TestPopulateDB:
+    options = {
+        "candidates": 30,
+        "staff": 5,
+        "questions": 12,
+        "exams": 4,
+        "questions_per_exam": 5,
+        "exams_per_candidate": 2,
+        "seed": 7,
+    }
+
+    def _scores(self):
+        return list(
+            CandidateScore.objects.filter(
+                candidate__user__username__startswith=SYNTHETIC_PREFIX
+            )
+            .order_by("candidate__user__username", "exam__title")
+            .values_list("candidate__user__username", "exam__title", "score")
+        )
+
+    def test_generates_a_reproducible_dataset(self):
+        call_command("populate_db", stdout=StringIO(), **self.options)
+
+        assert Candidate.objects.count() == 30
+        assert Exam.objects.count() == 4
+        scores = self._scores()
+        assert scores
+        assert CandidateAnswer.objects.count() == 5 * len(scores)
+        user = Candidate.objects.first().user
+        assert user.check_password("password123")
+
+        with pytest.raises(CommandError):
+            call_command("populate_db", stdout=StringIO(), **self.options)
+
+        call_command("populate_db", clear=True, stdout=StringIO(), **self.options)
+        assert Candidate.objects.count() == 30
+        assert self._scores() == scores
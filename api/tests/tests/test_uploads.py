@@ -0,0 +1,175 @@
+import io
+
+import pytest
+from django.urls import reverse
+from PIL import Image
+
+from api.models import Candidate
+from api.utils import direct_uploads
+from api.utils.photos import get_photo_variant_name
+
+
+@pytest.fixture
+def upload_ticket_url():
+    return reverse("v1:api-upload-ticket")
+
+
+@pytest.fixture
+def upload_complete_url():
+    def _complete_url(ticket_id):
+        return reverse("v1:api-upload-complete", kwargs={"ticket_id": ticket_id})
+
+    return _complete_url
+
+
+def jpeg_with_exif():
+    exif = Image.Exif()
+    exif[0x010F] = "Test Camera"
+    content = io.BytesIO()
+    Image.new("RGB", (2000, 1500), "red").save(content, "JPEG", exif=exif.tobytes())
+    return content.getvalue()
+
+
+@pytest.mark.django_db
+class TestDirectUploads:
+    def test_ticket_then_complete_attaches_photo(
+        self,
+        api_client,
+        upload_ticket_url,
+        upload_complete_url,
+        create_logged_in_candidate,
+        local_s3,
+        settings,
+        django_capture_on_commit_callbacks,
+    ):
+        settings.PHOTO_PROCESSING_WORKERS = 0
+        candidate, _, _ = create_logged_in_candidate()
+        response = api_client.post(
+            upload_ticket_url,
+            {"field": "profile_photo", "content_type": "image/jpeg"},
+            format="json",
+        )
+        assert response.status_code == 201
+        ticket = response.data
+        assert ticket["url"].startswith("http://localhost:9000/verboheit-test")
+        assert ticket["fields"]["key"] == ticket["key"]
+        assert ticket["key"].startswith("candidate_profile_photos/")
+
+        response = api_client.post(upload_complete_url(ticket["ticket"]))
+        assert response.status_code == 400
+
+        local_s3[ticket["key"]] = jpeg_with_exif()
+        with django_capture_on_commit_callbacks() as callbacks:
+            response = api_client.post(upload_complete_url(ticket["ticket"]))
+        assert response.status_code == 200
+        # Only the key was checked; the object is processed after the response.
+        assert ticket["key"] in local_s3
+        assert Candidate.objects.get(pk=candidate.pk).profile_photo.name.endswith(
+            "default.png"
+        )
+        for callback in callbacks:
+            callback()
+        assert ticket["key"] not in local_s3
+
+        name = Candidate.objects.get(pk=candidate.pk).profile_photo.name
+        assert name.startswith("candidate_profile_photos/")
+        assert name.endswith(".webp")
+        with Image.open(io.BytesIO(local_s3[name])) as full:
+            assert max(full.size) == 1024
+            assert not full.getexif()
+        assert get_photo_variant_name(name, "thumb") in local_s3
+
+    def test_replaced_photo_is_deleted(
+        self,
+        api_client,
+        upload_ticket_url,
+        upload_complete_url,
+        create_logged_in_candidate,
+        local_s3,
+        settings,
+        django_capture_on_commit_callbacks,
+    ):
+        settings.PHOTO_PROCESSING_WORKERS = 0
+        candidate, _, _ = create_logged_in_candidate()
+        names = []
+        for _ in range(2):
+            ticket = api_client.post(
+                upload_ticket_url,
+                {"field": "profile_photo", "content_type": "image/webp"},
+                format="json",
+            ).data
+            local_s3[ticket["key"]] = jpeg_with_exif()
+            with django_capture_on_commit_callbacks(execute=True):
+                api_client.post(upload_complete_url(ticket["ticket"]))
+            names.append(Candidate.objects.get(pk=candidate.pk).profile_photo.name)
+
+        old, new = names
+        assert old != new
+        assert not any(name.startswith(old[: -len(".webp")]) for name in local_s3)
+        assert {new, get_photo_variant_name(new, "small")} <= set(local_s3)
+
+    def test_oversized_upload_rejected(
+        self,
+        api_client,
+        upload_ticket_url,
+        upload_complete_url,
+        create_logged_in_candidate,
+        local_s3,
+    ):
+        create_logged_in_candidate()
+        ticket = api_client.post(
+            upload_ticket_url,
+            {"field": "id_card", "content_type": "image/png"},
+            format="json",
+        ).data
+        local_s3[ticket["key"]] = 50 * 1024 * 1024
+
+        response = api_client.post(upload_complete_url(ticket["ticket"]))
+        assert response.status_code == 400
+        assert ticket["key"] not in local_s3
+
+    def test_upload_of_another_type_rejected(
+        self,
+        api_client,
+        upload_ticket_url,
+        upload_complete_url,
+        create_logged_in_candidate,
+        local_s3,
+        monkeypatch,
+    ):
+        create_logged_in_candidate()
+        ticket = api_client.post(
+            upload_ticket_url,
+            {"field": "profile_photo", "content_type": "image/png"},
+            format="json",
+        ).data
+        local_s3[ticket["key"]] = b"<html></html>"
+        monkeypatch.setattr(
+            direct_uploads, "_stored_object", lambda storage, name: (13, "text/html")
+        )
+
+        response = api_client.post(upload_complete_url(ticket["ticket"]))
+        assert response.status_code == 400
+        assert "type" in response.data["error"]
+        assert ticket["key"] not in local_s3
+
+    def test_ticket_of_another_user_rejected(
+        self,
+        api_client,
+        upload_ticket_url,
+        upload_complete_url,
+        create_logged_in_candidate,
+        create_logged_in_staff,
+        local_s3,
+    ):
+        create_logged_in_candidate()
+        ticket = api_client.post(
+            upload_ticket_url,
+            {"field": "profile_photo", "content_type": "image/webp"},
+            format="json",
+        ).data
+        local_s3[ticket["key"]] = 1024
+
+        create_logged_in_staff()
+        response = api_client.post(upload_complete_url(ticket["ticket"]))
+        assert response.status_code == 400
@@ -0,0 +1,166 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Candidate, CandidateScore, Exam, Question, Staff
+from api.serializers import (
+    CandidateDetailSerializer,
+    CandidateListSerializer,
+    CandidateScoreSerializer,
+    ExamListSerializer,
+    StaffListSerializer,
+)
+from api.utils.values_serializers import ValuesSerializer
+from api.views.score import CANDIDATE_SCORE_VALUES
+
+User = get_user_model()
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.fixture
+def dataset():
+    """
+    Candidates of every role, staff with and without an occupation, and scores
+    of a candidate in an exam with questions and in one without.
+    """
+    owner = Staff.objects.create(
+        user=User.objects.create(username="author", email="author@example.com"),
+        role="owner",
+        occupation="Teacher",
+    )
+    for index, role in enumerate(("moderator", "volunteer")):
+        Staff.objects.create(
+            user=User.objects.create(username=f"staff{index}", first_name="Ada"),
+            role=role,
+        )
+    candidates = [
+        Candidate.objects.create(
+            user=User.objects.create(
+                username=f"candidate{index}",
+                email=f"candidate{index}@example.com",
+                last_name="Lovelace",
+            ),
+            role=role,
+            school="Verboheit High",
+            phone="08012345678" if index % 2 else "",
+        )
+        for index, role in enumerate(("screening", "league", "winner"))
+    ]
+    question = Question.objects.create(
+        text="1 + 1?",
+        option_a="1",
+        option_b="2",
+        option_c="3",
+        option_d="4",
+        correct_answer="B",
+        created_by=owner,
+    )
+    exams = [
+        Exam.objects.create(
+            title=f"Exam {index}",
+            stage="league",
+            exam_date=timezone.now() - timedelta(days=index + 1),
+            created_by=owner,
+        )
+        for index in range(2)
+    ]
+    exams[0].questions.add(question)
+    for exam, score in zip(exams, (Decimal("87.50"), Decimal("0"))):
+        CandidateScore.objects.create(
+            candidate=candidates[1], exam=exam, score=score, submitted_by=owner
+        )
+    return candidates[1]
+
+
+@pytest.mark.django_db
+class TestValuesSerializer:
+    def test_candidate_list_output_identical(self, dataset):
+        queryset = Candidate.objects.order_by("-date_created")
+        expected = CandidateListSerializer(queryset, many=True).data
+        actual = ValuesSerializer(CandidateListSerializer).data(queryset)
+        assert render(actual) == render(expected)
+
+    def test_staff_list_output_identical(self, dataset):
+        queryset = Staff.objects.order_by("-date_created")
+        expected = StaffListSerializer(queryset, many=True).data
+        actual = ValuesSerializer(StaffListSerializer).data(queryset)
+        assert render(actual) == render(expected)
+
+    def test_candidate_scores_output_identical(self, dataset):
+        queryset = CandidateScore.objects.filter(candidate=dataset)
+        expected = CandidateScoreSerializer(queryset, many=True).data
+        actual = CANDIDATE_SCORE_VALUES.data(queryset)
+        assert len(actual) == 2
+        assert render(actual) == render(expected)
+
+    def test_fetches_rows_in_one_query(self, dataset, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            CANDIDATE_SCORE_VALUES.data(CandidateScore.objects.all())
+
+    def test_method_field_without_expression_fail(self):
+        with pytest.raises(ImproperlyConfigured, match="question_count"):
+            ValuesSerializer(ExamListSerializer).values(Exam.objects.all())
+
+    def test_unsupported_field_fail(self):
+        with pytest.raises(ImproperlyConfigured, match="profile_photo"):
+            ValuesSerializer(CandidateDetailSerializer).values(Candidate.objects.all())
+
+
+@pytest.mark.django_db
+class TestValuesListEndpoints:
+    def test_candidate_list_output_identical(
+        self, api_client, dataset, create_logged_in_owner
+    ):
+        _, _, access = create_logged_in_owner()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.get(reverse("v1:api-candidate-list"))
+        assert response.status_code == 200
+
+        queryset = Candidate.objects.order_by("-date_created")
+        expected = {
+            "count": queryset.count(),
+            "next": None,
+            "previous": None,
+            "results": CandidateListSerializer(queryset, many=True).data,
+        }
+        assert response.content == render(expected)
+
+    def test_staff_list_output_identical(
+        self, api_client, dataset, create_logged_in_owner
+    ):
+        _, _, access = create_logged_in_owner()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.get(reverse("v1:api-staff-list"), {"role": "owner"})
+        assert response.status_code == 200
+
+        queryset = Staff.objects.filter(role="owner").order_by("-date_created")
+        expected = {
+            "count": queryset.count(),
+            "next": None,
+            "previous": None,
+            "results": StaffListSerializer(queryset, many=True).data,
+        }
+        assert response.content == render(expected)
+
+    def test_candidate_scores_output_identical(
+        self, api_client, dataset, create_logged_in_owner
+    ):
+        _, _, access = create_logged_in_owner()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = api_client.get(
+            reverse("v1:api-candidate-scores", kwargs={"candidate_id": dataset.pk})
+        )
+        assert response.status_code == 200
+
+        scores = CandidateScore.objects.filter(candidate=dataset)
+        expected = CandidateScoreSerializer(scores, many=True).data
+        assert response.content == render(expected)
@@ -8,6 +8,7 @@ This module defines URL patterns for all API routes, including:
 - Exams and questions
 - Dashboard and account operations
 - Leaderboard
+- Operational metrics
 
 All views are organized and grouped by functionality for clarity.
 """
@@ -28,6 +29,8 @@ from .views import (
     root,
     score,
     staff,
+    system,
+    uploads,
 )
 
 app_name = "api"
@@ -65,6 +68,11 @@ urlpatterns = [
         "candidates/", candidate.CandidateListView.as_view(), name="api-candidate-list"
     ),
     path("candidates/me/", candidate.candidate_me_api, name="api-candidate-me"),
+    path(
+        "candidates/promote/",
+        candidate.promote_candidates_api,
+        name="api-candidate-promote",
+    ),
     path(
         "candidates/<int:candidate_id>/",
         candidate.CandidateDetailView.as_view(),
@@ -116,6 +124,16 @@ urlpatterns = [
         score.submit_exam_score_api,
         name="api-submit-exam-score",
     ),
+    path(
+        "exams/<int:exam_id>/submit-exam-scores/bulk/",
+        score.bulk_submit_exam_scores_api,
+        name="api-bulk-submit-exam-scores",
+    ),
+    path(
+        "exams/<int:exam_id>/autosave-answers/",
+        answers.autosave_exam_answers,
+        name="api-autosave-exam-answers",
+    ),
     path(
         "exams/<int:exam_id>/submit-exam-answers/",
         answers.submit_exam_answers,
@@ -123,6 +141,11 @@ urlpatterns = [
     ),
     # === QUESTIONS ===
     path("questions/", question.question_list_api, name="api-question-list"),
+    path(
+        "questions/import/",
+        question.import_questions_api,
+        name="api-question-import",
+    ),
     path(
         "questions/<int:question_id>/",
         question.question_detail_api,
@@ -146,6 +169,17 @@ urlpatterns = [
         dashboard.AccountManagementView.as_view(),
         name="api-account-management-detail",
     ),
+    # === DIRECT UPLOADS ===
+    path(
+        "uploads/tickets/",
+        uploads.create_upload_ticket_api,
+        name="api-upload-ticket",
+    ),
+    path(
+        "uploads/tickets/<str:ticket_id>/complete/",
+        uploads.complete_upload_api,
+        name="api-upload-complete",
+    ),
     # === LEADERBOARD ===
     path(
         "toggle-leaderboard/",
@@ -162,4 +196,14 @@ urlpatterns = [
         leaderboard.load_leaderboard_api,
         name="api-load-leaderboard",
     ),
+    # === SYSTEM ===
+    path(
+        "system/db-connections/",
+        system.db_connection_stats_api,
+        name="api-db-connection-stats",
+    ),
+    path("system/metrics/", system.metrics_api, name="api-metrics"),
+    path(
+        "system/profiles/", system.request_profiles_api, name="api-request-profiles"
+    ),
 ]
@@ -0,0 +1,56 @@
+"""
+Utility functions for cached API key verification.
+
+Verifying an API key means looking it up and running it through a slow password
+hasher. Keys that verified successfully are remembered in the cache for a short
+time, under a keyed BLAKE2 digest of the presented key, so repeated requests
+from the same client skip the hasher. Revoking, changing or deleting any API key
+invalidates every cached verification at once.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_api_key.models import APIKey  # type: ignore
+
+from .cache_utils import API_KEYS, namespaced_cache_key
+
+API_KEY_CACHE_TIMEOUT = getattr(settings, "API_KEY_CACHE_TIMEOUT", 60)
+
+
+def _key_digest(key):
+    # Keyed with SECRET_KEY so cached digests cannot be used to check guesses.
+    secret = settings.SECRET_KEY.encode("utf-8")[:64]
+    return hashlib.blake2b(key.encode("utf-8"), key=secret).hexdigest()
+
+
+def is_api_key_valid(key):
+    """
+    Returns True if the API key is valid, using a cached result when available.
+
+    Only successful verifications are cached, and never beyond the key's
+    expiry date.
+
+    Args:
+        key (str): The API key presented by the client.
+    """
+    cache_key = namespaced_cache_key(API_KEYS, _key_digest(key))
+    if cache.get(cache_key):
+        return True
+
+    try:
+        api_key = APIKey.objects.get_from_key(key)
+    except APIKey.DoesNotExist:
+        return False
+    if api_key.has_expired:
+        return False
+
+    timeout = API_KEY_CACHE_TIMEOUT
+    if api_key.expiry_date is not None:
+        remaining = (api_key.expiry_date - timezone.now()).total_seconds()
+        timeout = min(timeout, int(remaining))
+    if timeout > 0:
+        cache.set(cache_key, True, timeout)
+    return True
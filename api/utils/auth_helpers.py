@@ -45,3 +45,27 @@ def get_staff_from_request(request):
         return None, Response(
             {"error": "User is not a staff member"}, status=status.HTTP_404_NOT_FOUND
         )
+
+
+def get_profile_from_request(request):
+    """
+    Attempts to retrieve the candidate or staff instance linked to the
+    authenticated user.
+
+    Args:
+        request (HttpRequest): The HTTP request object containing the user.
+
+    Returns:
+        Tuple:
+            - profile (Candidate | Staff | None): The profile instance if found, else None.
+            - error_response (Response | None): An error Response if user has no profile, else None.
+    """
+    for attr in ("candidate", "staff"):
+        try:
+            return getattr(request.user, attr), None
+        except Exception:
+            continue
+    return None, Response(
+        {"error": "User has no candidate or staff profile"},
+        status=status.HTTP_404_NOT_FOUND,
+    )
@@ -0,0 +1,384 @@
+"""
+Micro-benchmarks of the serializers and scoring code on hot paths.
+
+Each benchmark runs one operation repeatedly over a fixed synthetic dataset
+and reports its throughput (operations per second) and, from a separate run
+under tracemalloc, the peak memory allocated by one operation:
+
+    candidate_detail    CandidateDetailSerializer for a candidate with a score
+                        in every exam (candidate detail, account management)
+    candidate_scores    CandidateScoreSerializer over a candidate's scores
+                        (candidate scores endpoint)
+    minimal_candidate   MinimalCandidateSerializer per league candidate, as
+                        `publish_leaderboard` does for every row
+    auto_score          auto_score of a submission answering every question
+    candidate_list      CandidateListSerializer over a page of candidates
+    staff_list          StaffListSerializer over a page of staff
+    render_leaderboard  JSONRenderer over a leaderboard snapshot of every
+                        league candidate
+
+The list and scores benchmarks include their query. Those ending in `_values`
+produce the same output with the `ValuesSerializer` the endpoints use, so the
+pairs show what reading rows with `values_list()` saves.
+`render_leaderboard_fast` renders the same snapshot with `FastJSONRenderer`.
+
+The dataset is created inside a transaction that is rolled back afterwards;
+see `run_benchmarks` and the `benchmark_hot_paths` command.
+"""
+
+import random
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Prefetch
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from ..models import Candidate, CandidateAnswer, CandidateScore, Exam, Question, Staff
+from ..renderers import FastJSONRenderer
+from ..serializers import (
+    CandidateDetailSerializer,
+    CandidateListSerializer,
+    CandidateScoreSerializer,
+    MinimalCandidateSerializer,
+    StaffListSerializer,
+)
+from .helpers import auto_score
+from .values_serializers import ValuesSerializer
+
+User = get_user_model()
+
+BENCHMARK_PREFIX = "benchmark"
+BENCHMARKS = (
+    "candidate_detail",
+    "candidate_scores",
+    "candidate_scores_values",
+    "minimal_candidate",
+    "auto_score",
+    "candidate_list",
+    "candidate_list_values",
+    "staff_list",
+    "staff_list_values",
+    "render_leaderboard",
+    "render_leaderboard_fast",
+)
+# The largest page of the list endpoints.
+PAGE_SIZE = 100
+WARMUP_ITERATIONS = 3
+
+
+def seed_benchmark_data(candidates=200, staff=100, exams=20, questions=40, seed=0):
+    """
+    Creates the fixed dataset of the benchmarks.
+
+    Args:
+        candidates (int): Number of league candidates.
+        staff (int): Number of staff besides the owner of everything.
+        exams (int): Number of league exams, each with every question.
+        questions (int): Number of questions.
+        seed (int): Seed of the generated scores and answers.
+
+    Returns:
+        dict: The candidate with a score in every exam and the score with an
+        answer to every question.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    owner = Staff.objects.create(
+        user=User.objects.create(username=f"{BENCHMARK_PREFIX}-owner"), role="owner"
+    )
+    staff_users = User.objects.bulk_create(
+        [
+            User(
+                username=f"{BENCHMARK_PREFIX}-staff-{index:04d}",
+                email=f"{BENCHMARK_PREFIX}-staff-{index:04d}@example.com",
+                first_name="Staff",
+                last_name=str(index),
+            )
+            for index in range(staff)
+        ]
+    )
+    Staff.objects.bulk_create(
+        [
+            Staff(user=user, role="volunteer", occupation="Teacher")
+            for user in staff_users
+        ]
+    )
+    users = User.objects.bulk_create(
+        [
+            User(
+                username=f"{BENCHMARK_PREFIX}-{index:04d}",
+                email=f"{BENCHMARK_PREFIX}-{index:04d}@example.com",
+                first_name="Candidate",
+                last_name=str(index),
+            )
+            for index in range(candidates)
+        ]
+    )
+    league = Candidate.objects.bulk_create(
+        [
+            Candidate(user=user, role="league", school=f"School {index % 50}")
+            for index, user in enumerate(users)
+        ]
+    )
+    bank = []
+    for index in range(questions):
+        question = Question(
+            text=f"[{BENCHMARK_PREFIX}] Question {index}",
+            option_a="1",
+            option_b="2",
+            option_c="3",
+            option_d="4",
+            correct_answer=rng.choice("ABCD"),
+            created_by=owner,
+        )
+        # bulk_create skips save(), which computes the hash.
+        question.text_hash = Question.build_text_hash(
+            question.text,
+            question.option_a,
+            question.option_b,
+            question.option_c,
+            question.option_d,
+        )
+        bank.append(question)
+    bank = Question.objects.bulk_create(bank)
+    schedule = []
+    for index in range(exams):
+        exam = Exam(
+            title=f"[{BENCHMARK_PREFIX}] Exam {index}",
+            stage="league",
+            exam_date=now - timedelta(days=index + 1),
+            is_active=True,
+            created_by=owner,
+        )
+        exam.closes_at = exam.get_closes_at()
+        schedule.append(exam)
+    schedule = Exam.objects.bulk_create(schedule)
+    Through = Exam.questions.through
+    Through.objects.bulk_create(
+        [
+            Through(exam_id=exam.pk, question_id=question.pk)
+            for exam in schedule
+            for question in bank
+        ]
+    )
+
+    candidate = league[0]
+    scores = CandidateScore.objects.bulk_create(
+        [
+            CandidateScore(
+                candidate=candidate,
+                exam=exam,
+                score=rng.randint(0, 100),
+                submitted_by=owner,
+            )
+            for exam in schedule
+        ]
+    )
+    CandidateAnswer.objects.bulk_create(
+        [
+            CandidateAnswer(
+                candidate_score=scores[0],
+                question=question,
+                selected_option=rng.choice("ABCD"),
+            )
+            for question in bank
+        ]
+    )
+    return {"candidate": candidate, "submission": scores[0]}
+
+
+def _candidate_detail(dataset):
+    candidate = dataset["candidate"]
+    return lambda: CandidateDetailSerializer(candidate).data
+
+
+def _candidate_scores(dataset):
+    scores = (
+        CandidateScore.objects.filter(candidate=dataset["candidate"])
+        .select_related("candidate__user")
+        .prefetch_related(Prefetch("exam", queryset=Exam.objects.with_question_count()))
+    )
+    return lambda: CandidateScoreSerializer(scores.all(), many=True).data
+
+
+def _candidate_scores_values(dataset):
+    serializer = ValuesSerializer(
+        CandidateScoreSerializer,
+        expressions={"exam.question_count": Count("exam__questions", distinct=True)},
+    )
+    scores = CandidateScore.objects.filter(candidate=dataset["candidate"])
+    return lambda: serializer.data(scores)
+
+
+def _candidate_list(dataset):
+    candidates = Candidate.objects.select_related("user").order_by("-date_created")
+    return lambda: CandidateListSerializer(candidates[:PAGE_SIZE], many=True).data
+
+
+def _candidate_list_values(dataset):
+    serializer = ValuesSerializer(CandidateListSerializer)
+    candidates = Candidate.objects.order_by("-date_created")
+    return lambda: serializer.data(candidates[:PAGE_SIZE])
+
+
+def _staff_list(dataset):
+    staff = Staff.objects.select_related("user").order_by("-date_created")
+    return lambda: StaffListSerializer(staff[:PAGE_SIZE], many=True).data
+
+
+def _staff_list_values(dataset):
+    serializer = ValuesSerializer(StaffListSerializer)
+    staff = Staff.objects.order_by("-date_created")
+    return lambda: serializer.data(staff[:PAGE_SIZE])
+
+
+def _minimal_candidate(dataset):
+    candidates = list(
+        Candidate.candidates_by_role("league")
+        .filter(user__username__startswith=BENCHMARK_PREFIX)
+        .select_related("user")
+    )
+    return lambda: [
+        MinimalCandidateSerializer(candidate).data for candidate in candidates
+    ]
+
+
+def _auto_score(dataset):
+    submission = dataset["submission"]
+
+    return lambda: auto_score(submission)
+
+
+def _leaderboard(dataset):
+    # Shaped like the snapshots of publish_leaderboard.
+    candidates = (
+        Candidate.candidates_by_role("league")
+        .filter(user__username__startswith=BENCHMARK_PREFIX)
+        .select_related("user")
+    )
+    return [
+        {
+            "rank": index + 1,
+            "candidate": MinimalCandidateSerializer(candidate).data,
+            "total_score": float(index),
+        }
+        for index, candidate in enumerate(candidates)
+    ]
+
+
+def _render_leaderboard(dataset):
+    renderer, leaderboard = JSONRenderer(), _leaderboard(dataset)
+    return lambda: renderer.render(leaderboard)
+
+
+def _render_leaderboard_fast(dataset):
+    renderer, leaderboard = FastJSONRenderer(), _leaderboard(dataset)
+    return lambda: renderer.render(leaderboard)
+
+
+BENCHMARK_FACTORIES = {
+    "candidate_detail": _candidate_detail,
+    "candidate_scores": _candidate_scores,
+    "candidate_scores_values": _candidate_scores_values,
+    "minimal_candidate": _minimal_candidate,
+    "auto_score": _auto_score,
+    "candidate_list": _candidate_list,
+    "candidate_list_values": _candidate_list_values,
+    "staff_list": _staff_list,
+    "staff_list_values": _staff_list_values,
+    "render_leaderboard": _render_leaderboard,
+    "render_leaderboard_fast": _render_leaderboard_fast,
+}
+
+
+def measure(operation, iterations):
+    """
+    Times `iterations` calls of `operation` after a short warm-up, then measures
+    the memory allocated by one more call with tracemalloc.
+
+    Returns:
+        dict: Iterations, operations per second, mean microseconds per
+        operation and the peak KiB allocated by one operation.
+    """
+    for _ in range(WARMUP_ITERATIONS):
+        operation()
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+    elapsed = time.perf_counter() - started
+
+    # Traced separately: tracemalloc slows down every allocation.
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / elapsed, 2) if elapsed else None,
+        "mean_us": round(elapsed / iterations * 1e6, 2),
+        "peak_alloc_kib": round((peak - baseline) / 1024, 2),
+    }
+
+
+def run_benchmarks(names=BENCHMARKS, iterations=200, seed=0):
+    """
+    Runs benchmarks over a freshly seeded dataset, which is rolled back
+    afterwards.
+
+    Args:
+        names (Iterable[str]): Benchmarks to run (see `BENCHMARKS`).
+        iterations (int): Timed operations per benchmark.
+        seed (int): Seed of the dataset.
+
+    Returns:
+        dict: Results per benchmark (see `measure`).
+    """
+    results = {}
+    with transaction.atomic():
+        dataset = seed_benchmark_data(seed=seed)
+        for name in names:
+            operation = BENCHMARK_FACTORIES[name](dataset)
+            results[name] = measure(operation, iterations)
+        transaction.set_rollback(True)
+    return results
+
+
+def compare_benchmarks(report, baseline, tolerance):
+    """
+    Lists regressions of a benchmark report against a baseline report.
+
+    A benchmark regresses when its throughput falls, or its peak allocation
+    grows, by more than `tolerance` (a fraction).
+
+    Returns:
+        list[str]: Human readable regressions; empty if there are none.
+    """
+    regressions = []
+    for name, current in report["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if not before:
+            continue
+        if (
+            before["ops_per_sec"]
+            and current["ops_per_sec"]
+            and current["ops_per_sec"] < before["ops_per_sec"] * (1 - tolerance)
+        ):
+            regressions.append(
+                f"{name}: {before['ops_per_sec']} -> {current['ops_per_sec']} ops/s"
+            )
+        if current["peak_alloc_kib"] > before["peak_alloc_kib"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: peak allocation {before['peak_alloc_kib']} KiB -> "
+                f"{current['peak_alloc_kib']} KiB"
+            )
+    return regressions
@@ -0,0 +1,74 @@
+"""
+Utility functions for namespaced, generation-based cache invalidation.
+
+Cached entries are stored under keys that embed the current generation of their
+namespace. Bumping the generation makes every entry of that namespace
+unreachable at once, without having to know or delete the individual keys.
+"""
+
+from django.core.cache import cache
+
+STANDINGS = "standings"
+DASHBOARDS = "dashboards"
+API_KEYS = "api-keys"
+
+
+def _generation_key(namespace):
+    return f"cache-generation:{namespace}"
+
+
+def get_cache_generation(namespace):
+    """
+    Returns the current generation number of a cache namespace.
+
+    Args:
+        namespace (str): The cache namespace (e.g. `STANDINGS`).
+
+    Returns:
+        int: The current generation, starting at 1.
+    """
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, 1, timeout=None)
+        generation = cache.get(key, 1)
+    return generation
+
+
+def namespaced_cache_key(namespace, *parts):
+    """
+    Builds a cache key bound to the current generation of a namespace.
+
+    Args:
+        namespace (str): The cache namespace.
+        *parts: Additional key components (e.g. an object ID).
+
+    Returns:
+        str: The cache key.
+    """
+    suffix = ":".join(str(part) for part in parts)
+    return f"{namespace}:{get_cache_generation(namespace)}:{suffix}"
+
+
+def invalidate_cache_namespaces(*namespaces):
+    """
+    Invalidates every cached entry of the given namespaces by bumping their generation.
+
+    Args:
+        *namespaces (str): The namespaces to invalidate.
+    """
+    for namespace in namespaces:
+        key = _generation_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 2, timeout=None)
+
+
+def invalidate_standings():
+    """
+    Invalidates cached league standings and every dashboard derived from them.
+
+    Call after any change to scores or candidate roles.
+    """
+    invalidate_cache_namespaces(STANDINGS, DASHBOARDS)
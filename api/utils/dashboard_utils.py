@@ -6,10 +6,46 @@ and relevant activity for frontend display.
 """
 
 from datetime import timedelta
+from django.core.cache import cache
 from django.db.models import Avg, Max, Min, Sum
 from django.utils import timezone
 
 from ..models import Candidate, CandidateScore, Exam, Question
+from .cache_utils import DASHBOARDS, STANDINGS, namespaced_cache_key
+from .photos import photo_variant_url
+from .replica import use_primary
+
+STANDINGS_CACHE_TIMEOUT = 60 * 5
+STAFF_DASHBOARD_CACHE_TIMEOUT = 60
+
+
+def get_league_standings():
+    """
+    Returns the current ranking of league candidates by total score.
+
+    The ranking is computed once, on the primary, and cached until scores or
+    roles change (see `invalidate_standings`).
+
+    Returns:
+        dict: `ranks` mapping candidate IDs to their 1-based rank, and `total`
+        number of ranked league candidates.
+    """
+    key = namespaced_cache_key(STANDINGS, "league")
+    standings = cache.get(key)
+    if standings is None:
+        with use_primary():
+            ranked_ids = list(
+                Candidate.candidates_by_role("league")
+                .annotate(total_score=Sum("scores__score"))
+                .order_by("-total_score")
+                .values_list("pk", flat=True)
+            )
+        standings = {
+            "ranks": {pk: rank for rank, pk in enumerate(ranked_ids, 1)},
+            "total": len(ranked_ids),
+        }
+        cache.set(key, standings, STANDINGS_CACHE_TIMEOUT)
+    return standings
 
 
 def get_candidate_dashboard_data(candidate):
@@ -36,28 +72,16 @@ def get_candidate_dashboard_data(candidate):
     highest_score = scores.aggregate(max=Max("score"))["max"] or 0
     lowest_score = scores.aggregate(min=Min("score"))["min"] or 0
 
-    available_exams = [
-        exam
-        for exam in Exam.objects.filter(stage=candidate.role, is_active=True)
-        if exam.is_currently_open
-    ]
-    recent_scores = scores.order_by("-date_recorded")[:5]
+    available_exams = list(Exam.objects.open_now(candidate.role).with_question_count())
+    recent_scores = scores.select_related("exam").order_by("-date_recorded")[:5]
 
     # Ranking logic for league candidates
     candidate_rank = None
     total_league_candidates = 0
     if candidate.role == "league":
-        league_candidates = (
-            Candidate.candidates_by_role("league")
-            .annotate(total_score=Sum("scores__score"))
-            .order_by("-total_score")
-        )
-
-        for index, c in enumerate(league_candidates, 1):
-            if c.pk == candidate.pk:
-                candidate_rank = index
-                break
-        total_league_candidates = league_candidates.count()
+        standings = get_league_standings()
+        candidate_rank = standings["ranks"].get(candidate.pk)
+        total_league_candidates = standings["total"]
 
     return {
         "candidate_info": {
@@ -68,9 +92,7 @@ def get_candidate_dashboard_data(candidate):
             "role": candidate.get_role_display(),
             "is_verified": candidate.is_verified,
             "date_joined": candidate.date_created,
-            "profile_photo": (
-                candidate.profile_photo.url if candidate.profile_photo else None
-            ),
+            "profile_photo": photo_variant_url(candidate.profile_photo),
         },
         "exam_stats": {
             "total_exams_taken": total_exams_taken,
@@ -139,6 +161,35 @@ def get_staff_dashboard_data(staff):
     Returns:
         dict: A dictionary containing candidate stats, exams, scores, recent activity, and upcoming exams.
     """
+    staff_info = {
+        "id": staff.user.id,
+        "name": staff.user.get_full_name(),
+        "email": staff.user.email,
+        "role": staff.get_role_display(),
+        "occupation": staff.occupation,
+        "is_verified": staff.is_verified,
+        "date_joined": staff.date_created,
+        "profile_photo": photo_variant_url(staff.profile_photo),
+    }
+
+    key = namespaced_cache_key(DASHBOARDS, "staff")
+    stats = cache.get(key)
+    if stats is None:
+        # Shared by every staff member, so not read from a lagging replica.
+        with use_primary():
+            stats = get_staff_dashboard_stats()
+        cache.set(key, stats, STAFF_DASHBOARD_CACHE_TIMEOUT)
+
+    return {"staff_info": staff_info, **stats}
+
+
+def get_staff_dashboard_stats():
+    """
+    Compute the staff-independent statistics shown on every staff dashboard.
+
+    Returns:
+        dict: Candidate, exam, question and score statistics, recent activity and upcoming exams.
+    """
     now = timezone.now()
     last_week = now - timedelta(days=7)
 
@@ -179,19 +230,7 @@ def get_staff_dashboard_data(staff):
         "exam_date"
     )[:5]
 
-    staff_info = {
-        "id": staff.user.id,
-        "name": staff.user.get_full_name(),
-        "email": staff.user.email,
-        "role": staff.get_role_display(),
-        "occupation": staff.occupation,
-        "is_verified": staff.is_verified,
-        "date_joined": staff.date_created,
-        "profile_photo": staff.profile_photo.url if staff.profile_photo else None,
-    }
-
     return {
-        "staff_info": staff_info,
         "candidates": {
             "total": total_candidates,
             "active": active_candidates,
@@ -0,0 +1,88 @@
+"""
+Database connection metrics of the current worker process.
+
+Connections are either kept open between requests (`CONN_MAX_AGE`) or, with
+`DB_POOL_MAX_SIZE` set, taken from an in-process psycopg pool. Either way, the
+number of connections opened by this process is counted; for pools, the pool's
+own counters (checkouts, time spent waiting for a connection and checkouts that
+timed out because the pool was exhausted) are reported as well.
+"""
+
+import os
+import threading
+from collections import Counter
+
+from django.db import connections
+
+_lock = threading.Lock()
+_opened = Counter()
+_requests = Counter()
+
+
+def record_connection_created(sender, connection, **kwargs):
+    """
+    Counts a new database connection. Connected to `connection_created`.
+    """
+    with _lock:
+        _opened[connection.alias] += 1
+
+
+def record_request_started(sender, **kwargs):
+    """
+    Counts a request. Connected to `request_started`.
+    """
+    with _lock:
+        _requests["total"] += 1
+
+
+def get_connection_mode(connection):
+    """
+    Returns how a database connection is managed: "pool", "persistent" or
+    "per-request".
+    """
+    if connection.settings_dict["OPTIONS"].get("pool"):
+        return "pool"
+    if connection.settings_dict["CONN_MAX_AGE"] != 0:
+        return "persistent"
+    return "per-request"
+
+
+def _get_pool_stats(connection):
+    stats = connection.pool.get_stats()
+    return {
+        "pool_size": stats.get("pool_size", 0),
+        "pool_available": stats.get("pool_available", 0),
+        "checkouts": stats.get("requests_num", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "wait_seconds_total": stats.get("requests_wait_ms", 0) / 1000,
+        "exhausted": stats.get("requests_errors", 0),
+    }
+
+
+def get_db_connection_stats():
+    """
+    Returns connection metrics of this worker process.
+
+    Returns:
+        dict: The process id, the number of requests served and, per database
+        alias, the connection mode, the number of connections opened and, for
+        pools, the pool's counters.
+    """
+    with _lock:
+        opened = dict(_opened)
+        requests = _requests["total"]
+
+    databases = {}
+    for alias in connections:
+        connection = connections[alias]
+        mode = get_connection_mode(connection)
+        databases[alias] = {
+            "mode": mode,
+            "max_age": connection.settings_dict["CONN_MAX_AGE"],
+            "health_checks": connection.settings_dict["CONN_HEALTH_CHECKS"],
+            "connections_opened": opened.get(alias, 0),
+        }
+        if mode == "pool":
+            databases[alias].update(_get_pool_stats(connection))
+
+    return {"pid": os.getpid(), "requests": requests, "databases": databases}
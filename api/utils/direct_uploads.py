@@ -0,0 +1,150 @@
+"""
+Direct-to-storage uploads of profile photos and ID cards.
+
+Instead of streaming image bytes through a web worker, clients ask for an
+upload ticket: a presigned S3 POST form limited to one key, content type and
+maximum size. They upload the file straight to the bucket, then call the
+completion endpoint, which checks the size and type of the stored object from
+its metadata and hands its key to the photo processing pool (see `photos`). The
+image bytes never go through the web workers: a pool worker downloads the
+object, deletes it, and attaches the processed variants to the Candidate or
+Staff record.
+
+Set `AWS_S3_ENDPOINT_URL` to use a local S3-compatible server (such as MinIO)
+in development and tests.
+"""
+
+import mimetypes
+import uuid
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core.cache import cache
+
+from .photos import schedule_stored_photo_processing
+
+UPLOAD_TICKET_FIELDS = ("profile_photo", "id_card")
+UPLOAD_CONTENT_TYPES = ("image/jpeg", "image/png", "image/webp")
+UPLOAD_TICKET_EXPIRES = getattr(settings, "UPLOAD_TICKET_EXPIRES", 60 * 10)
+UPLOAD_MAX_BYTES = getattr(settings, "UPLOAD_MAX_BYTES", 5 * 1024 * 1024)
+
+
+def _ticket_key(ticket_id):
+    return f"upload-ticket:{ticket_id}"
+
+
+def _storage_key(storage, name):
+    location = getattr(storage, "location", "")
+    return f"{location.rstrip('/')}/{name}" if location else name
+
+
+def _stored_object(storage, name):
+    """
+    Returns the size and content type of a stored object, with a single HEAD
+    request, or None if there is no such object.
+    """
+    stored = storage.bucket.Object(_storage_key(storage, name))
+    try:
+        stored.load()
+    except ClientError as error:
+        if error.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            return None
+        raise
+    return stored.content_length, stored.content_type
+
+
+def create_upload_ticket(profile, field_name, content_type):
+    """
+    Issues a presigned POST for uploading one image of a profile.
+
+    Args:
+        profile (Candidate | Staff): The profile the image is for.
+        field_name (str): `profile_photo` or `id_card`.
+        content_type (str): MIME type of the image to upload.
+
+    Returns:
+        dict: The ticket ID, the form `url` and `fields` to POST with the file,
+        the storage `key`, and when the ticket expires.
+    """
+    field = profile._meta.get_field(field_name)
+    storage = field.storage
+    extension = mimetypes.guess_extension(content_type) or ""
+    name = field.generate_filename(profile, f"{uuid.uuid4().hex}{extension}")
+    key = _storage_key(storage, name)
+
+    presigned = storage.connection.meta.client.generate_presigned_post(
+        Bucket=storage.bucket_name,
+        Key=key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, UPLOAD_MAX_BYTES],
+        ],
+        ExpiresIn=UPLOAD_TICKET_EXPIRES,
+    )
+
+    ticket_id = uuid.uuid4().hex
+    cache.set(
+        _ticket_key(ticket_id),
+        {
+            "user_id": profile.pk,
+            "model": profile._meta.label,
+            "field": field_name,
+            "name": name,
+            "content_type": content_type,
+        },
+        UPLOAD_TICKET_EXPIRES + 60,
+    )
+    return {
+        "ticket": ticket_id,
+        "url": presigned["url"],
+        "fields": presigned["fields"],
+        "key": key,
+        "max_bytes": UPLOAD_MAX_BYTES,
+        "expires_in": UPLOAD_TICKET_EXPIRES,
+    }
+
+
+def complete_upload(profile, ticket_id):
+    """
+    Checks an uploaded image and sends its key to the photo processing pool, to
+    be attached to the profile its ticket was issued for once processed.
+
+    Args:
+        profile (Candidate | Staff): The profile of the requesting user.
+        ticket_id (str): ID of the upload ticket.
+
+    Returns:
+        Tuple:
+            - field_name (str | None): The field being updated, or None on error.
+            - error (str | None): Why the upload could not be attached.
+    """
+    ticket = cache.get(_ticket_key(ticket_id))
+    if (
+        ticket is None
+        or ticket["user_id"] != profile.pk
+        or ticket["model"] != profile._meta.label
+    ):
+        return None, "Upload ticket is invalid or has expired."
+
+    field_name, name = ticket["field"], ticket["name"]
+    storage = profile._meta.get_field(field_name).storage
+    stored = _stored_object(storage, name)
+    if stored is None:
+        return None, "No file has been uploaded for this ticket."
+    size, content_type = stored
+    error = None
+    if size > UPLOAD_MAX_BYTES:
+        error = "Uploaded file is too large."
+    elif content_type != ticket["content_type"]:
+        error = "Uploaded file is not of the requested type."
+    if error:
+        storage.delete(name)
+        cache.delete(_ticket_key(ticket_id))
+        return None, error
+
+    # Uploaded as is: EXIF metadata is only removed, and variants rendered, by
+    # the pipeline.
+    schedule_stored_photo_processing(profile, field_name, name)
+    cache.delete(_ticket_key(ticket_id))
+    return field_name, None
@@ -0,0 +1,386 @@
+"""
+Cache-backed exam session state for candidates taking an exam.
+
+Timed sessions record when a candidate started an exam, the deadline for their
+submission and the seed their questions are shuffled with. Sessions are stored
+in the database and cached, so a submission is checked against its deadline
+with a single cache lookup.
+
+In-progress answers are autosaved into the cache and written behind to the
+database in batches, so frequent autosaves from many candidates turn into cache
+writes rather than row inserts. Buffered answers are flushed when enough of them
+are pending, when the last flush is old enough, and at final submission.
+
+The buffered state of a session is read and written back as a whole, so its
+updates are serialised with a per-session lock held in the cache; concurrent
+autosaves (two tabs, a retry racing the original) wait for each other instead
+of overwriting each other's answers.
+"""
+
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from ..models import CandidateAnswer, CandidateScore, Exam, ExamSession
+from .helpers import auto_score
+
+AUTOSAVE_FLUSH_BATCH_SIZE = getattr(settings, "AUTOSAVE_FLUSH_BATCH_SIZE", 20)
+AUTOSAVE_FLUSH_INTERVAL_SECONDS = getattr(
+    settings, "AUTOSAVE_FLUSH_INTERVAL_SECONDS", 60
+)
+EXAM_META_CACHE_TIMEOUT = 60 * 5
+SESSION_STATE_TIMEOUT = 60 * 60 * 24
+# Allowance for network latency between the client's timer running out and the
+# submission arriving.
+EXAM_SESSION_GRACE_SECONDS = getattr(settings, "EXAM_SESSION_GRACE_SECONDS", 30)
+# Expiry of a session state lock, in case its holder dies; also how long a
+# request waits for it.
+STATE_LOCK_TIMEOUT_SECONDS = 5
+STATE_LOCK_POLL_SECONDS = 0.01
+
+
+class ExamSessionBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Your answers are being saved, please try again shortly."
+    default_code = "exam_session_busy"
+
+
+def _state_key(candidate_id, exam_id):
+    return f"exam-session:{exam_id}:{candidate_id}"
+
+
+def _state_lock_key(candidate_id, exam_id):
+    return f"exam-session-lock:{exam_id}:{candidate_id}"
+
+
+@contextmanager
+def _state_lock(candidate_id, exam_id):
+    """
+    Holds the lock of a session's cached state for the duration of the block.
+
+    Raises:
+        ExamSessionBusy: If the lock is not released in time.
+    """
+    key, token = _state_lock_key(candidate_id, exam_id), uuid.uuid4().hex
+    deadline = time.monotonic() + STATE_LOCK_TIMEOUT_SECONDS
+    while not cache.add(key, token, STATE_LOCK_TIMEOUT_SECONDS):
+        if time.monotonic() > deadline:
+            raise ExamSessionBusy()
+        time.sleep(STATE_LOCK_POLL_SECONDS)
+    try:
+        yield
+    finally:
+        # Not if it expired and was taken by another request meanwhile.
+        if cache.get(key) == token:
+            cache.delete(key)
+
+
+def _session_key(candidate_id, exam_id):
+    return f"exam-deadline:{exam_id}:{candidate_id}"
+
+
+def _cache_session(session):
+    data = {
+        "started_at": session.started_at,
+        "deadline": session.deadline,
+        "question_seed": session.question_seed,
+        "finalised": session.finalised_at is not None,
+    }
+    cache.set(
+        _session_key(session.candidate_id, session.exam_id),
+        data,
+        SESSION_STATE_TIMEOUT,
+    )
+    return data
+
+
+def start_exam_session(candidate, exam):
+    """
+    Starts a candidate's timed session for an exam, or returns the running one.
+
+    The deadline is `countdown_minutes` after the start, but never later than
+    the end of the exam's open window.
+
+    Args:
+        candidate (Candidate): The candidate taking the exam.
+        exam (Exam): The exam being taken.
+
+    Returns:
+        dict: `started_at`, `deadline`, `question_seed` and `finalised`.
+    """
+    session = get_exam_session(candidate.pk, exam.pk)
+    if session is not None:
+        return session
+
+    now = timezone.now()
+    deadline = now + timedelta(minutes=exam.countdown_minutes)
+    if exam.exam_date is not None:
+        deadline = min(
+            deadline, exam.exam_date + timedelta(hours=exam.open_duration_hours)
+        )
+
+    try:
+        with transaction.atomic():
+            session = ExamSession.objects.create(
+                candidate=candidate,
+                exam=exam,
+                started_at=now,
+                deadline=deadline,
+                question_seed=random.randrange(2**31),
+            )
+    except IntegrityError:
+        # Started concurrently by another request of the same candidate.
+        session = ExamSession.objects.get(candidate=candidate, exam=exam)
+    return _cache_session(session)
+
+
+def get_exam_session(candidate_id, exam_id):
+    """
+    Returns a candidate's exam session from the cache, falling back to the
+    database.
+
+    Returns:
+        dict | None: `started_at`, `deadline`, `question_seed` and `finalised`,
+        or None if the candidate has not started the exam.
+    """
+    data = cache.get(_session_key(candidate_id, exam_id))
+    if data is None:
+        session = ExamSession.objects.filter(
+            candidate_id=candidate_id, exam_id=exam_id
+        ).first()
+        if session is None:
+            return None
+        data = _cache_session(session)
+    return data
+
+
+def is_session_expired(session, now=None):
+    """
+    Returns True if the session's deadline, plus a short grace period, has passed.
+    """
+    now = now or timezone.now()
+    return now > session["deadline"] + timedelta(seconds=EXAM_SESSION_GRACE_SECONDS)
+
+
+def shuffle_questions(questions, seed):
+    """
+    Returns the questions in the order given by a session's seed.
+
+    The questions are sorted by ID first so the order is the same on every request.
+    """
+    questions = sorted(questions, key=lambda question: question["id"])
+    random.Random(seed).shuffle(questions)
+    return questions
+
+
+def get_exam_meta(exam_id):
+    """
+    Returns the stage and question IDs of an exam, cached for a few minutes.
+
+    Args:
+        exam_id (int): ID of the exam.
+
+    Returns:
+        dict | None: `stage` and `question_ids`, or None if the exam does not exist.
+    """
+    key = f"exam-meta:{exam_id}"
+    meta = cache.get(key)
+    if meta is None:
+        exam = Exam.objects.filter(pk=exam_id).only("stage").first()
+        if exam is None:
+            return None
+        meta = {
+            "stage": exam.stage,
+            "question_ids": set(exam.questions.values_list("pk", flat=True)),
+        }
+        cache.set(key, meta, EXAM_META_CACHE_TIMEOUT)
+    return meta
+
+
+def _new_state():
+    return {"answers": {}, "dirty": set(), "flushed_at": time.time()}
+
+
+def get_session_state(candidate_id, exam_id):
+    """
+    Returns the cached session state of a candidate's exam, or a fresh one.
+    """
+    return cache.get(_state_key(candidate_id, exam_id)) or _new_state()
+
+
+def buffer_answers(candidate_id, exam_id, answers):
+    """
+    Records answer deltas in the cached session state, flushing pending answers
+    to the database when the batch size or flush interval is reached.
+
+    The state is updated under the session's lock. Pending answers are flushed
+    after it is released, so that the lock is never held while waiting for the
+    score row, which submission locks first.
+
+    Args:
+        candidate_id (int): ID of the candidate.
+        exam_id (int): ID of the exam.
+        answers (dict[int, str | None]): Selected options keyed by question ID.
+
+    Returns:
+        bool: True if pending answers were flushed to the database.
+
+    Raises:
+        ExamSessionBusy: If the session's state stays locked by other requests.
+    """
+    pending = {}
+    with _state_lock(candidate_id, exam_id):
+        state = get_session_state(candidate_id, exam_id)
+        state["answers"].update(answers)
+        state["dirty"].update(answers)
+        if (
+            len(state["dirty"]) >= AUTOSAVE_FLUSH_BATCH_SIZE
+            or time.time() - state["flushed_at"] >= AUTOSAVE_FLUSH_INTERVAL_SECONDS
+        ):
+            pending = {
+                question_id: state["answers"][question_id]
+                for question_id in state["dirty"]
+            }
+            state["dirty"] = set()
+            state["flushed_at"] = time.time()
+        cache.set(_state_key(candidate_id, exam_id), state, SESSION_STATE_TIMEOUT)
+
+    # Flushed answers stay in the state, so they are submitted even if this fails.
+    return flush_answers(candidate_id, exam_id, pending)
+
+
+def flush_answers(candidate_id, exam_id, answers):
+    """
+    Writes answers taken from a session state to the database in one upsert.
+
+    Answers of an exam that has already been submitted are never overwritten: the
+    candidate's score row is locked while the answers are written, as it is at
+    submission.
+
+    Args:
+        candidate_id (int): ID of the candidate.
+        exam_id (int): ID of the exam.
+        answers (dict[int, str | None]): Selected options keyed by question ID.
+
+    Returns:
+        bool: True if answers were written.
+    """
+    if not answers:
+        return False
+
+    CandidateScore.objects.get_or_create(candidate_id=candidate_id, exam_id=exam_id)
+    with transaction.atomic():
+        candidate_score = CandidateScore.objects.select_for_update().get(
+            candidate_id=candidate_id, exam_id=exam_id
+        )
+        if candidate_score.submitted_at is not None:
+            return False
+        save_answers(candidate_score, answers)
+    return True
+
+
+def save_answers(candidate_score, answers):
+    """
+    Creates or updates a candidate's answers with a single upsert.
+
+    Args:
+        candidate_score (CandidateScore): The score the answers belong to.
+        answers (dict[int, str | None]): Selected options keyed by question ID.
+    """
+    now = timezone.now()
+    CandidateAnswer.objects.bulk_create(
+        [
+            CandidateAnswer(
+                candidate_score=candidate_score,
+                question_id=question_id,
+                selected_option=selected_option,
+                answered_at=now,
+            )
+            for question_id, selected_option in answers.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["candidate_score", "question"],
+        update_fields=["selected_option", "answered_at"],
+    )
+
+
+def pop_buffered_answers(candidate_id, exam_id):
+    """
+    Removes and returns every answer buffered for a session.
+
+    Used at final submission, where buffered answers are saved together with the
+    submitted ones.
+
+    Returns:
+        dict[int, str | None]: Selected options keyed by question ID.
+    """
+    key = _state_key(candidate_id, exam_id)
+    with _state_lock(candidate_id, exam_id):
+        state = cache.get(key)
+        cache.delete(key)
+    return state["answers"] if state else {}
+
+
+def submit_answers(candidate_score, answers):
+    """
+    Saves a candidate's final answers together with any buffered ones, marks the
+    exam as submitted, scores it and closes the candidate's exam session.
+
+    Args:
+        candidate_score (CandidateScore): The score the answers belong to.
+        answers (dict[int, str | None]): Submitted options keyed by question ID;
+            these take precedence over buffered answers.
+    """
+    candidate_id, exam_id = candidate_score.candidate_id, candidate_score.exam_id
+    merged = pop_buffered_answers(candidate_id, exam_id)
+    merged.update(answers)
+    if merged:
+        save_answers(candidate_score, merged)
+
+    now = timezone.now()
+    candidate_score.submitted_at = now
+    auto_score(candidate_score)
+
+    ExamSession.objects.filter(
+        candidate_id=candidate_id, exam_id=exam_id, finalised_at__isnull=True
+    ).update(finalised_at=now)
+    cache.delete(_session_key(candidate_id, exam_id))
+
+
+def finalise_expired_sessions(now=None):
+    """
+    Submits every exam session whose deadline and grace period have passed,
+    using the answers autosaved so far.
+
+    Returns:
+        int: Number of sessions finalised.
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=EXAM_SESSION_GRACE_SECONDS)
+    expired = ExamSession.objects.filter(finalised_at__isnull=True, deadline__lt=cutoff)
+
+    finalised = 0
+    for session in expired.iterator():
+        with transaction.atomic():
+            CandidateScore.objects.get_or_create(
+                candidate_id=session.candidate_id, exam_id=session.exam_id
+            )
+            candidate_score = CandidateScore.objects.select_for_update().get(
+                candidate_id=session.candidate_id, exam_id=session.exam_id
+            )
+            if candidate_score.submitted_at is None:
+                submit_answers(candidate_score, {})
+            else:
+                ExamSession.objects.filter(pk=session.pk).update(finalised_at=now)
+                cache.delete(_session_key(session.candidate_id, session.exam_id))
+        finalised += 1
+    return finalised
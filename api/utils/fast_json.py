@@ -0,0 +1,130 @@
+"""
+JSON encoding and decoding for the API renderer and parser.
+
+`orjson` is used when installed, the standard library otherwise; the
+`JSON_BACKEND` setting ("auto", "orjson" or "json") picks one explicitly.
+Both produce JSON equivalent to that of DRF's `JSONRenderer` with its default
+settings (compact, unescaped unicode, strict):
+
+- Serializer output (strings, numbers, dicts and lists) is encoded natively.
+- `Decimal`s become floats. orjson has no native decimals, so they go through
+  `default()`, which handles them before any other type.
+- Dates and times keep DRF's format (millisecond precision, `Z` for UTC).
+  orjson would encode them natively with microseconds, so they are passed
+  through to `default()` as well; serializer fields have already formatted
+  almost all of them.
+- Anything else is handed to DRF's encoder. Payloads orjson rejects (e.g.
+  integers beyond 64 bits) are encoded with the standard library instead.
+- NaN and infinities raise `ValueError`, as with DRF. orjson would encode them
+  as null, so payloads it encodes with a null are checked for them and
+  encoded with the standard library if any is found.
+
+The standard library path is byte-identical to DRF. orjson writes floats in
+the shortest form, which differs in the exponent of very large and very small
+numbers: `1e16` and `1e-7` where DRF writes `1e+16` and `1e-07`.
+"""
+
+import json
+import math
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.json import strict_constant
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_drf_encoder = JSONEncoder()
+
+
+def _default(obj):
+    if type(obj) is Decimal:
+        if not obj.is_finite():
+            raise ValueError("Out of range float values are not JSON compliant")
+        return float(obj)
+    return _drf_encoder.default(obj)
+
+
+def _has_non_finite_float(data):
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+# Reused across calls: `json.dumps` builds an encoder for every payload.
+_encoder = json.JSONEncoder(
+    ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+)
+
+
+def get_backend():
+    """
+    Returns the name of the JSON backend in use, "orjson" or "json".
+    """
+    backend = getattr(settings, "JSON_BACKEND", "auto")
+    if backend == "auto":
+        return "orjson" if orjson is not None else "json"
+    if backend not in ("orjson", "json"):
+        raise ImproperlyConfigured(f"Unknown JSON_BACKEND '{backend}'.")
+    if backend == "orjson" and orjson is None:
+        raise ImproperlyConfigured("JSON_BACKEND is 'orjson', which is not installed.")
+    return backend
+
+
+def _dumps_json(data):
+    # Escaped like DRF does, for the sake of JavaScript parsers.
+    text = _encoder.encode(data).replace("\u2028", "\\u2028")
+    return text.replace("\u2029", "\\u2029").encode()
+
+
+def _dumps_orjson(data):
+    try:
+        content = orjson.dumps(
+            data, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME
+        )
+    except orjson.JSONEncodeError:
+        return _dumps_json(data)
+    if b"null" in content and _has_non_finite_float(data):
+        # Raises, as orjson encoded NaN or an infinity as null.
+        return _dumps_json(data)
+    if b"\xe2\x80" in content:
+        content = content.replace(b"\xe2\x80\xa8", b"\\u2028")
+        content = content.replace(b"\xe2\x80\xa9", b"\\u2029")
+    return content
+
+
+def dumps(data):
+    """
+    Encodes `data` as compact UTF-8 JSON.
+
+    Returns:
+        bytes: The encoded data.
+    """
+    if get_backend() == "orjson":
+        return _dumps_orjson(data)
+    return _dumps_json(data)
+
+
+def loads(content):
+    """
+    Decodes JSON from UTF-8 bytes (or a string). NaN and infinities are
+    rejected.
+
+    Raises:
+        ValueError: If the content is not valid JSON.
+    """
+    if get_backend() == "orjson":
+        return orjson.loads(content)
+    return json.loads(content, parse_constant=strict_constant)
@@ -2,14 +2,21 @@
 Utility function to serialize candidate details along with score summaries.
 """
 
+import logging
+
+from django.db.models import F
 from django.utils import timezone
 
 
 from ..models import CandidateScore, CandidateAnswer
 from ..serializers import CandidateDetailSerializer
+from .cache_utils import invalidate_standings
+from .sparse_fields import is_requested
+
+logger = logging.getLogger(__name__)
 
 
-def get_candidate_with_scores(candidate):
+def get_candidate_with_scores(candidate, selection=(None, frozenset())):
     """
     Returns serialized candidate data including their exam scores, total score,
     and average score.
@@ -19,46 +26,55 @@ def get_candidate_with_scores(candidate):
 
     Args:
         candidate (Candidate): The candidate instance.
+        selection (tuple): The fields selected with `?fields=` / `?expand=`
+            (see `get_field_selection`); the others are not computed.
 
     Returns:
         dict: Serialized candidate data with appended scores, total_score, and average_score.
     """
-    if hasattr(candidate, "total_score"):
-        total = float(getattr(candidate, "total_score", 0) or 0)
-        count = candidate.scores.count()
-        avg = total / count if count else 0.0
-    else:
-        # Fallback to Python calculation
-        scores = list(candidate.scores.all())
-        total = sum(float(s.score) for s in scores)
-        avg = total / len(scores) if scores else 0.0
-
-    serializer = CandidateDetailSerializer(candidate)
-    data = serializer.data
-    data.update(
-        {
-            "scores": [
-                {
-                    "exam_id": s.exam.id,
-                    "exam_title": s.exam.title,
-                    "score": float(s.score),
-                    "date_recorded": s.date_recorded,
-                    "last_updated": s.date_updated,
-                    "submitted_by": (
-                        {
-                            "id": s.submitted_by.user.id,
-                            "name": s.submitted_by.user.get_full_name(),
-                        }
-                        if s.submitted_by
-                        else None
-                    ),
-                }
-                for s in candidate.scores.all().select_related("exam", "submitted_by")
-            ],
-            "total_score": total,
-            "average_score": avg,
-        }
+    serializer = CandidateDetailSerializer(
+        candidate, context={"field_selection": selection}
     )
+    data = serializer.data
+    extra = {}
+    if is_requested(selection, "scores"):
+        extra["scores"] = [
+            {
+                "exam_id": s.exam.id,
+                "exam_title": s.exam.title,
+                "score": float(s.score),
+                "date_recorded": s.date_recorded,
+                "last_updated": s.date_updated,
+                "submitted_by": (
+                    {
+                        "id": s.submitted_by.user.id,
+                        "name": s.submitted_by.user.get_full_name(),
+                    }
+                    if s.submitted_by
+                    else None
+                ),
+            }
+            for s in candidate.scores.all().select_related(
+                "exam", "submitted_by__user"
+            )
+        ]
+    if is_requested(selection, "total_score") or is_requested(
+        selection, "average_score"
+    ):
+        if hasattr(candidate, "total_score"):
+            total = float(getattr(candidate, "total_score", 0) or 0)
+            count = candidate.scores.count()
+            avg = total / count if count else 0.0
+        else:
+            # Fallback to Python calculation
+            scores = list(candidate.scores.all())
+            total = sum(float(s.score) for s in scores)
+            avg = total / len(scores) if scores else 0.0
+        if is_requested(selection, "total_score"):
+            extra["total_score"] = total
+        if is_requested(selection, "average_score"):
+            extra["average_score"] = avg
+    data.update(extra)
     return data
 
 
@@ -68,21 +84,20 @@ def auto_score(candidate_score):
     """
     answers = CandidateAnswer.objects.filter(candidate_score=candidate_score)
     total_questions = candidate_score.exam.questions.count()
-    print(f"Scoring CandidateScore: {candidate_score.pk}")
-    print(f"Total Answers Submitted: {answers.count()}")
-    print(f"Total Questions in Exam: {total_questions}")
-
-    correct_count = sum(
-        1
-        for answer in answers
-        if answer.selected_option == answer.question.correct_answer
-    )
-    print(f"Correct Answers: {correct_count}")
-
+    correct_count = answers.filter(
+        selected_option=F("question__correct_answer")
+    ).count()
     score = (correct_count / total_questions) * 100 if total_questions else 0
-    print(f"Final Score: {score}")
+    logger.debug(
+        "Scored CandidateScore %s: %s of %s questions correct, %s.",
+        candidate_score.pk,
+        correct_count,
+        total_questions,
+        score,
+    )
 
     candidate_score.score = round(score, 2)
     candidate_score.date_recorded = timezone.now()
     candidate_score.auto_score = True
     candidate_score.save()
+    invalidate_standings()
@@ -0,0 +1,82 @@
+"""
+Utility functions for idempotent request handling.
+
+Clients may send an `Idempotency-Key` header with requests that must not be
+applied twice, such as answer submissions retried by a flaky mobile connection.
+The first successful response is stored against the key, and retries with the
+same key receive that response without the request being processed again.
+"""
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..models import IdempotencyKey
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def get_idempotency_key(request):
+    """
+    Reads the idempotency key sent with a request.
+
+    Returns:
+        Tuple:
+            - key (str | None): The key, or None if the header was not sent.
+            - error_response (Response | None): 400 response if the key is invalid.
+    """
+    key = request.headers.get("Idempotency-Key", "").strip()
+    if not key:
+        return None, None
+    if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        return None, Response(
+            {
+                "error": f"Idempotency-Key must be at most "
+                f"{IDEMPOTENCY_KEY_MAX_LENGTH} characters."
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return key, None
+
+
+def get_stored_response(request, key):
+    """
+    Returns the response stored for a user's idempotency key, if any.
+
+    A key reused for a different endpoint gets a 422 response instead.
+
+    Args:
+        request (Request): The incoming request.
+        key (str | None): The idempotency key, as returned by `get_idempotency_key`.
+
+    Returns:
+        Response | None: The stored response, or None if the key is new.
+    """
+    if key is None:
+        return None
+    stored = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+    if stored is None:
+        return None
+    if stored.request_path != request.path:
+        return Response(
+            {"error": "Idempotency-Key has already been used for another request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return Response(stored.response_body, status=stored.status_code)
+
+
+def store_response(request, key, response):
+    """
+    Stores a response against a user's idempotency key. Does nothing without a key.
+
+    Should be called in the same transaction as the changes the response reports,
+    so the key is only recorded if they are committed.
+    """
+    if key is None:
+        return
+    IdempotencyKey.objects.create(
+        user=request.user,
+        key=key,
+        request_path=request.path,
+        status_code=response.status_code,
+        response_body=response.data,
+    )
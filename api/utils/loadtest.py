@@ -0,0 +1,380 @@
+"""
+Load-test harness simulating candidates starting an exam at the same time.
+
+`seed_loadtest_data` creates (or reuses) synthetic league candidates and
+questions and opens a new exam for them. `run_stage` then sends that many
+candidates through the exam journey concurrently against a running server,
+each on its own keep-alive connection:
+
+    login -> take exam -> submit answers -> dashboard -> leaderboard
+
+Every request's latency and status is recorded and summarised per step as
+p50/p95/p99 latency, throughput and error rate. See the `loadtest` command.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_api_key.models import APIKey  # type: ignore
+
+from ..models import Candidate, Exam, LeaderboardSnapshot, Question
+from .cache_utils import invalidate_standings
+
+User = get_user_model()
+
+LOADTEST_PREFIX = "loadtest"
+LOADTEST_PASSWORD = "loadtest-password"
+JOURNEY_STEPS = ("login", "take_exam", "submit_answers", "dashboard", "leaderboard")
+REQUEST_TIMEOUT = 30
+BATCH_SIZE = 1000
+
+
+def _username(index):
+    return f"{LOADTEST_PREFIX}-{index:06d}"
+
+
+def seed_loadtest_data(candidates, questions, seed=0):
+    """
+    Creates the synthetic dataset of a load test.
+
+    Candidates and questions left by earlier runs are reused; a new exam is
+    opened each run so that every candidate can submit again.
+
+    Args:
+        candidates (int): Number of league candidates.
+        questions (int): Number of questions in the exam.
+        seed (int): Seed of the generated question content.
+
+    Returns:
+        dict: The exam ID, the candidate usernames and an API key for logging in.
+    """
+    rng = random.Random(seed)
+    usernames = [_username(index) for index in range(candidates)]
+    # Hash once: every synthetic candidate shares the same password.
+    password = make_password(LOADTEST_PASSWORD)
+
+    with transaction.atomic():
+        existing = set(
+            User.objects.filter(username__in=usernames).values_list(
+                "username", flat=True
+            )
+        )
+        User.objects.bulk_create(
+            [
+                User(
+                    username=username,
+                    email=f"{username}@example.com",
+                    password=password,
+                )
+                for username in usernames
+                if username not in existing
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        users = User.objects.filter(username__in=usernames)
+        Candidate.objects.bulk_create(
+            [
+                Candidate(user=user, role="league", school="Load Test School")
+                for user in users.filter(candidate__isnull=True)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        Candidate.objects.filter(user__in=users).update(role="league", is_active=True)
+        # update() sends no signals, so standings are invalidated explicitly.
+        transaction.on_commit(invalidate_standings)
+
+        texts = [f"[{LOADTEST_PREFIX}] Question {index}" for index in range(questions)]
+        existing = set(
+            Question.objects.filter(text__in=texts).values_list("text", flat=True)
+        )
+        new_questions = []
+        for text in texts:
+            if text in existing:
+                continue
+            question = Question(
+                text=text,
+                option_a=str(rng.randint(0, 99)),
+                option_b=str(rng.randint(100, 199)),
+                option_c=str(rng.randint(200, 299)),
+                option_d=str(rng.randint(300, 399)),
+                correct_answer=rng.choice("ABCD"),
+            )
+            # bulk_create skips save(), which computes the hash.
+            question.text_hash = Question.build_text_hash(
+                question.text,
+                question.option_a,
+                question.option_b,
+                question.option_c,
+                question.option_d,
+            )
+            new_questions.append(question)
+        Question.objects.bulk_create(new_questions, batch_size=BATCH_SIZE)
+
+        exam = Exam.objects.create(
+            stage="league",
+            title=f"Load test {timezone.now():%Y-%m-%d %H:%M:%S}",
+            is_active=True,
+            exam_date=timezone.now() - timedelta(minutes=1),
+            open_duration_hours=2,
+        )
+        exam.questions.set(Question.objects.filter(text__in=texts))
+
+        if not LeaderboardSnapshot.objects.exists():
+            LeaderboardSnapshot.objects.create(data=[])
+
+    _, key = APIKey.objects.create_key(
+        name=f"{LOADTEST_PREFIX} {exam.pk}",
+        expiry_date=timezone.now() + timedelta(days=1),
+    )
+    return {"exam_id": exam.pk, "usernames": usernames, "api_key": key}
+
+
+class JourneyRecorder:
+    """
+    Thread-safe store of the (step, status, seconds) of every request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = []
+
+    def record(self, step, status, seconds):
+        with self._lock:
+            self.samples.append((step, status, seconds))
+
+
+class _Client:
+    """
+    Minimal JSON HTTP client keeping one connection alive, like a browser tab.
+    """
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        if parts.scheme == "https":
+            self.connection = HTTPSConnection(parts.netloc, timeout=REQUEST_TIMEOUT)
+        else:
+            self.connection = HTTPConnection(parts.netloc, timeout=REQUEST_TIMEOUT)
+        self.headers = {"Content-Type": "application/json"}
+
+    def request(self, method, path, data=None, headers=None):
+        body = None if data is None else json.dumps(data)
+        self.connection.request(
+            method, path, body=body, headers={**self.headers, **(headers or {})}
+        )
+        response = self.connection.getresponse()
+        content = response.read()
+        return response.status, content
+
+    def close(self):
+        self.connection.close()
+
+
+def _timed(recorder, step, client, method, path, data=None, headers=None):
+    started = time.perf_counter()
+    try:
+        status, content = client.request(method, path, data, headers)
+    except (OSError, HTTPException):
+        recorder.record(step, None, time.perf_counter() - started)
+        # Start over on a new connection.
+        client.close()
+        return None
+    recorder.record(step, status, time.perf_counter() - started)
+    return json.loads(content) if status < 400 else None
+
+
+def run_journey(base_url, username, exam_id, api_key, recorder, seed=0):
+    """
+    Sends one candidate through the exam journey. Stops at the first failed step.
+    """
+    rng = random.Random(f"{seed}:{username}")
+    client = _Client(base_url)
+    try:
+        data = _timed(
+            recorder,
+            "login",
+            client,
+            "POST",
+            reverse("v1:api-login"),
+            {"username": username, "password": LOADTEST_PASSWORD},
+            {"Authorization": f"Api-Key {api_key}"},
+        )
+        if data is None:
+            return
+        client.headers["Authorization"] = f"Bearer {data['tokens']['access']}"
+
+        exam_kwargs = {"exam_id": exam_id}
+        data = _timed(
+            recorder,
+            "take_exam",
+            client,
+            "GET",
+            reverse("v1:api-take-exam", kwargs=exam_kwargs),
+        )
+        if data is None:
+            return
+        answers = [
+            {"question": question["id"], "selected_option": rng.choice("ABCD")}
+            for question in data["questions"]
+        ]
+
+        data = _timed(
+            recorder,
+            "submit_answers",
+            client,
+            "POST",
+            reverse("v1:api-submit-exam-answers", kwargs=exam_kwargs),
+            {"answers": answers},
+            {"Idempotency-Key": str(uuid.uuid4())},
+        )
+        if data is None:
+            return
+
+        data = _timed(
+            recorder, "dashboard", client, "GET", reverse("v1:api-candidate-dashboard")
+        )
+        if data is None:
+            return
+
+        _timed(
+            recorder, "leaderboard", client, "GET", reverse("v1:api-load-leaderboard")
+        )
+    finally:
+        client.close()
+
+
+def run_stage(base_url, usernames, exam_id, api_key, ramp_seconds=0, seed=0):
+    """
+    Runs one journey per username concurrently.
+
+    Args:
+        base_url (str): URL of the server (e.g. `http://127.0.0.1:8000`).
+        usernames (list[str]): The candidates to send through the journey.
+        exam_id (int): The exam they take.
+        api_key (str): API key for logging in.
+        ramp_seconds (float): Journeys start evenly spread over this many
+            seconds; 0 starts them all at once.
+        seed (int): Seed of the submitted answers.
+
+    Returns:
+        dict: The stage summary (see `summarize`).
+    """
+    recorder = JourneyRecorder()
+    interval = ramp_seconds / len(usernames) if usernames else 0
+
+    def journey(index, username):
+        time.sleep(index * interval)
+        run_journey(base_url, username, exam_id, api_key, recorder, seed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(len(usernames), 1)) as executor:
+        list(executor.map(journey, range(len(usernames)), usernames))
+    duration = time.perf_counter() - started
+
+    summary = summarize(recorder.samples, duration)
+    summary["concurrency"] = len(usernames)
+    return summary
+
+
+def percentile(values, percent):
+    """
+    Returns the nearest-rank percentile of a list of numbers, or None if empty.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _summarize_samples(samples, duration):
+    latencies = [seconds * 1000 for _, _, seconds in samples]
+    errors = sum(1 for _, status, _ in samples if status is None or status >= 400)
+    count = len(samples)
+    return {
+        "requests": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "throughput_rps": round(count / duration, 2) if duration else 0.0,
+        "p50_ms": _round(percentile(latencies, 50)),
+        "p95_ms": _round(percentile(latencies, 95)),
+        "p99_ms": _round(percentile(latencies, 99)),
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+def summarize(samples, duration):
+    """
+    Summarises recorded requests overall and per journey step.
+
+    Args:
+        samples (list[tuple]): (step, status, seconds) per request; status is
+            None for requests that failed without a response.
+        duration (float): Wall-clock seconds the requests were sent over.
+
+    Returns:
+        dict: Duration, overall totals and a summary per step.
+    """
+    return {
+        "duration_s": round(duration, 2),
+        **_summarize_samples(samples, duration),
+        "steps": {
+            step: _summarize_samples(
+                [sample for sample in samples if sample[0] == step], duration
+            )
+            for step in JOURNEY_STEPS
+        },
+    }
+
+
+def compare_to_baseline(report, baseline, tolerance):
+    """
+    Lists regressions of a report against a baseline report.
+
+    A stage/step regresses when its p95 latency grows by more than `tolerance`
+    (a fraction) or its error rate grows at all. Stages are matched by
+    concurrency.
+
+    Returns:
+        list[str]: Human readable regressions; empty if there are none.
+    """
+    baseline_stages = {stage["concurrency"]: stage for stage in baseline["stages"]}
+    regressions = []
+    for stage in report["stages"]:
+        previous = baseline_stages.get(stage["concurrency"])
+        if previous is None:
+            continue
+        for step, current in stage["steps"].items():
+            before = previous["steps"].get(step)
+            if not before:
+                continue
+            label = f"concurrency {stage['concurrency']} {step}"
+            if (
+                before["p95_ms"]
+                and current["p95_ms"]
+                and current["p95_ms"] > before["p95_ms"] * (1 + tolerance)
+            ):
+                regressions.append(
+                    f"{label}: p95 {before['p95_ms']} ms -> {current['p95_ms']} ms"
+                )
+            if current["error_rate"] > before["error_rate"]:
+                regressions.append(
+                    f"{label}: error rate {before['error_rate']} -> "
+                    f"{current['error_rate']}"
+                )
+    return regressions
@@ -0,0 +1,82 @@
+"""
+Memoised URL generation for stored media files.
+
+For S3 storage, every `FieldFile.url` call builds (and, with query string auth,
+signs) a URL with botocore, which dominates the time spent serialising pages of
+profiles. URLs are memoised per process, keyed by storage and file name. When
+URLs are signed, entries expire well before the signature does.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+MEDIA_URL_CACHE_TIMEOUT = getattr(settings, "MEDIA_URL_CACHE_TIMEOUT", 60 * 10)
+MEDIA_URL_CACHE_SIZE = getattr(settings, "MEDIA_URL_CACHE_SIZE", 10000)
+
+_lock = threading.Lock()
+_urls = OrderedDict()
+
+
+def _is_signed(storage):
+    if not getattr(storage, "querystring_auth", False):
+        return False
+    if getattr(storage, "custom_domain", None):
+        return getattr(storage, "cloudfront_signer", None) is not None
+    return True
+
+
+def get_url_timeout(storage):
+    """
+    Returns how long URLs of a storage may be reused, in seconds.
+
+    Signed URLs are reused for at most half of their signature lifetime, so a
+    cached URL always stays valid for a while after it is served.
+    """
+    if _is_signed(storage):
+        return min(MEDIA_URL_CACHE_TIMEOUT, storage.querystring_expire // 2)
+    return MEDIA_URL_CACHE_TIMEOUT
+
+
+def resolve_media_url(storage, name):
+    """
+    Returns the URL of a stored file, memoised per storage and file name.
+
+    Args:
+        storage (Storage): The storage the file is saved in.
+        name (str): The file name within the storage.
+    """
+    key = (type(storage).__qualname__, getattr(storage, "bucket_name", None), name)
+    now = time.monotonic()
+    with _lock:
+        cached = _urls.get(key)
+        if cached is not None and cached[1] > now:
+            _urls.move_to_end(key)
+            return cached[0]
+
+    url = storage.url(name)
+    with _lock:
+        _urls[key] = (url, now + get_url_timeout(storage))
+        _urls.move_to_end(key)
+        while len(_urls) > MEDIA_URL_CACHE_SIZE:
+            _urls.popitem(last=False)
+    return url
+
+
+def media_url(fieldfile):
+    """
+    Returns the memoised URL of a file field's file, or None if it is empty.
+    """
+    if not fieldfile:
+        return None
+    return resolve_media_url(fieldfile.storage, fieldfile.name)
+
+
+def clear_media_url_cache():
+    """
+    Forgets every memoised URL of this process.
+    """
+    with _lock:
+        _urls.clear()
@@ -0,0 +1,289 @@
+"""
+Per-route request metrics, exported in the Prometheus text format.
+
+`api.middleware.RequestMetricsMiddleware` records, for every request, its
+latency, the number and total duration of its database queries, its cache hits
+and misses and the size of its response, labelled by route (the URL pattern's
+view name) and method. Queries are counted with a connection execute wrapper
+and cache lookups by the cache backends in `api.cache_backends`, both into a
+per-request collector held in a context variable.
+
+Metrics are kept in memory by each worker process and labelled with its pid,
+so that series of different workers scraped through a load balancer do not
+overwrite each other.
+"""
+
+import copy
+import os
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+from .db_metrics import get_db_connection_stats
+from .password_pool import get_password_pool_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+METRIC_PREFIX = "vmlc"
+
+ROUTE_COUNTERS = (
+    ("db_queries_total", "db_queries", "Database queries by route."),
+    ("db_query_seconds_total", "db_seconds", "Time spent in database queries."),
+    ("cache_hits_total", "cache_hits", "Cache hits by route."),
+    ("cache_misses_total", "cache_misses", "Cache misses by route."),
+    ("http_response_bytes_total", "response_bytes", "Response body bytes."),
+)
+POOL_METRICS = (
+    ("db_pool_size", "pool_size", "gauge", "Connections in the pool."),
+    ("db_pool_available", "pool_available", "gauge", "Idle pooled connections."),
+    ("db_pool_waiting", "waiting", "gauge", "Checkouts waiting for a connection."),
+    ("db_pool_checkouts_total", "checkouts", "counter", "Pool checkouts."),
+    (
+        "db_pool_wait_seconds_total",
+        "wait_seconds_total",
+        "counter",
+        "Time spent waiting for a pooled connection.",
+    ),
+    (
+        "db_pool_exhausted_total",
+        "exhausted",
+        "counter",
+        "Checkouts that timed out on an exhausted pool.",
+    ),
+)
+PASSWORD_POOL_METRICS = (
+    ("password_pool_jobs_total", "submitted", "counter", "Password hashing jobs."),
+    (
+        "password_pool_completed_total",
+        "completed",
+        "counter",
+        "Password hashing jobs completed.",
+    ),
+    (
+        "password_pool_rejected_total",
+        "rejected",
+        "counter",
+        "Password hashing jobs rejected on a full pool.",
+    ),
+    (
+        "password_pool_in_flight",
+        "in_flight",
+        "gauge",
+        "Password hashing jobs queued or running.",
+    ),
+    (
+        "password_pool_queue_seconds_total",
+        "queue_seconds_total",
+        "counter",
+        "Time password hashing jobs waited in the queue.",
+    ),
+    (
+        "password_pool_queue_seconds_max",
+        "queue_seconds_max",
+        "gauge",
+        "Longest wait of a password hashing job in the queue.",
+    ),
+    (
+        "password_pool_run_seconds_total",
+        "run_seconds_total",
+        "counter",
+        "Time spent hashing passwords.",
+    ),
+)
+
+_collector = ContextVar("request_metrics", default=None)
+_lock = threading.Lock()
+_routes = {}
+
+
+class RequestCollector:
+    """
+    Counts the database queries and cache lookups of one request.
+
+    Instances are also connection execute wrappers, timing every query.
+    """
+
+    __slots__ = ("queries", "query_seconds", "cache_hits", "cache_misses")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_seconds += time.perf_counter() - started
+
+
+@contextmanager
+def collect_request_metrics():
+    """
+    Collects the queries and cache lookups made inside the block.
+
+    Yields:
+        RequestCollector: The collector of the block.
+    """
+    collector = RequestCollector()
+    token = _collector.set(collector)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            yield collector
+    finally:
+        _collector.reset(token)
+
+
+def record_cache_lookup(hits, misses):
+    """
+    Counts cache hits and misses of the current request, if any.
+    """
+    collector = _collector.get()
+    if collector is not None:
+        collector.cache_hits += hits
+        collector.cache_misses += misses
+
+
+def _new_route_metrics():
+    return {
+        "requests": {},
+        "buckets": [0] * len(LATENCY_BUCKETS),
+        "latency_count": 0,
+        "latency_sum": 0.0,
+        "db_queries": 0,
+        "db_seconds": 0.0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "response_bytes": 0,
+    }
+
+
+def record_request(route, method, status_code, seconds, collector, response_bytes):
+    """
+    Adds a finished request to the metrics of its route.
+
+    Args:
+        route (str): The route label (the URL pattern's view name).
+        method (str): The HTTP method.
+        status_code (int): The response status code.
+        seconds (float): The request latency.
+        collector (RequestCollector): The request's query and cache counts.
+        response_bytes (int): The size of the response body.
+    """
+    with _lock:
+        metrics = _routes.get((route, method))
+        if metrics is None:
+            metrics = _routes[(route, method)] = _new_route_metrics()
+        requests = metrics["requests"]
+        requests[status_code] = requests.get(status_code, 0) + 1
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                metrics["buckets"][index] += 1
+                break
+        metrics["latency_count"] += 1
+        metrics["latency_sum"] += seconds
+        metrics["db_queries"] += collector.queries
+        metrics["db_seconds"] += collector.query_seconds
+        metrics["cache_hits"] += collector.cache_hits
+        metrics["cache_misses"] += collector.cache_misses
+        metrics["response_bytes"] += response_bytes
+
+
+def reset_metrics():
+    """
+    Forgets every recorded route metric of this process.
+    """
+    with _lock:
+        _routes.clear()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Exposition:
+    def __init__(self):
+        self.lines = []
+        self.worker = os.getpid()
+
+    def family(self, name, kind, help_text):
+        self.lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+        self.lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+
+    def sample(self, name, value, **labels):
+        labels = ",".join(
+            f'{label}="{_escape(label_value)}"'
+            for label, label_value in {"worker": self.worker, **labels}.items()
+        )
+        self.lines.append(f"{METRIC_PREFIX}_{name}{{{labels}}} {value}")
+
+    def render(self):
+        return "\n".join(self.lines) + "\n"
+
+
+def render_prometheus_metrics():
+    """
+    Returns this worker's metrics in the Prometheus text exposition format.
+    """
+    with _lock:
+        routes = copy.deepcopy(_routes)
+    out = _Exposition()
+
+    out.family("http_requests_total", "counter", "Requests by route and status.")
+    for (route, method), metrics in routes.items():
+        for status_code, count in sorted(metrics["requests"].items()):
+            out.sample(
+                "http_requests_total",
+                count,
+                route=route,
+                method=method,
+                status=status_code,
+            )
+
+    name = "http_request_duration_seconds"
+    out.family(name, "histogram", "Request latency by route.")
+    for (route, method), metrics in routes.items():
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, metrics["buckets"]):
+            cumulative += count
+            out.sample(
+                f"{name}_bucket", cumulative, route=route, method=method, le=bound
+            )
+        count = metrics["latency_count"]
+        out.sample(f"{name}_bucket", count, route=route, method=method, le="+Inf")
+        out.sample(f"{name}_sum", metrics["latency_sum"], route=route, method=method)
+        out.sample(f"{name}_count", count, route=route, method=method)
+
+    for name, key, help_text in ROUTE_COUNTERS:
+        out.family(name, "counter", help_text)
+        for (route, method), metrics in routes.items():
+            out.sample(name, metrics[key], route=route, method=method)
+
+    databases = get_db_connection_stats()["databases"]
+    name = "db_connections_opened_total"
+    out.family(name, "counter", "Database connections opened.")
+    for alias, stats in databases.items():
+        out.sample(name, stats["connections_opened"], database=alias)
+
+    pooled = {
+        alias: stats for alias, stats in databases.items() if stats["mode"] == "pool"
+    }
+    if pooled:
+        for name, key, kind, help_text in POOL_METRICS:
+            out.family(name, kind, help_text)
+            for alias, stats in pooled.items():
+                out.sample(name, stats[key], database=alias)
+
+    password_pool = get_password_pool_stats()
+    for name, key, kind, help_text in PASSWORD_POOL_METRICS:
+        out.family(name, kind, help_text)
+        out.sample(name, password_pool[key])
+
+    return out.render()
@@ -0,0 +1,149 @@
+"""
+Password hashing and verification in a bounded process pool.
+
+Password hashers are deliberately slow. Running them in the web workers lets a
+burst of logins or registrations saturate every worker's CPU and queue
+unrelated requests behind them. Hashing is instead sent to a small process pool,
+shared by the threads of a web worker. At most `PASSWORD_HASHING_MAX_PENDING`
+jobs may be queued or running at once; requests beyond that wait up to
+`PASSWORD_HASHING_QUEUE_TIMEOUT` seconds for a slot and then fail with 503.
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUEUE_WARNING_SECONDS = 1
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The server is busy, please try again shortly."
+    default_code = "password_hashing_busy"
+
+
+_lock = threading.Lock()
+_executor = None
+_slots = None
+_stats = {
+    "submitted": 0,
+    "completed": 0,
+    "rejected": 0,
+    "in_flight": 0,
+    "queue_seconds_total": 0.0,
+    "queue_seconds_max": 0.0,
+    "run_seconds_total": 0.0,
+}
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def _run_timed(func, *args):
+    started_at = time.time()
+    result = func(*args)
+    return result, started_at, time.time() - started_at
+
+
+def _get_executor():
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            _slots = threading.BoundedSemaphore(settings.PASSWORD_HASHING_MAX_PENDING)
+        return _executor, _slots
+
+
+def _reset_executor(executor):
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def _record(name, value):
+    with _lock:
+        _stats[name] += value
+
+
+def _submit(func, *args):
+    if settings.PASSWORD_HASHING_WORKERS <= 0:
+        return func(*args)
+
+    executor, slots = _get_executor()
+    requested_at = time.time()
+    if not slots.acquire(timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT):
+        _record("rejected", 1)
+        logger.warning("Password hashing pool is full; rejecting request.")
+        raise PasswordHashingBusy()
+
+    with _lock:
+        _stats["submitted"] += 1
+        _stats["in_flight"] += 1
+    try:
+        future = executor.submit(_run_timed, func, *args)
+        result, started_at, run_seconds = future.result()
+    except BrokenProcessPool:
+        logger.exception("Password hashing pool broke; it will be restarted.")
+        _reset_executor(executor)
+        raise PasswordHashingBusy()
+    finally:
+        slots.release()
+        _record("in_flight", -1)
+
+    # Time spent waiting for a free slot and then for a free worker process.
+    queue_seconds = max(0.0, started_at - requested_at)
+    with _lock:
+        _stats["completed"] += 1
+        _stats["queue_seconds_total"] += queue_seconds
+        _stats["queue_seconds_max"] = max(_stats["queue_seconds_max"], queue_seconds)
+        _stats["run_seconds_total"] += run_seconds
+    if queue_seconds > SLOW_QUEUE_WARNING_SECONDS:
+        logger.warning("Password hashing job waited %.2fs in queue.", queue_seconds)
+    return result
+
+
+def hash_password(password):
+    """
+    Returns the encoded hash of a raw password, computed in the hashing pool.
+    """
+    return _submit(make_password, password)
+
+
+def verify_password(password, encoded):
+    """
+    Returns True if the raw password matches the encoded hash, checked in the
+    hashing pool.
+    """
+    return _submit(check_password, password, encoded)
+
+
+def get_password_pool_stats():
+    """
+    Returns counters of the hashing pool of this process.
+
+    Returns:
+        dict: Jobs submitted, completed, rejected and in flight (queued or
+        running), the total and maximum seconds jobs waited in the queue, and
+        the total seconds spent hashing.
+    """
+    with _lock:
+        return dict(_stats)
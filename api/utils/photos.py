@@ -0,0 +1,334 @@
+"""
+Asynchronous processing of uploaded profile photos and ID cards.
+
+Uploads are written to a local staging directory and the request returns
+without touching the media storage. Once the request's transaction commits, a
+process pool opens the staged image with Pillow, drops its EXIF metadata
+(applying the EXIF orientation first) and renders fixed-size WebP variants.
+The variants are then saved to the media storage next to each other:
+
+    candidate_profile_photos/<uuid>.webp          full size, at most 1024px
+    candidate_profile_photos/<uuid>_small.webp    at most 320px
+    candidate_profile_photos/<uuid>_thumb.webp    128px square
+
+and the model field is pointed at the full size variant, and the photo it
+replaces is deleted with its variants. List and dashboard views serve the small
+variant through `photo_variant_url`.
+
+Images uploaded directly to the media storage (see `direct_uploads`) never
+pass through the web workers: only their key is sent to the pool, whose worker
+downloads the object, stages and deletes it, and processes it the same way.
+"""
+
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+
+from .media_urls import resolve_media_url
+
+logger = logging.getLogger(__name__)
+
+PHOTO_VARIANTS = {
+    "": {"size": (1024, 1024), "crop": False},
+    "small": {"size": (320, 320), "crop": False},
+    "thumb": {"size": (128, 128), "crop": True},
+}
+PHOTO_FORMAT = "WEBP"
+PHOTO_QUALITY = 82
+
+_lock = threading.Lock()
+_executor = None
+
+
+def _staging_dir():
+    path = Path(settings.PHOTO_STAGING_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def stage_photo(upload):
+    """
+    Writes an uploaded image to the local staging directory.
+
+    Args:
+        upload (File): The uploaded image, or an image opened from a storage.
+
+    Returns:
+        str: Path of the staged file.
+    """
+    path = _staging_dir() / f"{uuid.uuid4().hex}{Path(upload.name).suffix.lower()}"
+    with open(path, "wb") as staged:
+        for chunk in upload.chunks():
+            staged.write(chunk)
+    return str(path)
+
+
+def render_photo_variants(staged_path):
+    """
+    Renders the WebP variants of a staged image, without EXIF metadata.
+
+    Runs in the photo processing pool, so it must only depend on Pillow.
+
+    Args:
+        staged_path (str): Path of the staged image.
+
+    Returns:
+        dict[str, bytes]: Encoded images keyed by variant name ("" is full size).
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(staged_path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        variants = {}
+        for name, spec in PHOTO_VARIANTS.items():
+            if spec["crop"]:
+                variant = ImageOps.fit(image, spec["size"], Image.Resampling.LANCZOS)
+            else:
+                variant = image.copy()
+                variant.thumbnail(spec["size"], Image.Resampling.LANCZOS)
+            # Metadata is only written when passed explicitly; clear it anyway.
+            variant.info = {}
+            output = io.BytesIO()
+            variant.save(output, PHOTO_FORMAT, quality=PHOTO_QUALITY)
+            variants[name] = output.getvalue()
+    return variants
+
+
+def get_photo_variant_name(name, variant):
+    """
+    Returns the storage name of a variant of a processed photo.
+
+    Photos that were not processed by this pipeline (such as the default photo)
+    have no variants, and their own name is returned.
+    """
+    root, ext = os.path.splitext(name)
+    if not variant or ext.lower() != f".{PHOTO_FORMAT.lower()}":
+        return name
+    return f"{root}_{variant}{ext}"
+
+
+def photo_variant_url(fieldfile, variant="small"):
+    """
+    Returns the URL of a variant of a photo, or None if there is no photo.
+    """
+    if not fieldfile:
+        return None
+    name = get_photo_variant_name(fieldfile.name, variant)
+    return resolve_media_url(fieldfile.storage, name)
+
+
+def delete_photo(storage, name):
+    """
+    Deletes a photo and its variants from the media storage.
+    """
+    for variant in PHOTO_VARIANTS:
+        variant_name = get_photo_variant_name(name, variant)
+        if variant_name == name and variant:
+            # Not processed by this pipeline, so it has no variants.
+            break
+        storage.delete(variant_name)
+
+
+def save_photo_variants(instance, field_name, variants):
+    """
+    Saves rendered variants to the media storage, points the model field at
+    the full size variant and deletes the photo it replaces (unless it is the
+    field's default).
+    """
+    field = instance._meta.get_field(field_name)
+    base = field.generate_filename(instance, f"{uuid.uuid4().hex}.webp")
+    storage = field.storage
+
+    name = storage.save(base, ContentFile(variants[""]))
+    for variant, content in variants.items():
+        if variant:
+            storage.save(get_photo_variant_name(name, variant), ContentFile(content))
+
+    queryset = type(instance).objects.filter(pk=instance.pk)
+    previous = queryset.values_list(field_name, flat=True).first()
+    queryset.update(**{field_name: name})
+    setattr(instance, field_name, name)
+    if previous and previous != field.default:
+        delete_photo(storage, previous)
+    return name
+
+
+def process_staged_photo(instance, field_name, staged_path):
+    """
+    Renders and saves the variants of a staged photo, then deletes the staged file.
+    """
+    try:
+        save_photo_variants(instance, field_name, render_photo_variants(staged_path))
+    finally:
+        Path(staged_path).unlink(missing_ok=True)
+
+
+def process_stored_photo(model_label, pk, field_name, name):
+    """
+    Downloads an image uploaded to the media storage, deletes it, and renders
+    and saves its variants for the profile it was uploaded for.
+
+    Args:
+        model_label (str): Label of the profile model (e.g. `api.Candidate`).
+        pk (int): Primary key of the profile.
+        field_name (str): Name of the image field (e.g. `profile_photo`).
+        name (str): Storage name of the uploaded image.
+    """
+    model = apps.get_model(model_label)
+    storage = model._meta.get_field(field_name).storage
+    with storage.open(name) as stored:
+        staged_path = stage_photo(stored)
+    storage.delete(name)
+    instance = model.objects.get(pk=pk)
+    process_staged_photo(instance, field_name, staged_path)
+
+
+def _process_stored_photo_in_pool(*args):
+    # Pool workers are long-lived; their connections are recycled like those
+    # of a request.
+    close_old_connections()
+    try:
+        process_stored_photo(*args)
+    finally:
+        close_old_connections()
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PHOTO_PROCESSING_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                # Stored photos are downloaded and saved by the workers.
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def _on_rendered(instance, field_name, staged_path):
+    def callback(future):
+        try:
+            save_photo_variants(instance, field_name, future.result())
+        except Exception:
+            logger.exception(
+                "Processing %s of %s %s failed.",
+                field_name,
+                type(instance).__name__,
+                instance.pk,
+            )
+        finally:
+            Path(staged_path).unlink(missing_ok=True)
+            close_old_connections()
+
+    return callback
+
+
+def schedule_photo_processing(instance, field_name, upload):
+    """
+    Stages an uploaded photo and processes it once the current transaction
+    commits.
+
+    With `PHOTO_PROCESSING_WORKERS` set to 0, the photo is processed in-process
+    on commit instead of in the pool.
+
+    Args:
+        instance (Model): The candidate or staff the photo belongs to.
+        field_name (str): Name of the image field (e.g. `profile_photo`).
+        upload (UploadedFile): The uploaded image.
+    """
+    staged_path = stage_photo(upload)
+
+    def submit():
+        if settings.PHOTO_PROCESSING_WORKERS <= 0:
+            process_staged_photo(instance, field_name, staged_path)
+            return
+        future = _get_executor().submit(render_photo_variants, staged_path)
+        future.add_done_callback(_on_rendered(instance, field_name, staged_path))
+
+    transaction.on_commit(submit)
+
+
+def _on_processed(instance, field_name):
+    def callback(future):
+        try:
+            future.result()
+        except Exception:
+            logger.exception(
+                "Processing %s of %s %s failed.",
+                field_name,
+                type(instance).__name__,
+                instance.pk,
+            )
+
+    return callback
+
+
+def schedule_stored_photo_processing(instance, field_name, name):
+    """
+    Processes an image uploaded to the media storage in the pool, once the
+    current transaction commits. The image is not read by this process.
+
+    With `PHOTO_PROCESSING_WORKERS` set to 0, the photo is processed in-process
+    on commit instead of in the pool.
+
+    Args:
+        instance (Model): The candidate or staff the photo belongs to.
+        field_name (str): Name of the image field (e.g. `profile_photo`).
+        name (str): Storage name of the uploaded image.
+    """
+    args = (instance._meta.label, instance.pk, field_name, name)
+
+    def submit():
+        if settings.PHOTO_PROCESSING_WORKERS <= 0:
+            process_stored_photo(*args)
+            return
+        future = _get_executor().submit(_process_stored_photo_in_pool, *args)
+        future.add_done_callback(_on_processed(instance, field_name))
+
+    transaction.on_commit(submit)
+
+
+class StagedPhotoMixin:
+    """
+    Serializer mixin sending uploaded photos to the processing pipeline instead
+    of saving them to the media storage during the request.
+    """
+
+    staged_photo_fields = ("profile_photo", "id_card")
+
+    def pop_photo_uploads(self, validated_data):
+        return {
+            name: validated_data.pop(name)
+            for name in self.staged_photo_fields
+            if validated_data.get(name)
+        }
+
+    def schedule_photo_uploads(self, instance, uploads):
+        for field_name, upload in uploads.items():
+            schedule_photo_processing(instance, field_name, upload)
+
+    def update(self, instance, validated_data):
+        uploads = self.pop_photo_uploads(validated_data)
+        instance = super().update(instance, validated_data)
+        self.schedule_photo_uploads(instance, uploads)
+        return instance
@@ -0,0 +1,173 @@
+"""
+Opt-in request profiling.
+
+A request is profiled with cProfile when it carries a valid signed
+`X-Profile-Request` header (see `issue_profiling_token`), or at random with
+probability `PROFILING_SAMPLE_RATE`. The functions with the highest cumulative
+time and the SQL queries of the request are stored in a ring buffer of
+`PROFILING_BUFFER_SIZE` profiles in the shared cache, so that profiles taken by
+any worker can be inspected through the staff endpoint or the
+`request_profiles` command.
+"""
+
+import cProfile
+import pstats
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+
+PROFILING_HEADER = "X-Profile-Request"
+PROFILING_TOKEN_SALT = "api.profiling"
+PROFILING_TOKEN_MAX_AGE = getattr(settings, "PROFILING_TOKEN_MAX_AGE", 60 * 60)
+PROFILING_BUFFER_SIZE = getattr(settings, "PROFILING_BUFFER_SIZE", 50)
+PROFILING_RETENTION = getattr(settings, "PROFILING_RETENTION", 60 * 60 * 24)
+PROFILING_TOP_N = getattr(settings, "PROFILING_TOP_N", 30)
+PROFILING_MAX_QUERIES = 500
+PROFILING_MAX_SQL_LENGTH = 2000
+
+_COUNTER_KEY = "request-profile:counter"
+
+
+def _slot_key(slot):
+    return f"request-profile:slot:{slot}"
+
+
+def issue_profiling_token(user):
+    """
+    Returns a signed value for the `X-Profile-Request` header, valid for
+    `PROFILING_TOKEN_MAX_AGE` seconds.
+    """
+    return signing.TimestampSigner(salt=PROFILING_TOKEN_SALT).sign(str(user.pk))
+
+
+def get_profiling_trigger(request):
+    """
+    Decides whether to profile a request.
+
+    Returns:
+        str | None: "header" for a valid signed header, "sample" if the request
+        was sampled, or None if it should not be profiled.
+    """
+    token = request.headers.get(PROFILING_HEADER)
+    if token:
+        try:
+            signing.TimestampSigner(salt=PROFILING_TOKEN_SALT).unsign(
+                token, max_age=PROFILING_TOKEN_MAX_AGE
+            )
+        except signing.BadSignature:
+            pass
+        else:
+            return "header"
+    sample_rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0)
+    if sample_rate and random.random() < sample_rate:
+        return "sample"
+    return None
+
+
+class _QueryRecorder:
+    def __init__(self):
+        self.queries = []
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            if len(self.queries) < PROFILING_MAX_QUERIES:
+                self.queries.append(
+                    {
+                        "sql": sql[:PROFILING_MAX_SQL_LENGTH],
+                        "ms": round((time.perf_counter() - started) * 1000, 3),
+                    }
+                )
+
+
+def _top_functions(profiler):
+    stats = pstats.Stats(profiler).stats
+    ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+    return [
+        {
+            "function": pstats.func_std_string(func),
+            "calls": calls,
+            "total_ms": round(total * 1000, 3),
+            "cumulative_ms": round(cumulative * 1000, 3),
+        }
+        for func, (_, calls, total, cumulative, _) in ranked[:PROFILING_TOP_N]
+    ]
+
+
+def profile_request(request, get_response, trigger):
+    """
+    Runs a request under cProfile and stores its profile.
+
+    Args:
+        request (HttpRequest): The request to profile.
+        get_response (callable): The next middleware or view.
+        trigger (str): Why the request is profiled ("header" or "sample").
+
+    Returns:
+        HttpResponse: The response of the request.
+    """
+    recorder = _QueryRecorder()
+    profiler = cProfile.Profile()
+    started_at = timezone.now()
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        profiler.enable()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+    duration = time.perf_counter() - started
+
+    match = request.resolver_match
+    store_profile(
+        {
+            "route": match.view_name if match else "unmatched",
+            "path": request.path,
+            "method": request.method,
+            "status": response.status_code,
+            "trigger": trigger,
+            "started_at": started_at.isoformat(),
+            "duration_ms": round(duration * 1000, 3),
+            "query_count": recorder.count,
+            "functions": _top_functions(profiler),
+            "queries": recorder.queries,
+        }
+    )
+    return response
+
+
+def store_profile(profile):
+    """
+    Adds a profile to the ring buffer, overwriting the oldest one when full.
+    """
+    try:
+        profile_id = cache.incr(_COUNTER_KEY)
+    except ValueError:
+        cache.add(_COUNTER_KEY, 0, timeout=None)
+        profile_id = cache.incr(_COUNTER_KEY)
+    profile["id"] = profile_id
+    cache.set(
+        _slot_key(profile_id % PROFILING_BUFFER_SIZE), profile, PROFILING_RETENTION
+    )
+    return profile
+
+
+def get_profiles():
+    """
+    Returns the profiles in the ring buffer, newest first.
+    """
+    keys = [_slot_key(slot) for slot in range(PROFILING_BUFFER_SIZE)]
+    profiles = cache.get_many(keys).values()
+    return sorted(profiles, key=lambda profile: profile["id"], reverse=True)
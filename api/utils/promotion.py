@@ -0,0 +1,105 @@
+"""
+Utility functions for promoting candidates to the next competition stage in bulk.
+
+The qualifying set is ranked and filtered entirely in the database, and the role
+change is applied with a single UPDATE.
+"""
+
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+
+from ..models import Candidate, CandidateScore
+from .cache_utils import invalidate_standings
+
+NEXT_ROLE = {
+    "screening": "league",
+    "league": "final",
+    "final": "winner",
+}
+
+
+def get_qualifying_candidates(from_role, exam=None, top_k=None, min_score=None):
+    """
+    Builds the ranked queryset of candidates qualifying for promotion.
+
+    Candidates are ranked by their score on `exam` when given, otherwise by the
+    total of their scores across all exams of the `from_role` stage.
+
+    Args:
+        from_role (str): The role candidates are promoted from.
+        exam (Exam, optional): Rank by the score on this exam only.
+        top_k (int, optional): Keep only the K best-ranked candidates.
+        min_score (Decimal, optional): Keep only candidates scoring at least this much.
+
+    Returns:
+        QuerySet: Active candidates annotated with `ranking_score`, best first.
+    """
+    candidates = Candidate.candidates_by_role(from_role)
+
+    if exam is not None:
+        candidates = candidates.annotate(
+            ranking_score=Subquery(
+                CandidateScore.objects.filter(
+                    candidate=OuterRef("pk"), exam=exam
+                ).values("score")[:1]
+            )
+        )
+    else:
+        candidates = candidates.annotate(
+            ranking_score=Sum("scores__score", filter=Q(scores__exam__stage=from_role))
+        )
+
+    candidates = candidates.filter(ranking_score__isnull=False)
+    if min_score is not None:
+        candidates = candidates.filter(ranking_score__gte=min_score)
+
+    candidates = candidates.order_by("-ranking_score", "pk")
+    if top_k is not None:
+        candidates = candidates[:top_k]
+    return candidates
+
+
+def preview_promotion(qualifying):
+    """
+    Lists the candidates a promotion would affect, without changing anything.
+
+    Args:
+        qualifying (QuerySet): Queryset returned by `get_qualifying_candidates`.
+
+    Returns:
+        list[dict]: Rank, identity and ranking score of each qualifying candidate.
+    """
+    rows = qualifying.values(
+        "pk", "user__first_name", "user__last_name", "school", "ranking_score"
+    )
+    return [
+        {
+            "rank": rank,
+            "candidate_id": row["pk"],
+            "name": f"{row['user__first_name']} {row['user__last_name']}".strip(),
+            "school": row["school"],
+            "score": float(row["ranking_score"]),
+        }
+        for rank, row in enumerate(rows, 1)
+    ]
+
+
+def apply_promotion(qualifying, to_role):
+    """
+    Moves every qualifying candidate to `to_role` with a single UPDATE, then
+    invalidates cached standings and dashboards.
+
+    Args:
+        qualifying (QuerySet): Queryset returned by `get_qualifying_candidates`.
+        to_role (str): The role to assign.
+
+    Returns:
+        int: Number of candidates promoted.
+    """
+    with transaction.atomic():
+        promoted = Candidate.objects.filter(pk__in=qualifying.values("pk")).update(
+            role=to_role, date_updated=timezone.now()
+        )
+        transaction.on_commit(invalidate_standings)
+    return promoted
@@ -0,0 +1,116 @@
+"""
+Utility functions for importing question banks in bulk.
+
+Questions are deduplicated against the unique `Question.text_hash` index, created
+with `bulk_create`, and linked to an exam by bulk-inserting through-table rows.
+"""
+
+from django.db import transaction
+from rest_framework import serializers
+
+from ..models import Exam, Question
+from ..serializers import QuestionImportSerializer
+
+QUESTION_IMPORT_BATCH_SIZE = 500
+
+
+def validate_question_rows(rows):
+    """
+    Validates question rows and collapses duplicates within the upload.
+
+    Args:
+        rows (list[dict]): Uploaded rows, as returned by `get_upload_rows`.
+
+    Returns:
+        Tuple:
+            - questions (dict[str, dict]): Validated question data keyed by text hash.
+            - duplicates (int): Number of rows repeating an earlier row of the upload.
+            - errors (list[dict]): Per-row error reports (1-based row numbers).
+    """
+    validator = QuestionImportSerializer()
+    questions = {}
+    duplicates = 0
+    errors = []
+
+    for index, row in enumerate(rows, 1):
+        try:
+            data = validator.run_validation(row)
+        except serializers.ValidationError as e:
+            errors.append({"row": index, "errors": e.detail})
+            continue
+
+        text_hash = Question.build_text_hash(
+            data["text"],
+            data.get("option_a", ""),
+            data.get("option_b", ""),
+            data.get("option_c", ""),
+            data.get("option_d", ""),
+        )
+        if text_hash in questions:
+            duplicates += 1
+        else:
+            questions[text_hash] = data
+
+    return questions, duplicates, errors
+
+
+def import_questions(questions, staff=None, exam=None):
+    """
+    Creates the questions that do not exist yet and optionally links all of them
+    to an exam.
+
+    Args:
+        questions (dict[str, dict]): Validated question data keyed by text hash.
+        staff (Staff, optional): Recorded as the creator of new questions.
+        exam (Exam, optional): Exam to add every imported question to.
+
+    Returns:
+        dict: Number of questions created, already existing (including those
+        created meanwhile by a concurrent import), and newly linked to the exam.
+    """
+    hashes = list(questions)
+
+    with transaction.atomic():
+        existing = set(
+            Question.objects.filter(text_hash__in=hashes).values_list(
+                "text_hash", flat=True
+            )
+        )
+        new_questions = [
+            Question(text_hash=text_hash, created_by=staff, **data)
+            for text_hash, data in questions.items()
+            if text_hash not in existing
+        ]
+        # Conflicts can only come from a concurrent import of the same questions.
+        # With ignore_conflicts, bulk_create returns every object it was given,
+        # so what was inserted is counted in the table instead.
+        imported = Question.objects.filter(text_hash__in=hashes)
+        imported_before = imported.count()
+        Question.objects.bulk_create(
+            new_questions,
+            batch_size=QUESTION_IMPORT_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        question_ids = list(imported.values_list("pk", flat=True))
+        created = len(question_ids) - imported_before
+
+        linked = 0
+        if exam is not None:
+            through = Exam.questions.through
+            exam_links = through.objects.filter(exam_id=exam.pk)
+            linked_before = exam_links.count()
+            through.objects.bulk_create(
+                [
+                    through(exam_id=exam.pk, question_id=question_id)
+                    for question_id in question_ids
+                ],
+                batch_size=QUESTION_IMPORT_BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+            linked = exam_links.count() - linked_before
+
+    return {
+        "created": created,
+        "existing": len(questions) - created,
+        "linked": linked,
+    }
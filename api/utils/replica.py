@@ -0,0 +1,130 @@
+"""
+Routing of read-only traffic to the read replica.
+
+Queries go to the `default` (primary) database unless a view opts in with
+`replica_reads` (or `ReplicaReadsMixin` for generic views), or a block of code
+runs inside `use_replica`. Within those, `ReplicaRouter` sends reads to the
+`replica` database alias. Writes always go to the primary.
+
+Replicas lag behind the primary, so a user who has just written something
+(e.g. submitted exam answers) is pinned to the primary for
+`REPLICA_STICKY_SECONDS` and reads their own writes. Pinning is done by
+`ReplicaStickinessMiddleware` after every unsafe request of an authenticated
+user.
+
+Values written to the shared cache are seen by every user, including those
+pinned to the primary, so they are computed on the primary with `use_primary`
+even inside replica reads.
+
+When no `replica` database is configured, all of this is a no-op.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DATABASE = "replica"
+REPLICA_STICKY_SECONDS = getattr(settings, "REPLICA_STICKY_SECONDS", 15)
+
+_read_database = ContextVar("read_database", default=None)
+
+
+def _pin_key(user):
+    return f"replica-pin:{user.pk}"
+
+
+def get_replica_alias():
+    """
+    Returns the replica database alias, or None if no replica is configured.
+    """
+    return REPLICA_DATABASE if REPLICA_DATABASE in settings.DATABASES else None
+
+
+def get_read_database():
+    """
+    Returns the database alias reads are routed to, or None for the default.
+    """
+    return _read_database.get()
+
+
+def pin_to_primary(user):
+    """
+    Sends the user's reads to the primary for `REPLICA_STICKY_SECONDS`.
+    """
+    if user is not None and user.is_authenticated:
+        cache.set(_pin_key(user), True, REPLICA_STICKY_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    """
+    Returns True if the user wrote recently and must read from the primary.
+    """
+    if user is None or not user.is_authenticated:
+        return False
+    return cache.get(_pin_key(user), False)
+
+
+@contextmanager
+def use_replica(user=None):
+    """
+    Routes the reads made inside the block to the replica.
+
+    Reads stay on the primary if no replica is configured or if `user` is
+    pinned to the primary.
+
+    Args:
+        user (User | None): The user the reads are made for.
+    """
+    alias = get_replica_alias()
+    if alias is not None and is_pinned_to_primary(user):
+        alias = None
+    token = _read_database.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_database.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """
+    Routes the reads made inside the block to the primary, also within
+    `use_replica`. Used to compute values shared through the cache, which must
+    not be read from a lagging replica.
+    """
+    token = _read_database.set(None)
+    try:
+        yield
+    finally:
+        _read_database.reset(token)
+
+
+def replica_reads(view_func):
+    """
+    Routes the reads of a function based view's safe requests to the replica.
+
+    Must be applied below `@api_view` so that the request is authenticated.
+    """
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return view_func(request, *args, **kwargs)
+        with use_replica(request.user):
+            return view_func(request, *args, **kwargs)
+
+    return wrapper
+
+
+class ReplicaReadsMixin:
+    """
+    Generic view mixin routing the reads of GET requests to the replica.
+    """
+
+    def get(self, request, *args, **kwargs):
+        with use_replica(request.user):
+            return super().get(request, *args, **kwargs)
@@ -0,0 +1,107 @@
+"""
+Utility functions for validating and saving manually marked scores in bulk.
+"""
+
+from rest_framework import serializers
+
+from ..models import Candidate, CandidateScore
+
+SCORE_FIELD = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=0)
+
+BULK_SCORE_BATCH_SIZE = 1000
+
+
+def validate_score_rows(rows):
+    """
+    Validates uploaded score rows, checking every candidate ID in a single query.
+
+    Each row must provide a `candidate_id` and a `score`. Rows referencing unknown
+    candidates, repeating an earlier candidate, or carrying an invalid score are
+    reported rather than saved.
+
+    Args:
+        rows (list[dict]): Uploaded rows, as returned by `get_upload_rows`.
+
+    Returns:
+        Tuple:
+            - valid (dict[int, Decimal]): Validated scores keyed by candidate ID.
+            - errors (list[dict]): Per-row error reports (1-based row numbers).
+    """
+    parsed = []
+    errors = []
+
+    for index, row in enumerate(rows, 1):
+        row_errors = []
+        candidate_id = row.get("candidate_id")
+        score = row.get("score")
+
+        try:
+            candidate_id = int(candidate_id)
+        except (TypeError, ValueError):
+            row_errors.append("candidate_id must be an integer.")
+
+        if score in (None, ""):
+            row_errors.append("score is required.")
+        else:
+            try:
+                score = SCORE_FIELD.run_validation(score)
+            except serializers.ValidationError as e:
+                row_errors.extend(f"score: {message}" for message in e.detail)
+
+        if row_errors:
+            errors.append(
+                {"row": index, "candidate_id": row.get("candidate_id"), "errors": row_errors}
+            )
+        else:
+            parsed.append((index, candidate_id, score))
+
+    known_ids = set(
+        Candidate.objects.filter(
+            pk__in={candidate_id for _, candidate_id, _ in parsed}
+        ).values_list("pk", flat=True)
+    )
+
+    valid = {}
+    for index, candidate_id, score in parsed:
+        if candidate_id not in known_ids:
+            message = "Candidate does not exist."
+        elif candidate_id in valid:
+            message = "Duplicate candidate_id in upload."
+        else:
+            valid[candidate_id] = score
+            continue
+        errors.append({"row": index, "candidate_id": candidate_id, "errors": [message]})
+
+    errors.sort(key=lambda error: error["row"])
+    return valid, errors
+
+
+def upsert_scores(exam, scores, staff):
+    """
+    Creates or updates manual scores for an exam using a single upsert per batch.
+
+    Args:
+        exam (Exam): The exam the scores belong to.
+        scores (dict[int, Decimal]): Validated scores keyed by candidate ID.
+        staff (Staff): The staff member submitting the scores.
+
+    Returns:
+        int: Number of scores saved.
+    """
+    CandidateScore.objects.bulk_create(
+        [
+            CandidateScore(
+                candidate_id=candidate_id,
+                exam=exam,
+                score=score,
+                submitted_by=staff,
+                auto_score=False,
+            )
+            for candidate_id, score in scores.items()
+        ],
+        batch_size=BULK_SCORE_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["candidate", "exam"],
+        update_fields=["score", "submitted_by", "auto_score", "date_updated"],
+    )
+    return len(scores)
@@ -0,0 +1,171 @@
+"""
+Sparse fieldsets and expansion of read endpoints.
+
+Clients pick the fields of a response with `?fields=` and add optional ones
+with `?expand=`, both comma separated. Nested fields are addressed with dots:
+
+    GET /candidates/7/?fields=user.first_name,user.last_name,school
+    GET /exams/?fields=id,title&expand=created_by
+    GET /candidates/7/scores/?fields=score,exam.title&expand=submitted_by
+
+- `fields` keeps only the listed fields. A nested serializer listed by name is
+  kept whole, one listed through its fields (`user.first_name`) is pruned in
+  turn. Unknown names are ignored.
+- `expand` adds fields a serializer declares in `expandable_fields`, which are
+  left out of the response by default. Expanded fields are always kept.
+
+Fields that are not kept are never computed: method fields are not called and
+`prune_queryset` restricts the columns and joins the query fetches. Selections
+only apply to GET requests; a write is validated against every field.
+"""
+
+import copy
+
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def parse_paths(value):
+    """
+    Returns the set of dotted field paths of a comma separated parameter.
+    """
+    return frozenset(path.strip() for path in value.split(",") if path.strip())
+
+
+def get_field_selection(context):
+    """
+    Returns the fields and expansions requested for a serializer context.
+
+    The selection is taken from `context["field_selection"]` if present, else
+    from the query parameters of `context["request"]` on GET requests.
+
+    Returns:
+        tuple: The requested field paths (None for every field) and the
+        expanded field paths.
+    """
+    if "field_selection" in context:
+        return context["field_selection"]
+    request = context.get("request")
+    if request is None or request.method not in ("GET", "HEAD"):
+        return None, frozenset()
+    params = request.query_params
+    fields = parse_paths(params.get(FIELDS_PARAM, ""))
+    expand = parse_paths(params.get(EXPAND_PARAM, ""))
+    return fields or None, expand
+
+
+def is_requested(selection, name):
+    """
+    Returns True if the top level field `name` is part of `selection`.
+    """
+    fields, expand = selection
+    return (
+        fields is None
+        or name in expand
+        or any(path.split(".", 1)[0] == name for path in fields)
+    )
+
+
+def _kept_names(fields, expand, path):
+    """
+    Returns the names of the fields kept by a serializer at `path`, or None if
+    all are kept.
+    """
+    if fields is None:
+        return None
+    requested = fields | expand
+    names = path.split(".")
+    ancestors = {".".join(names[:depth]) for depth in range(1, len(names) + 1)}
+    if ancestors & requested:
+        # This serializer, or one it is nested in, is requested whole.
+        return None
+    prefix = f"{path}." if path else ""
+    return {
+        requested_path[len(prefix) :].split(".", 1)[0]
+        for requested_path in requested
+        if requested_path.startswith(prefix)
+    }
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin applying the `fields` and `expand` selection of the
+    request (see `get_field_selection`), including when nested.
+    """
+
+    # Optional fields added on `?expand=`, by name.
+    expandable_fields = {}
+
+    @property
+    def field_path(self):
+        """
+        Returns the dotted path of this serializer from the root serializer.
+        """
+        names = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return ".".join(reversed(names))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested, expand = get_field_selection(self.context)
+        path = self.field_path
+        prefix = f"{path}." if path else ""
+        for name, field in self.expandable_fields.items():
+            if prefix + name in expand:
+                fields[name] = copy.deepcopy(field)
+
+        kept = _kept_names(requested, expand, path)
+        if kept is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in kept}
+
+
+def prune_queryset(queryset, serializer):
+    """
+    Restricts `queryset` to the columns read by the fields of `serializer`
+    with `only()`, joining nested serializers with `select_related()`.
+
+    Method fields are assumed to run their own queries from the primary key,
+    which `only()` always loads. Fields reading the whole object
+    (`source="*"`) disable the column restriction.
+
+    Args:
+        queryset (QuerySet): Queryset of the serialized model.
+        serializer (Serializer): Serializer instance, with its context.
+
+    Returns:
+        QuerySet: The pruned queryset.
+    """
+    columns, related = [], []
+
+    def collect(serializer, prefix):
+        for field in serializer.fields.values():
+            if field.write_only or isinstance(
+                field, (serializers.SerializerMethodField, ManyRelatedField)
+            ):
+                continue
+            if field.source == "*":
+                return False
+            if isinstance(field, serializers.ListSerializer):
+                continue
+            lookup = prefix + "__".join(field.source_attrs)
+            columns.append(lookup)
+            if isinstance(field, serializers.BaseSerializer):
+                related.append(lookup)
+                if not collect(field, lookup + "__"):
+                    return False
+        return True
+
+    restricted = collect(serializer, "")
+    if related:
+        queryset = queryset.select_related(*related)
+    if restricted:
+        queryset = queryset.only(*columns)
+    return queryset
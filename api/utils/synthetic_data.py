@@ -0,0 +1,279 @@
+"""
+Generation of large, reproducible synthetic datasets.
+
+Used by the `populate_db` command to build production-like volumes (hundreds
+of thousands of candidates, millions of answers) for performance work. Rows
+are inserted with `bulk_create` in batches and every password is the same
+pre-computed hash, so generation is bound by the database rather than Python.
+All content derives from a single seed.
+
+Generated users share `SYNTHETIC_PREFIX` in their username so that a dataset
+can be removed again with `clear_synthetic_data`.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Candidate, CandidateAnswer, CandidateScore, Exam, Question, Staff
+
+User = get_user_model()
+
+SYNTHETIC_PREFIX = "synthetic"
+BATCH_SIZE = 5000
+
+FIRST_NAMES = (
+    "Ada Bola Chidi Dayo Efe Funmi Gbenga Halima Ife Jide Kemi Lola Musa Ngozi "
+    "Obi Sade Tunde Uche Yemi Zainab"
+).split()
+LAST_NAMES = (
+    "Adeyemi Bello Chukwu Danjuma Eze Fashola Garba Ibrahim Johnson Kalu Lawal "
+    "Mohammed Nwosu Okafor Peters Salami Usman Williams"
+).split()
+CANDIDATE_ROLES = (("screening", 70), ("league", 25), ("final", 4), ("winner", 1))
+STAFF_ROLES = (("owner", 1), ("admin", 4), ("moderator", 15), ("volunteer", 80))
+DIFFICULTIES = ("easy", "medium", "hard")
+OPTIONS = "ABCD"
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights)[0]
+
+
+def _user(rng, username, password):
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    return User(
+        username=username,
+        email=f"{username}@example.com",
+        first_name=first_name,
+        last_name=last_name,
+        password=password,
+    )
+
+
+def clear_synthetic_data():
+    """
+    Deletes every generated user, with their profiles, scores and answers, and
+    the questions and exams created by generated staff.
+    """
+    generated = {"created_by__user__username__startswith": SYNTHETIC_PREFIX}
+    candidates = {"candidate__user__username__startswith": SYNTHETIC_PREFIX}
+    with transaction.atomic():
+        # Answers are by far the largest table. Nothing references them and no
+        # signal listens to their deletion, so Django deletes them with a single
+        # query; deleting them first leaves the scores nothing to cascade to.
+        CandidateAnswer.objects.filter(
+            candidate_score__candidate__user__username__startswith=SYNTHETIC_PREFIX
+        ).delete()
+        CandidateScore.objects.filter(**candidates).delete()
+        Exam.objects.filter(**generated).delete()
+        Question.objects.filter(**generated).delete()
+        User.objects.filter(username__startswith=SYNTHETIC_PREFIX).delete()
+
+
+def synthetic_data_exists():
+    """
+    Returns True if a generated dataset is present.
+    """
+    return User.objects.filter(username__startswith=SYNTHETIC_PREFIX).exists()
+
+
+def generate_staff(rng, count, password):
+    """
+    Creates `count` staff members. Returns them.
+    """
+    users = User.objects.bulk_create(
+        [
+            _user(rng, f"{SYNTHETIC_PREFIX}-staff-{index:04d}", password)
+            for index in range(count)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    roles = ["owner"] + [_weighted(rng, STAFF_ROLES) for _ in users[1:]]
+    return Staff.objects.bulk_create(
+        [
+            Staff(user=user, role=role, occupation="Teacher", is_verified=True)
+            for user, role in zip(users, roles)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def generate_questions(rng, count, staff):
+    """
+    Creates `count` questions authored by moderators and admins. Returns them.
+    """
+    authors = [member for member in staff if member.role != "volunteer"] or staff
+    questions = []
+    for index in range(count):
+        a, b = rng.randint(2, 99), rng.randint(2, 99)
+        product = a * b
+        options = [
+            product,
+            product + rng.randint(1, 9),
+            product - rng.randint(1, 9),
+            product + 10 * rng.randint(1, 9),
+        ]
+        rng.shuffle(options)
+        question = Question(
+            text=f"Question {index + 1}: what is {a} x {b}?",
+            option_a=str(options[0]),
+            option_b=str(options[1]),
+            option_c=str(options[2]),
+            option_d=str(options[3]),
+            correct_answer=OPTIONS[options.index(product)],
+            difficulty=rng.choice(DIFFICULTIES),
+            created_by=rng.choice(authors),
+        )
+        # bulk_create skips save(), which computes the hash.
+        question.text_hash = Question.build_text_hash(
+            question.text,
+            question.option_a,
+            question.option_b,
+            question.option_c,
+            question.option_d,
+        )
+        questions.append(question)
+    return Question.objects.bulk_create(questions, batch_size=BATCH_SIZE)
+
+
+def generate_exams(rng, count, questions, questions_per_exam, staff):
+    """
+    Creates `count` exams spread over the past year, alternating between the
+    screening and league stages, each with a sample of the questions.
+
+    Returns:
+        list[tuple[Exam, list[Question]]]: The exams with their questions.
+    """
+    now = timezone.now()
+    authors = [member for member in staff if member.role in ("admin", "owner")]
+    exams = []
+    for index in range(count):
+        exam = Exam(
+            stage="screening" if index % 2 == 0 else "league",
+            title=f"Exam {index + 1}",
+            is_active=True,
+            exam_date=now - timedelta(days=rng.randint(1, 365)),
+            open_duration_hours=12,
+            created_by=rng.choice(authors),
+        )
+        # bulk_create skips save(), which sets the end of the open window.
+        exam.closes_at = exam.get_closes_at()
+        exams.append(exam)
+    exams = Exam.objects.bulk_create(exams, batch_size=BATCH_SIZE)
+
+    exam_questions = [
+        (exam, rng.sample(questions, min(questions_per_exam, len(questions))))
+        for exam in exams
+    ]
+    Through = Exam.questions.through
+    Through.objects.bulk_create(
+        [
+            Through(exam_id=exam.pk, question_id=question.pk)
+            for exam, sampled in exam_questions
+            for question in sampled
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    return exam_questions
+
+
+def _sit_exam(rng, skill, questions):
+    # Each question is answered correctly with probability `skill`, otherwise
+    # with a random (possibly still correct) option.
+    answers = []
+    correct = 0
+    for question in questions:
+        if rng.random() < skill:
+            option = question.correct_answer
+        else:
+            option = rng.choice(OPTIONS)
+        correct += option == question.correct_answer
+        answers.append((question, option))
+    score = round(100 * correct / len(questions), 2) if questions else 0
+    return answers, score
+
+
+def generate_candidates(
+    rng, count, password, exam_questions, exams_per_candidate, staff
+):
+    """
+    Creates `count` candidates in batches, each with scores and answers for up
+    to `exams_per_candidate` exams of their stage.
+
+    Candidates answer each question correctly with a probability drawn per
+    candidate, so scores are spread realistically.
+
+    Yields:
+        dict: Running totals of candidates, scores and answers after each batch.
+    """
+    schools = [f"{rng.choice(LAST_NAMES)} College {index}" for index in range(500)]
+    screening = [pair for pair in exam_questions if pair[0].stage == "screening"]
+    league = [pair for pair in exam_questions if pair[0].stage == "league"]
+    submitters = [member for member in staff if member.role != "volunteer"] or staff
+    totals = {"candidates": 0, "scores": 0, "answers": 0}
+
+    for start in range(0, count, BATCH_SIZE):
+        size = min(BATCH_SIZE, count - start)
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                [
+                    _user(rng, f"{SYNTHETIC_PREFIX}-candidate-{index:07d}", password)
+                    for index in range(start, start + size)
+                ]
+            )
+            candidates = Candidate.objects.bulk_create(
+                [
+                    Candidate(
+                        user=user,
+                        school=rng.choice(schools),
+                        phone=f"080{rng.randint(10000000, 99999999)}",
+                        role=_weighted(rng, CANDIDATE_ROLES),
+                        is_verified=rng.random() < 0.8,
+                    )
+                    for user in users
+                ]
+            )
+
+            scores = []
+            answer_sets = []
+            for candidate in candidates:
+                eligible = screening + (league if candidate.role != "screening" else [])
+                skill = rng.betavariate(4, 3)
+                sat = rng.sample(eligible, min(exams_per_candidate, len(eligible)))
+                for exam, questions in sat:
+                    answers, score = _sit_exam(rng, skill, questions)
+                    minutes = rng.randint(5, 60)
+                    submitted_at = exam.exam_date + timedelta(minutes=minutes)
+                    scores.append(
+                        CandidateScore(
+                            candidate=candidate,
+                            exam=exam,
+                            score=score,
+                            auto_score=True,
+                            submitted_at=submitted_at,
+                            submitted_by=rng.choice(submitters),
+                        )
+                    )
+                    answer_sets.append(answers)
+
+            scores = CandidateScore.objects.bulk_create(scores, batch_size=BATCH_SIZE)
+            answers = CandidateAnswer.objects.bulk_create(
+                [
+                    CandidateAnswer(
+                        candidate_score=score, question=question, selected_option=option
+                    )
+                    for score, answer_set in zip(scores, answer_sets)
+                    for question, option in answer_set
+                ],
+                batch_size=BATCH_SIZE,
+            )
+
+        totals["candidates"] += len(candidates)
+        totals["scores"] += len(scores)
+        totals["answers"] += len(answers)
+        yield dict(totals)
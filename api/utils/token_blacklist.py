@@ -0,0 +1,129 @@
+"""
+Bloom filter in front of the refresh token blacklist.
+
+With refresh token rotation, every refresh and logout checks the blacklist
+table. Each process keeps a Bloom filter of blacklisted token IDs, rebuilt from
+the database periodically. A token the filter has not seen cannot have been
+blacklisted before the last rebuild, so the database lookup is skipped unless it
+was blacklisted since, which is recorded in the shared cache.
+"""
+
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+BLACKLIST_FILTER_REBUILD_SECONDS = getattr(
+    settings, "BLACKLIST_FILTER_REBUILD_SECONDS", 60 * 5
+)
+BLACKLIST_FILTER_ERROR_RATE = 0.01
+BLACKLIST_FILTER_MIN_CAPACITY = 1024
+
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter of strings.
+
+    Membership tests may return false positives, at about `error_rate` while no
+    more than `capacity` items are added, but never false negatives.
+    """
+
+    def __init__(self, capacity, error_rate=BLACKLIST_FILTER_ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+_lock = threading.Lock()
+_filter = None
+_built_at = 0.0
+
+
+def _recent_key(jti):
+    return f"token-blacklisted:{jti}"
+
+
+def rebuild_blacklist_filter():
+    """
+    Rebuilds this process's Bloom filter from the unexpired blacklisted tokens.
+    """
+    global _filter, _built_at
+
+    built_at = time.monotonic()
+    jtis = BlacklistedToken.objects.filter(
+        token__expires_at__gt=timezone.now()
+    ).values_list("token__jti", flat=True)
+    jtis = list(jtis.iterator())
+
+    bloom = BloomFilter(max(len(jtis) * 2, BLACKLIST_FILTER_MIN_CAPACITY))
+    for jti in jtis:
+        bloom.add(jti)
+
+    with _lock:
+        _filter, _built_at = bloom, built_at
+    return bloom
+
+
+def get_blacklist_filter():
+    """
+    Returns this process's Bloom filter, rebuilding it if it is missing or stale.
+    """
+    age = time.monotonic() - _built_at
+    if _filter is None or age > BLACKLIST_FILTER_REBUILD_SECONDS:
+        return rebuild_blacklist_filter()
+    return _filter
+
+
+def record_blacklisted(jti):
+    """
+    Adds a newly blacklisted token ID to the filter of this process, and to the
+    shared cache until every other process has rebuilt its filter.
+    """
+    get_blacklist_filter().add(jti)
+    cache.set(_recent_key(jti), True, BLACKLIST_FILTER_REBUILD_SECONDS * 2)
+
+
+def may_be_blacklisted(jti):
+    """
+    Returns False only if the token ID is definitely not blacklisted.
+    """
+    return jti in get_blacklist_filter() or bool(cache.get(_recent_key(jti)))
+
+
+class FilteredRefreshToken(RefreshToken):
+    """
+    Refresh token that checks the Bloom filter before the blacklist table.
+    """
+
+    def check_blacklist(self):
+        if may_be_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        record_blacklisted(self.payload[api_settings.JTI_CLAIM])
+        return result
@@ -0,0 +1,79 @@
+"""
+Utility functions for reading bulk uploads sent either as JSON or as a CSV file.
+"""
+
+import csv
+import io
+
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def read_csv_rows(upload):
+    """
+    Reads an uploaded CSV file into a list of dictionaries keyed by the header row.
+
+    Args:
+        upload (UploadedFile): The uploaded CSV file.
+
+    Returns:
+        list[dict]: One dictionary per data row, with surrounding whitespace stripped.
+    """
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    try:
+        return [
+            {
+                (key or "").strip(): (value or "").strip()
+                for key, value in row.items()
+            }
+            for row in csv.DictReader(text)
+        ]
+    finally:
+        text.detach()
+
+
+def get_upload_rows(request, list_key):
+    """
+    Extracts the rows of a bulk upload from the request.
+
+    Accepted formats:
+        - multipart upload with a CSV file in the `file` field
+        - a JSON array of objects
+        - a JSON object holding the array under `list_key`
+
+    Args:
+        request (Request): The DRF request object.
+        list_key (str): Key holding the rows when a JSON object is sent.
+
+    Returns:
+        Tuple:
+            - rows (list[dict] | None): The uploaded rows if readable, else None.
+            - error_response (Response | None): An error Response if the upload is unreadable, else None.
+    """
+    upload = request.FILES.get("file")
+    if upload is not None:
+        try:
+            rows = read_csv_rows(upload)
+        except (UnicodeDecodeError, csv.Error):
+            return None, Response(
+                {"error": "Uploaded file is not a valid UTF-8 CSV file."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+    else:
+        rows = request.data
+        if isinstance(rows, dict):
+            rows = rows.get(list_key)
+
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        return None, Response(
+            {
+                "error": f"Expected a JSON array, a `{list_key}` array, or a CSV `file` upload."
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if not rows:
+        return None, Response(
+            {"error": "At least one row must be provided."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return rows, None
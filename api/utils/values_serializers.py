@@ -0,0 +1,163 @@
+"""
+Read-only serialization of querysets through `values_list()`.
+
+A DRF serializer instantiates a model object per row, then walks every field
+of every (nested) serializer per row. For large list pages that machinery is
+most of the response time. `ValuesSerializer` produces the same output from
+plain rows instead:
+
+- It is compiled once from an existing serializer class. Every readable field
+  becomes a column lookup (`user__username` for the `username` of a nested
+  `user` serializer) and the bound `to_representation` of that field, so the
+  formatting of dates, decimals and choices is the serializer's own.
+- `SerializerMethodField`s have no column; each needs a query expression
+  computing the same value (e.g. a `Count` for a `question_count`).
+- Only the columns of the serializer are fetched, joined in a single query.
+
+Supported serializers are those of plain fields and nested single-object
+serializers. File fields, `source="*"` and many-relations are rejected when
+compiling.
+
+Given the request, the `?fields=` / `?expand=` selection of serializers using
+`SparseFieldsMixin` is honoured: a serializer is compiled once per selection,
+and only the columns of the selected fields are fetched.
+"""
+
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField
+from rest_framework.response import Response
+
+from .sparse_fields import get_field_selection
+
+
+class ValuesSerializer:
+    """
+    Serializes querysets like `serializer_class`, from `values_list()` rows.
+
+    Args:
+        serializer_class (type): The serializer whose output is reproduced.
+        expressions (dict): Query expression per method field, keyed by the
+            dotted path of the field (e.g. `"exam.question_count"`).
+    """
+
+    def __init__(self, serializer_class, expressions=None):
+        self.serializer_class = serializer_class
+        self.expressions = expressions or {}
+        # Compiled once per field selection. Selections come from clients,
+        # hence the bound.
+        self._compile = lru_cache(maxsize=64)(self._compile)
+
+    def _compiled(self, request):
+        context = {"request": request} if request is not None else {}
+        return self._compile(get_field_selection(context))
+
+    def _compile(self, selection):
+        lookups, annotations = [], {}
+
+        def compile_fields(serializer, prefix, path):
+            mappers = []
+            for field in serializer.fields.values():
+                if field.write_only:
+                    continue
+                name = field.field_name
+                if isinstance(field, serializers.SerializerMethodField):
+                    if path + name not in self.expressions:
+                        raise ImproperlyConfigured(
+                            f"{self.serializer_class.__name__}: no expression "
+                            f"for the method field '{path + name}'."
+                        )
+                    alias = f"_values_{len(annotations)}"
+                    annotations[alias] = self.expressions[path + name]
+                    lookups.append(alias)
+                    mappers.append((name, len(lookups) - 1, None))
+                    continue
+                if field.source == "*" or isinstance(
+                    field,
+                    (
+                        serializers.ListSerializer,
+                        ManyRelatedField,
+                        serializers.FileField,
+                    ),
+                ):
+                    raise ImproperlyConfigured(
+                        f"{self.serializer_class.__name__}: the field "
+                        f"'{path + name}' cannot be read from values."
+                    )
+                lookup = prefix + "__".join(field.source_attrs)
+                lookups.append(lookup)
+                if isinstance(field, serializers.BaseSerializer):
+                    # The relation column is None when there is no object.
+                    children = compile_fields(field, lookup + "__", f"{path}{name}.")
+                    mappers.append((name, len(lookups) - 1, children))
+                else:
+                    mappers.append((name, len(lookups) - 1, field.to_representation))
+            return mappers
+
+        serializer = self.serializer_class(context={"field_selection": selection})
+        mappers = compile_fields(serializer, "", "")
+        return lookups, annotations, mappers
+
+    def values(self, queryset, request=None):
+        """
+        Returns the rows of `queryset` holding the columns of the serializer
+        (of the fields selected by `request`).
+        """
+        lookups, annotations, _ = self._compiled(request)
+        if annotations:
+            if queryset.query.default_ordering and not queryset.query.order_by:
+                # Meta.ordering is not applied to queries with a GROUP BY.
+                queryset = queryset.order_by(*queryset.model._meta.ordering)
+            queryset = queryset.annotate(**annotations)
+        return queryset.values_list(*lookups)
+
+    def serialize(self, rows, request=None):
+        """
+        Serializes rows returned by `values` (or a page of them) for the same
+        request.
+
+        Returns:
+            list[dict]: The same data as `serializer_class(..., many=True)`.
+        """
+        mappers = self._compiled(request)[2]
+        return [_build(mappers, row) for row in rows]
+
+    def data(self, queryset, request=None):
+        """
+        Fetches and serializes `queryset`.
+        """
+        return self.serialize(self.values(queryset, request), request)
+
+
+def _build(mappers, row):
+    data = {}
+    for name, index, represent in mappers:
+        value = row[index]
+        if value is None:
+            data[name] = None
+        elif represent is None:
+            data[name] = value
+        elif type(represent) is list:
+            data[name] = _build(represent, row)
+        else:
+            data[name] = represent(value)
+    return data
+
+
+class ValuesListMixin:
+    """
+    List view mixin serializing the (paginated) queryset with
+    `values_serializer` instead of `serializer_class`.
+    """
+
+    values_serializer = None
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.values_serializer
+        rows = serializer.values(self.filter_queryset(self.get_queryset()), request)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page, request))
+        return Response(serializer.serialize(rows, request))
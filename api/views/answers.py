@@ -1,30 +1,105 @@
 """
-Docstring...
+API views for candidates answering exams: autosaving in-progress answers and
+submitting the final answers.
 """
 
-from django.utils import timezone
+from django.db import transaction
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
-from ..utils.helpers import auto_score
-from ..serializers import CandidateAnswerBulkSerializer
+from ..utils.exam_session import (
+    buffer_answers,
+    get_exam_meta,
+    get_exam_session,
+    is_session_expired,
+    submit_answers,
+)
+from ..utils.idempotency import (
+    get_idempotency_key,
+    get_stored_response,
+    store_response,
+)
+from ..serializers import AutosaveAnswersSerializer, CandidateAnswerBulkSerializer
 from ..permissions import IsCandidate
 from ..models import (
     Exam,
-    Question,
     CandidateScore,
-    CandidateAnswer,
 )
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsCandidate])
+def autosave_exam_answers(request, exam_id):
+    """
+    Candidate autosaves in-progress answers for an exam.
+
+    Accepts only the answers that changed since the last autosave. They are kept
+    in the cached exam session and written to the database in batches, and are
+    included automatically when the final answers are submitted. The candidate
+    must have started the exam, and not submitted it yet.
+    """
+    candidate = request.user.candidate
+    exam_meta = get_exam_meta(exam_id)
+    if exam_meta is None:
+        return Response(
+            {"error": "Invalid exam or candidate."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    if candidate.role != exam_meta["stage"]:
+        return Response({"detail": "Not allowed."}, status=status.HTTP_403_FORBIDDEN)
+
+    session = get_exam_session(candidate.pk, exam_id)
+    if session is None:
+        return Response(
+            {"message": "You have not started this exam."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if session["finalised"]:
+        return Response(
+            {"message": "You have already submitted answers for this exam."},
+            status=status.HTTP_409_CONFLICT,
+        )
+    if is_session_expired(session):
+        return Response(
+            {"message": "The time allowed for this exam has expired."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    serializer = AutosaveAnswersSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    answers = {
+        answer["question"]: answer["selected_option"]
+        for answer in serializer.validated_data["answers"]
+    }
+
+    unknown = sorted(set(answers) - exam_meta["question_ids"])
+    if unknown:
+        return Response(
+            {"error": "Questions do not belong to this exam.", "questions": unknown},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    flushed = buffer_answers(candidate.pk, exam_id, answers)
+
+    return Response(
+        {"message": "Answers saved.", "saved": len(answers), "flushed": flushed},
+        status=status.HTTP_200_OK,
+    )
+
+
 @api_view(["POST"])
 @permission_classes([IsAuthenticated, IsCandidate])
 def submit_exam_answers(request, exam_id):
     """
-    Candidate submits answers for an exam.
+    Candidate submits answers for an exam they have started, before its
+    deadline.
+
+    Requests may carry an `Idempotency-Key` header. A retry with the same key
+    returns the original response without the answers being validated or scored
+    again. The candidate's score row is locked while answers are submitted, so
+    concurrent retries wait for the first one and then return its response.
     """
     try:
         candidate = request.user.candidate
@@ -34,36 +109,62 @@ def submit_exam_answers(request, exam_id):
             {"error": "Invalid exam or candidate."}, status=status.HTTP_400_BAD_REQUEST
         )
 
-    candidate_score, _ = CandidateScore.objects.get_or_create(
-        candidate=candidate,
-        exam=exam,
-    )
+    key, error_response = get_idempotency_key(request)
+    if error_response:
+        return error_response
+    stored_response = get_stored_response(request, key)
+    if stored_response:
+        return stored_response
 
-    if CandidateAnswer.objects.filter(candidate_score=candidate_score).exists():
+    # Without a session there is no deadline to check the submission against.
+    if get_exam_session(candidate.pk, exam.pk) is None:
         return Response(
-            {"message": "You have already submitted answers for this exam."},
+            {"message": "You have not started this exam."},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    serializer = CandidateAnswerBulkSerializer(data=request.data)
-    serializer.is_valid(raise_exception=True)
-    answers_data = serializer.validated_data["answers"]
+    CandidateScore.objects.get_or_create(candidate=candidate, exam=exam)
+
+    with transaction.atomic():
+        candidate_score = CandidateScore.objects.select_for_update().get(
+            candidate=candidate, exam=exam
+        )
+
+        # A concurrent retry may have finished while this one waited for the lock.
+        stored_response = get_stored_response(request, key)
+        if stored_response:
+            return stored_response
+
+        if candidate_score.submitted_at is not None:
+            return Response(
+                {"message": "You have already submitted answers for this exam."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-    for answer_data in answers_data:
-        question_obj = answer_data["question"]
-        selected_option = answer_data["selected_option"]
+        if is_session_expired(get_exam_session(candidate.pk, exam.pk)):
+            return Response(
+                {"message": "The time allowed for this exam has expired."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        CandidateAnswer.objects.create(
-            candidate_score=candidate_score,
-            question=question_obj,
-            selected_option=selected_option,
+        serializer = CandidateAnswerBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        answers_data = serializer.validated_data["answers"]
+
+        submit_answers(
+            candidate_score,
+            {
+                answer_data["question"].pk: answer_data.get("selected_option", "")
+                for answer_data in answers_data
+            },
         )
 
-    auto_score(candidate_score)
+        response = Response(
+            {
+                "message": "Answers submitted!",
+            },
+            status=status.HTTP_200_OK,
+        )
+        store_response(request, key, response)
 
-    return Response(
-        {
-            "message": "Answers submitted!",
-        },
-        status=status.HTTP_200_OK,
-    )
+    return response
@@ -15,8 +15,9 @@ from rest_framework.reverse import reverse
 from rest_framework.throttling import AnonRateThrottle, SimpleRateThrottle
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_api_key.permissions import HasAPIKey # type: ignore
 
+from ..permissions import CachedHasAPIKey
+from ..utils.token_blacklist import FilteredRefreshToken
 from ..serializers import (
     UserSerializer,
 )
@@ -41,7 +42,7 @@ class LoginRateThrottle(SimpleRateThrottle):
         }
 
 @api_view(["POST"])
-@permission_classes([HasAPIKey])
+@permission_classes([CachedHasAPIKey])
 @throttle_classes([LoginRateThrottle])
 def login_api(request):
     """Authenticate user and return tokens + user info"""
@@ -123,7 +124,7 @@ def logout_api(request):
             )
 
         # Blacklist the refresh token
-        token = RefreshToken(refresh_token)
+        token = FilteredRefreshToken(refresh_token)
         token.blacklist()
 
         logger.info("User %s logged out successfully", request.user.username)
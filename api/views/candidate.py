@@ -18,10 +18,27 @@ from rest_framework.settings import api_settings
 
 from ..models import Candidate, CandidateScore
 from ..permissions import StaffWithRole
-from ..serializers import CandidateDetailSerializer, CandidateListSerializer
+from ..serializers import (
+    CandidateDetailSerializer,
+    CandidateListSerializer,
+    CandidatePromotionSerializer,
+)
+from ..utils.cache_utils import invalidate_standings
 from ..utils.user import validate_role
 from ..utils.query_filters import filter_candidates
+from ..utils.replica import ReplicaReadsMixin
+from ..utils.sparse_fields import (
+    get_field_selection,
+    is_requested,
+    prune_queryset,
+)
+from ..utils.values_serializers import ValuesListMixin, ValuesSerializer
 from ..utils.helpers import get_candidate_with_scores
+from ..utils.promotion import (
+    apply_promotion,
+    get_qualifying_candidates,
+    preview_promotion,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,12 +61,13 @@ def candidate_me_api(request):
         return Response({"error": "Not a candidate"}, status=status.HTTP_403_FORBIDDEN)
 
 
-class CandidateListView(ListAPIView):
+class CandidateListView(ReplicaReadsMixin, ValuesListMixin, ListAPIView):
     """
     List all candidates.
 
     Accessible by staff users with roles: moderator, admin, or owner.
-    Supports pagination and query param filtering.
+    Supports pagination and query param filtering. Rows are read with
+    `values_list()` and serialized like `CandidateListSerializer`.
     """
 
     permission_classes = [
@@ -57,6 +75,7 @@ class CandidateListView(ListAPIView):
         StaffWithRole(["moderator", "admin", "owner"]),
     ]
     serializer_class = CandidateListSerializer
+    values_serializer = ValuesSerializer(CandidateListSerializer)
     pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
 
     def get_queryset(self):
@@ -64,7 +83,8 @@ class CandidateListView(ListAPIView):
         Returns a filtered queryset of candidates based on request query parameters.
         """
         return filter_candidates(
-            Candidate.objects.all().order_by("-date_created"), self.request.query_params
+            Candidate.objects.order_by("-date_created"),
+            self.request.query_params,
         )
 
 
@@ -84,20 +104,35 @@ class CandidateDetailView(RetrieveUpdateDestroyAPIView):
         """
         Returns a queryset with prefetch optimization for candidate scores,
         including related exams and submitters.
+
+        On GET requests, the scores are only annotated and prefetched if the
+        total or average score is selected with `?fields=`, and the columns
+        are restricted to the selected fields.
         """
-        return Candidate.objects.with_scores().prefetch_related(
-            Prefetch(
-                "scores",
-                queryset=CandidateScore.objects.select_related("exam", "submitted_by"),
+        queryset = Candidate.objects.all()
+        selection = get_field_selection(self.get_serializer_context())
+        if is_requested(selection, "total_score") or is_requested(
+            selection, "average_score"
+        ):
+            queryset = Candidate.objects.with_scores().prefetch_related(
+                Prefetch(
+                    "scores",
+                    queryset=CandidateScore.objects.select_related(
+                        "exam", "submitted_by"
+                    ),
+                )
             )
-        )
+        if self.request.method == "GET":
+            queryset = prune_queryset(queryset, self.get_serializer())
+        return queryset
 
     def retrieve(self, request, *args, **kwargs):
         """
         Retrieves candidate profile along with detailed score information.
         """
         candidate = self.get_object()
-        return Response(get_candidate_with_scores(candidate))
+        selection = get_field_selection(self.get_serializer_context())
+        return Response(get_candidate_with_scores(candidate, selection))
 
     def perform_update(self, serializer) -> None:
         """
@@ -119,6 +154,7 @@ class CandidateDetailView(RetrieveUpdateDestroyAPIView):
         )
         instance.is_active = False
         instance.save()
+        invalidate_standings()
 
 
 class AssignCandidateRoleView(UpdateAPIView):
@@ -150,4 +186,65 @@ class AssignCandidateRoleView(UpdateAPIView):
 
         candidate.role = new_role
         candidate.save()
+        invalidate_standings()
         return Response(self.get_serializer(candidate).data)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, StaffWithRole(["owner", "admin"])])
+def promote_candidates_api(request):
+    """
+    Promote candidates of a stage to the next role in bulk.
+
+    Expected POST data:
+        - exam_id or stage: rank by one exam's score, or by total score in a stage.
+        - top_k and/or min_score: how many / which candidates qualify.
+        - to_role (optional): defaults to the role following the stage.
+        - dry_run (optional): preview the qualifying candidates without promoting.
+
+    Returns:
+        200 OK with the qualifying candidates (dry run) or the number promoted.
+        400 BAD REQUEST if the request is invalid.
+
+    Permissions:
+        - Only staff with 'owner' or 'admin' roles can promote candidates.
+    """
+    serializer = CandidatePromotionSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    options = serializer.validated_data
+
+    qualifying = get_qualifying_candidates(
+        options["from_role"],
+        exam=options.get("exam"),
+        top_k=options.get("top_k"),
+        min_score=options.get("min_score"),
+    )
+
+    if options["dry_run"]:
+        candidates = preview_promotion(qualifying)
+        return Response(
+            {
+                "dry_run": True,
+                "from_role": options["from_role"],
+                "to_role": options["to_role"],
+                "count": len(candidates),
+                "candidates": candidates,
+            }
+        )
+
+    promoted = apply_promotion(qualifying, options["to_role"])
+    logger.info(
+        "Promoted %s candidates from %s to %s",
+        promoted,
+        options["from_role"],
+        options["to_role"],
+        extra={"user": request.user.id},
+    )
+    return Response(
+        {
+            "dry_run": False,
+            "from_role": options["from_role"],
+            "to_role": options["to_role"],
+            "promoted": promoted,
+        }
+    )
@@ -22,12 +22,14 @@ from ..utils.dashboard_utils import (
     get_candidate_dashboard_data,
     get_staff_dashboard_data,
 )
+from ..utils.replica import replica_reads
 
 User = get_user_model()
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, IsCandidate])
+@replica_reads
 def candidate_dashboard_api(request):
     """
     Retrieve dashboard data for the currently authenticated candidate.
@@ -45,6 +47,7 @@ def candidate_dashboard_api(request):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, StaffWithRole(["moderator", "admin", "owner"])])
+@replica_reads
 def staff_dashboard_api(request):
     """
     Retrieve dashboard data for the currently authenticated staff member.
@@ -23,6 +23,12 @@ from ..serializers import (
 )
 from ..permissions import StaffWithRole, IsCandidate, IsLeagueCandidate
 from ..utils.query_filters import ExamFilter
+from ..utils.sparse_fields import prune_queryset
+from ..utils.exam_session import (
+    is_session_expired,
+    shuffle_questions,
+    start_exam_session,
+)
 
 
 class ExamListView(ListCreateAPIView):
@@ -50,8 +56,15 @@ class ExamListView(ListCreateAPIView):
         )
 
     def get_queryset(self):
-        """Returns a queryset of all Exam objects."""
-        return Exam.objects.all().order_by("-date_created")
+        """
+        Returns a queryset of all Exam objects, with their question counts
+        unless excluded with `?fields=`.
+        """
+        serializer = self.get_serializer()
+        queryset = Exam.objects.order_by("-date_created")
+        if "question_count" in serializer.fields:
+            queryset = queryset.with_question_count()
+        return prune_queryset(queryset, serializer)
 
     def perform_create(self, serializer):
         """
@@ -74,6 +87,15 @@ class ExamDetailView(RetrieveUpdateDestroyAPIView):
     queryset = Exam.objects.all().order_by("-date_created")
     lookup_url_kwarg = "exam_id"
 
+    def get_queryset(self):
+        """
+        Returns the exams, restricted to the fields selected with `?fields=`
+        on GET requests.
+        """
+        if self.request.method == "GET":
+            return prune_queryset(self.queryset, self.get_serializer())
+        return self.queryset
+
     def perform_destroy(self, instance):
         """
         Deletes the exam instance and returns a success message.
@@ -97,7 +119,9 @@ class ExamQuestionsView(ListAPIView):
         Returns the queryset of questions related to a given exam.
         """
         exam = get_object_or_404(Exam, pk=self.kwargs["exam_id"])
-        return exam.questions.all().order_by("-date_created")
+        return exam.questions.select_related("created_by__user").order_by(
+            "-date_created"
+        )
 
 
 class ExamHistoryView(ListAPIView):
@@ -138,5 +162,25 @@ def candidate_take_exam(request, exam_id):
     if candidate.role != exam.stage:
         return Response({"detail": "Not allowed."}, status=status.HTTP_403_FORBIDDEN)
 
-    serializer = CandidateExamSerializer(exam)
-    return Response(serializer.data)
+    if not Exam.objects.open_now(exam.stage).filter(pk=exam.pk).exists():
+        return Response(
+            {"detail": "This exam is not open."}, status=status.HTTP_403_FORBIDDEN
+        )
+
+    session = start_exam_session(candidate, exam)
+    if session["finalised"]:
+        return Response(
+            {"message": "You have already submitted answers for this exam."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if is_session_expired(session):
+        return Response(
+            {"message": "The time allowed for this exam has expired."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    data = CandidateExamSerializer(exam).data
+    data["questions"] = shuffle_questions(data["questions"], session["question_seed"])
+    data["started_at"] = session["started_at"]
+    data["deadline"] = session["deadline"]
+    return Response(data)
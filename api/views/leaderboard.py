@@ -13,6 +13,7 @@ from ..models import Candidate, LeaderboardSnapshot
 from ..serializers import MinimalCandidateSerializer
 from ..permissions import IsLeagueCandidateOrStaff, StaffWithRole
 from ..models import FeatureFlag
+from ..utils.replica import replica_reads, use_replica
 
 
 @api_view(["POST"])
@@ -22,20 +23,22 @@ def publish_leaderboard(request):
     Refreshes and publishes the leaderboard snapshot. Admin/Owner only.
     """
     staff = request.user.staff
-    league_candidates = (
-        Candidate.candidates_by_role("league")
-        .annotate(total_score=Sum("scores__score"))
-        .order_by("-total_score")
-    )
+    with use_replica(request.user):
+        league_candidates = (
+            Candidate.candidates_by_role("league")
+            .select_related("user")
+            .annotate(total_score=Sum("scores__score"))
+            .order_by("-total_score")
+        )
 
-    leaderboard = [
-        {
-            "rank": index + 1,
-            "candidate": MinimalCandidateSerializer(candidate).data,
-            "total_score": candidate.total_score or 0,
-        }
-        for index, candidate in enumerate(league_candidates)
-    ]
+        leaderboard = [
+            {
+                "rank": index + 1,
+                "candidate": MinimalCandidateSerializer(candidate).data,
+                "total_score": float(candidate.total_score or 0),
+            }
+            for index, candidate in enumerate(league_candidates)
+        ]
 
     snapshot = LeaderboardSnapshot.objects.create(
         data=leaderboard,
@@ -49,6 +52,7 @@ def publish_leaderboard(request):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, IsLeagueCandidateOrStaff])
+@replica_reads
 def load_leaderboard_api(request):
     """
     Returns the most recently published leaderboard snapshot.
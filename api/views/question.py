@@ -3,17 +3,22 @@ API views for managing exam questions, including listing, creation,
 retrieval, updating, and deletion.
 """
 
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 
-from ..models import Question
+from ..models import Exam, Question
+from ..parsers import FastJSONParser
 from ..serializers import QuestionListSerializer, QuestionDetailSerializer
 from ..permissions import StaffWithRole
+from ..utils.auth_helpers import get_staff_from_request
 from ..utils.pagination_helpers import paginate_queryset
 from ..utils.query_filters import filter_questions
+from ..utils.question_import import import_questions, validate_question_rows
+from ..utils.uploads import get_upload_rows
 
 
 @api_view(["GET", "POST"])
@@ -40,6 +45,64 @@ def question_list_api(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(["POST"])
+@parser_classes([FastJSONParser, MultiPartParser, FormParser])
+@permission_classes([IsAuthenticated, StaffWithRole(["moderator", "admin", "owner"])])
+def import_questions_api(request):
+    """
+    Import a question bank in bulk, optionally adding every question to an exam.
+
+    Accepts either a JSON array (or `{"questions": [...]}`) of question objects, or
+    a CSV file uploaded as `file` with `text`, `option_a`-`option_d`,
+    `correct_answer` and `difficulty` columns. The target exam may be given as
+    `exam_id` in the query string or the request body.
+
+    Questions identical to an existing one (same normalised text and options) are
+    not created again, but are still added to the exam.
+
+    Returns:
+        200 OK with the number of questions created, already existing, and linked,
+        plus a per-row error report.
+        400 BAD REQUEST if the upload is unreadable or no row is valid.
+        404 NOT FOUND if the exam does not exist.
+
+    Permissions:
+        - Only accessible to staff with role: moderator, admin, or owner.
+    """
+    staff, error_response = get_staff_from_request(request)
+    if error_response:
+        return error_response
+
+    exam_id = request.query_params.get("exam_id")
+    if exam_id is None and isinstance(request.data, dict):
+        exam_id = request.data.get("exam_id")
+    exam = get_object_or_404(Exam, pk=exam_id) if exam_id else None
+
+    rows, error_response = get_upload_rows(request, "questions")
+    if error_response:
+        return error_response
+
+    questions, duplicates, errors = validate_question_rows(rows)
+    if not questions:
+        return Response(
+            {"error": "No valid questions to import.", "errors": errors},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    result = import_questions(questions, staff=staff, exam=exam)
+
+    return Response(
+        {
+            "message": "Questions imported.",
+            "total_rows": len(rows),
+            **result,
+            "duplicate_rows": duplicates,
+            "failed": len(errors),
+            "errors": errors,
+        }
+    )
+
+
 @api_view(["GET", "PUT", "PATCH", "DELETE"])
 @permission_classes([IsAuthenticated, StaffWithRole(["moderator", "admin", "owner"])])
 def question_detail_api(request, question_id):
@@ -7,12 +7,12 @@ import logging
 
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import CreateAPIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from rest_framework_api_key.permissions import HasAPIKey # type: ignore
 
-from ..permissions import StaffWithRole
+from ..permissions import CachedHasAPIKey, StaffWithRole
 from ..models import FeatureFlag
 from ..serializers import (
     CandidateRegistrationSerializer,
@@ -37,7 +37,13 @@ class BaseRegistrationView(CreateAPIView):
             )
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            try:
+                serializer.save()
+            except ValidationError as e:
+                return Response(
+                    {"error": "Registration failed", "details": e.detail},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
             return Response(
                 {"message": "Registration successful"},
                 status=status.HTTP_201_CREATED,
@@ -52,14 +58,14 @@ class CandidateRegistrationView(BaseRegistrationView):
     """Register a new candidate"""
 
     serializer_class = CandidateRegistrationSerializer
-    permission_classes = [HasAPIKey]
+    permission_classes = [CachedHasAPIKey]
 
 
 class StaffRegistrationView(BaseRegistrationView):
     """Register a new staff member"""
 
     serializer_class = StaffRegistrationSerializer
-    permission_classes = [HasAPIKey]
+    permission_classes = [CachedHasAPIKey]
     
     
 @api_view(["POST"])
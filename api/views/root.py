@@ -57,6 +57,7 @@ def api_root(request, format=None):
             "candidates": {
                 "collection": safe_reverse("v1:api-candidate-list"),
                 "me": safe_reverse("v1:api-candidate-me"),
+                "promote": safe_reverse("v1:api-candidate-promote"),
                 "detail": generate_url_with_placeholder(
                     "v1:api-candidate-detail", "<candidate_id>", "candidate_id"
                 ),
@@ -101,6 +102,12 @@ def api_root(request, format=None):
                     "submit-exam-score": generate_url_with_placeholder(
                         "v1:api-submit-exam-score", "<exam_id>", "exam_id"
                     ),
+                    "bulk-submit-exam-scores": generate_url_with_placeholder(
+                        "v1:api-bulk-submit-exam-scores", "<exam_id>", "exam_id"
+                    ),
+                    "autosave-answers": generate_url_with_placeholder(
+                        "v1:api-autosave-exam-answers", "<exam_id>", "exam_id"
+                    ),
                     "submit-exam-answers": generate_url_with_placeholder(
                         "v1:api-submit-exam-answers", "<exam_id>", "exam_id"
                     ),
@@ -108,6 +115,7 @@ def api_root(request, format=None):
             },
             "questions": {
                 "collection": safe_reverse("v1:api-question-list"),
+                "import": safe_reverse("v1:api-question-import"),
                 "detail": generate_url_with_placeholder(
                     "v1:api-question-detail", "<question_id>", "question_id"
                 ),
@@ -121,11 +129,20 @@ def api_root(request, format=None):
                 "account-management-detail": generate_url_with_placeholder(
                     "v1:api-account-management-detail", "<user_id>", "user_id"
                 ),
+                "upload-ticket": safe_reverse("v1:api-upload-ticket"),
+                "upload-complete": generate_url_with_placeholder(
+                    "v1:api-upload-complete", "<ticket_id>", "ticket_id"
+                ),
             },
             "leaderboard": {
                 "toggle": safe_reverse("v1:api-toggle-leaderboard"),
                 "publish": safe_reverse("v1:api-publish-leaderboard"),
                 "load": safe_reverse("v1:api-load-leaderboard"),
             },
+            "system": {
+                "db-connections": safe_reverse("v1:api-db-connection-stats"),
+                "metrics": safe_reverse("v1:api-metrics"),
+                "profiles": safe_reverse("v1:api-request-profiles"),
+            },
         }
     )
@@ -2,19 +2,36 @@
 API views for retrieving and submitting candidate scores.
 """
 
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
 from rest_framework.response import Response
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
 
 from ..models import Candidate, CandidateScore, Exam
+from ..parsers import FastJSONParser
 from ..serializers import CandidateScoreSerializer
 from ..permissions import StaffWithRole
+from ..utils.auth_helpers import get_staff_from_request
+from ..utils.cache_utils import invalidate_standings
+from ..utils.replica import replica_reads
+from ..utils.score_utils import validate_score_rows, upsert_scores
+from ..utils.uploads import get_upload_rows
+from ..utils.values_serializers import ValuesSerializer
+
+# Serializes scores like `CandidateScoreSerializer`, from `values_list()` rows.
+CANDIDATE_SCORE_VALUES = ValuesSerializer(
+    CandidateScoreSerializer,
+    expressions={"exam.question_count": Count("exam__questions", distinct=True)},
+)
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, StaffWithRole(["admin", "owner"])])
+@replica_reads
 def candidate_scores_api(request, candidate_id):
     """
     Retrieve all scores for a given candidate.
@@ -31,8 +48,7 @@ def candidate_scores_api(request, candidate_id):
     """
     candidate = get_object_or_404(Candidate, pk=candidate_id)
     scores = CandidateScore.objects.filter(candidate=candidate)
-    serializer = CandidateScoreSerializer(scores, many=True)
-    return Response(serializer.data)
+    return Response(CANDIDATE_SCORE_VALUES.data(scores, request))
 
 
 @api_view(["PUT"])
@@ -75,6 +91,7 @@ def submit_exam_score_api(request, exam_id):
             exam=exam,
             defaults={"score": score, "submitted_by": staff, "auto_score": False},
         )
+        invalidate_standings()
 
         return Response(
             {
@@ -94,3 +111,59 @@ def submit_exam_score_api(request, exam_id):
         )
     except Exception as e:
         return Response({"error": str(e)}, status=400)
+
+
+@api_view(["POST"])
+@parser_classes([FastJSONParser, MultiPartParser, FormParser])
+@permission_classes([IsAuthenticated, StaffWithRole(["admin", "owner"])])
+def bulk_submit_exam_scores_api(request, exam_id):
+    """
+    Submit or update many candidates' scores for a specific exam in one request.
+
+    Accepts either a JSON array (or `{"scores": [...]}`) of
+    `{"candidate_id": ..., "score": ...}` objects, or a CSV file uploaded as `file`
+    with `candidate_id` and `score` columns.
+
+    Valid rows are saved with a single upsert per batch; invalid rows are skipped
+    and reported back with their (1-based) row number.
+
+    Args:
+        exam_id (int): ID of the exam.
+
+    Returns:
+        200 OK with a summary and per-row error report.
+        400 BAD REQUEST if the upload is unreadable or no row is valid.
+        404 NOT FOUND if the exam does not exist.
+
+    Permissions:
+        - Only staff with 'admin' or 'owner' roles can submit scores.
+    """
+    exam = get_object_or_404(Exam, pk=exam_id)
+    staff, error_response = get_staff_from_request(request)
+    if error_response:
+        return error_response
+
+    rows, error_response = get_upload_rows(request, "scores")
+    if error_response:
+        return error_response
+
+    valid_scores, errors = validate_score_rows(rows)
+    if not valid_scores:
+        return Response(
+            {"error": "No valid scores to submit.", "errors": errors},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    saved = upsert_scores(exam, valid_scores, staff)
+    invalidate_standings()
+
+    return Response(
+        {
+            "message": "Scores submitted.",
+            "exam": exam.title,
+            "total_rows": len(rows),
+            "saved": saved,
+            "failed": len(errors),
+            "errors": errors,
+        }
+    )
@@ -22,6 +22,9 @@ from ..permissions import StaffWithRole, IsStaff
 from ..serializers import StaffDetailSerializer, StaffListSerializer
 from ..utils.user import validate_role
 from ..utils.query_filters import filter_staffs
+from ..utils.replica import ReplicaReadsMixin
+from ..utils.sparse_fields import prune_queryset
+from ..utils.values_serializers import ValuesListMixin, ValuesSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -46,10 +49,13 @@ def staff_me_api(request):
         )
 
 
-class StaffListView(ListAPIView):
+class StaffListView(ReplicaReadsMixin, ValuesListMixin, ListAPIView):
     """
     List all staff members with pagination and optional filtering.
 
+    Rows are read with `values_list()` and serialized like
+    `StaffListSerializer`.
+
     Permissions:
         - Only accessible to users with roles: moderator, admin, or owner.
     """
@@ -59,6 +65,7 @@ class StaffListView(ListAPIView):
         StaffWithRole(["moderator", "admin", "owner"]),
     ]
     serializer_class = StaffListSerializer
+    values_serializer = ValuesSerializer(StaffListSerializer)
     pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
 
     def get_queryset(self):
@@ -69,7 +76,8 @@ class StaffListView(ListAPIView):
             Filtered queryset of staff members.
         """
         return filter_staffs(
-            Staff.objects.all().order_by("-date_created"), self.request.query_params
+            Staff.objects.order_by("-date_created"),
+            self.request.query_params,
         )
 
 
@@ -89,6 +97,15 @@ class StaffDetailView(RetrieveUpdateDestroyAPIView):
     queryset = Staff.objects.all()
     lookup_url_kwarg = "staff_id"
 
+    def get_queryset(self):
+        """
+        Returns the staff, restricted to the fields selected with `?fields=`
+        on GET requests.
+        """
+        if self.request.method == "GET":
+            return prune_queryset(self.queryset, self.get_serializer())
+        return self.queryset
+
     def retrieve(self, request: Request, *args, **kwargs) -> Response:
         """
         Return staff member's serialized data.
@@ -0,0 +1,73 @@
+"""
+API views exposing operational metrics of the API's worker processes.
+"""
+
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+
+from ..permissions import IsStaff, StaffWithRole
+from ..utils.db_metrics import get_db_connection_stats
+from ..utils.metrics import render_prometheus_metrics
+from ..utils.profiling import PROFILING_HEADER, get_profiles, issue_profiling_token
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, StaffWithRole(["admin", "owner"])])
+def db_connection_stats_api(request):
+    """
+    Retrieve database connection metrics of the worker process serving the
+    request.
+
+    Returns:
+        200 OK with the worker's process id, the number of requests it served,
+        and per database alias the connection mode, connections opened and,
+        for pools, checkouts, wait time and exhausted checkouts.
+    """
+    return Response(get_db_connection_stats())
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsStaff])
+def metrics_api(request):
+    """
+    Retrieve per-route request metrics of the worker process serving the
+    request, in the Prometheus text format.
+
+    Returns:
+        200 OK with latency histograms, request counts, database query counts
+        and time, cache hits and misses and response bytes per route.
+    """
+    return HttpResponse(
+        render_prometheus_metrics(), content_type=PROMETHEUS_CONTENT_TYPE
+    )
+
+
+@api_view(["GET", "POST"])
+@permission_classes([IsAuthenticated, StaffWithRole(["owner"])])
+def request_profiles_api(request):
+    """
+    List recorded request profiles, or issue a token to profile requests with.
+
+    - GET: The profiles in the ring buffer, newest first, with their top
+      functions by cumulative time and their SQL queries.
+    - POST: A signed value for the `X-Profile-Request` header. Requests sent
+      with it are profiled.
+
+    Returns:
+        200 OK with the profiles.
+        201 CREATED with the header name and value.
+    """
+    if request.method == "POST":
+        return Response(
+            {
+                "header": PROFILING_HEADER,
+                "value": issue_profiling_token(request.user),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+    return Response(get_profiles())
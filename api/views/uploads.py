@@ -0,0 +1,72 @@
+"""
+API views for uploading profile photos and ID cards directly to storage.
+"""
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+
+from ..serializers import UploadTicketSerializer
+from ..utils.auth_helpers import get_profile_from_request
+from ..utils.direct_uploads import complete_upload, create_upload_ticket
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def create_upload_ticket_api(request):
+    """
+    Issue a presigned POST for uploading the user's profile photo or ID card
+    straight to storage.
+
+    Expected POST data:
+        - field: `profile_photo` or `id_card`.
+        - content_type: `image/jpeg`, `image/png` or `image/webp`.
+
+    Returns:
+        201 CREATED with the ticket ID and the form `url` and `fields` to upload to.
+        400 BAD REQUEST if the data is invalid.
+        404 NOT FOUND if the user has no candidate or staff profile.
+    """
+    profile, error_response = get_profile_from_request(request)
+    if error_response:
+        return error_response
+
+    serializer = UploadTicketSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    ticket = create_upload_ticket(
+        profile,
+        serializer.validated_data["field"],
+        serializer.validated_data["content_type"],
+    )
+    return Response(ticket, status=status.HTTP_201_CREATED)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def complete_upload_api(request, ticket_id):
+    """
+    Process a file uploaded with an upload ticket and attach it to the user's
+    profile.
+
+    Args:
+        ticket_id (str): ID of the upload ticket.
+
+    Returns:
+        200 OK with the field being updated.
+        400 BAD REQUEST if the ticket is invalid or the upload is missing or too large.
+        404 NOT FOUND if the user has no candidate or staff profile.
+    """
+    profile, error_response = get_profile_from_request(request)
+    if error_response:
+        return error_response
+
+    field_name, error = complete_upload(profile, ticket_id)
+    if error:
+        return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(
+        {"message": "Upload completed.", "field": field_name},
+        status=status.HTTP_200_OK,
+    )
@@ -31,7 +31,6 @@ INSTALLED_APPS = [
     "django_extensions",
     "corsheaders",
     "rest_framework_simplejwt.token_blacklist",
-    "debug_toolbar",
     "rest_framework",
     "rest_framework_api_key",
     "rest_framework.authtoken",
@@ -41,8 +40,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.middleware.RequestMetricsMiddleware",
+    "api.middleware.RequestProfilerMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -52,8 +52,14 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "api.middleware.ReplicaStickinessMiddleware",
 ]
 
+# The debug toolbar is development-only.
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(3, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "core.urls"
 
 TEMPLATES = [
@@ -81,9 +87,60 @@ DATABASES = {
         "PASSWORD": os.environ.get("DB_PASSWORD"),
         "HOST": os.environ.get("DB_HOST"),
         "PORT": os.environ.get("DB_PORT"),
+        # Keep connections open between requests and check them before reuse.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Setting DB_POOL_MAX_SIZE replaces persistent connections with an in-process
+# pool shared by the threads of a worker (requires psycopg[pool] >= 3).
+DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", 0))
+if DB_POOL_MAX_SIZE:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        }
+    }
+
+# Optional read replica. Views marked with `replica_reads` send their reads to
+# it; users are pinned to the primary for REPLICA_STICKY_SECONDS after their
+# own writes. In tests the replica mirrors the default database.
+if os.environ.get("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.environ.get("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "HOST": os.environ.get("DB_REPLICA_HOST"),
+        "PORT": os.environ.get("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["api.db_routers.ReplicaRouter"]
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 15))
+
+# Fraction of requests profiled at random (see api/utils/profiling.py). Owners
+# can also profile single requests with a signed X-Profile-Request header.
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0))
+
+# A shared cache (Redis) is required in production so that cache invalidation,
+# throttling and cached standings are consistent across gunicorn workers.
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "api.cache_backends.RedisCache",
+            "LOCATION": os.environ.get("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "api.cache_backends.LocMemCache",
+        }
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -102,6 +159,15 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+AUTHENTICATION_BACKENDS = ["api.backends.PooledPasswordBackend"]
+
+# Password hashing for logins and registrations runs in a small process pool so
+# bursts cannot saturate the web workers. Set the worker count to 0 to hash
+# in-process.
+PASSWORD_HASHING_WORKERS = int(os.environ.get("PASSWORD_HASHING_WORKERS", 2))
+PASSWORD_HASHING_MAX_PENDING = int(os.environ.get("PASSWORD_HASHING_MAX_PENDING", 8))
+PASSWORD_HASHING_QUEUE_TIMEOUT = 5
+
 
 LANGUAGE_CODE = "en-us"
 
@@ -127,7 +193,8 @@ REST_FRAMEWORK = {
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/day",        # Unauthenticated
         "user": "1000/day",       # Authenticated users
-        "login": "5/min",         # Login endpoint
+        # Login endpoint; raised for load tests (see the loadtest command)
+        "login": os.environ.get("LOGIN_THROTTLE_RATE", "5/min"),
         "burst": "20/min",        # For sensitive or POST-heavy endpoints
         "sustained": "100/hour",  # For sustained traffic
     },
@@ -146,13 +213,27 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+# JSON backend of the API renderer and parser: "orjson", "json" (standard
+# library) or "auto" for orjson when installed (see api/utils/fast_json.py).
+JSON_BACKEND = os.environ.get("JSON_BACKEND", "auto")
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=159),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_REFRESH_SERIALIZER": "api.serializers.FilteredTokenRefreshSerializer",
 }
 
 INTERNAL_IPS = [
@@ -190,6 +271,12 @@ GRAPH_MODELS = {
 
 SWAGGER_USE_COMPAT_RENDERERS = False
 
+# Uploaded photos are staged locally and processed (EXIF stripped, WebP
+# variants rendered) in a process pool before being saved to STORAGES["default"].
+# Set the worker count to 0 to process them in-process after the request.
+PHOTO_STAGING_DIR = os.environ.get("PHOTO_STAGING_DIR", BASE_DIR / "staging")
+PHOTO_PROCESSING_WORKERS = int(os.environ.get("PHOTO_PROCESSING_WORKERS", 2))
+
 STORAGES = {
     "default": {
         "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
@@ -198,6 +285,8 @@ STORAGES = {
             "secret_key": os.environ.get("AWS_SECRET_ACCESS_KEY"),
             "bucket_name": os.environ.get("AWS_STORAGE_BUCKET_NAME"),
             "region_name": os.environ.get("AWS_S3_REGION_NAME"),
+            # A local S3-compatible server (e.g. MinIO) for development and tests.
+            "endpoint_url": os.environ.get("AWS_S3_ENDPOINT_URL"),
             "custom_domain": f"{os.environ.get('AWS_STORAGE_BUCKET_NAME')}.s3.{os.environ.get('AWS_S3_REGION_NAME')}.amazonaws.com",
             "file_overwrite": False,
             "default_acl": None,
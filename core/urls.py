@@ -5,7 +5,7 @@ Includes:
 - Admin interface
 - API routes with versioning
 - Interactive API docs via Swagger and ReDoc (powered by drf-yasg)
-- Debug toolbar URLs
+- Debug toolbar URLs (when DEBUG is on)
 """
 
 from django.contrib import admin
@@ -15,7 +15,6 @@ from django.views.generic import RedirectView
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
-from debug_toolbar.toolbar import debug_toolbar_urls
 
 # === Swagger Schema Configuration ===
 schema_view = get_schema_view(
@@ -81,4 +80,7 @@ urlpatterns = [
 ]
 
 # === Debug Toolbar (Optional, Dev-Only) ===
-urlpatterns += debug_toolbar_urls()
+if "debug_toolbar" in settings.INSTALLED_APPS:
+    from debug_toolbar.toolbar import debug_toolbar_urls
+
+    urlpatterns += debug_toolbar_urls()